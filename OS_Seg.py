@@ -1,6 +1,3 @@
-import matplotlib.pyplot as plt
-import numpy as np
-
 class Segment:
     def __init__(self, name, base, limit, perm, path):
         self.name = name
@@ -30,15 +27,32 @@ class Segment:
         print(f"{start_addr}    {end_addr}    {region_type:10}  {prot:12}  {size_kb}   {segment_path}")
 
 class Process:
-    def __init__(self, path):
+    def __init__(self, path, allocator=None):
         self.segments = []
         self.path = path
+        self.allocator = allocator # Optional segment_allocator.SegmentAllocator shared by processes
 
     def add_segment(self, name, size, perm):
-        base = 0 if not self.segments else self.segments[-1].base + self.segments[-1].limit
-        segment = Segment(name, base, size, perm, self.path)
+        if self.allocator is None:
+            base = 0 if not self.segments else self.segments[-1].base + self.segments[-1].limit
+            segment = Segment(name, base, size, perm, self.path)
+        else:
+            # The allocator picks a hole, and moves the segment's base if it compacts memory.
+            segment = Segment(name, 0, size, perm, self.path)
+            segment.base = self.allocator.allocate(size, owner=segment)
+            if segment.base is None:
+                raise MemoryError(f"No hole of {size} bytes left for segment {name}")
         self.segments.append(segment)
 
+    def remove_segment(self, name):
+        for i, segment in enumerate(self.segments):
+            if segment.name == name:
+                if self.allocator is not None:
+                    self.allocator.free(segment.base)
+                del self.segments[i]
+                return
+        raise KeyError(f"No segment named {name}")
+
     def show_segments(self):
         print("Segment Information:")
         for segment in self.segments:
@@ -49,49 +63,53 @@ class Process:
         for segment in self.segments:
             segment.print_windows_memory_map()
 
-# Setup process
-process_path = "C:\\Users\\spand\\OneDrive\\Desktop\\OS_Seg.py"
-process = Process(process_path)
-process.add_segment("Code", 400, "r-xp")
-process.add_segment("Data", 300, "r--p")
-process.add_segment("Stack", 200, "rw-p")
-process.show_segments()
-
-# Simulated access time in nanoseconds
-access_times = {
-    'Code': {'Read': 20, 'Write': 9999, 'Execute': 15},
-    'Data': {'Read': 25, 'Write': 30, 'Execute': 9999},
-    'Stack': {'Read': 22, 'Write': 28, 'Execute': 9999}
-}
-
-segments = list(access_times.keys())
-read_times = [access_times[seg]['Read'] for seg in segments]
-write_times = [access_times[seg]['Write'] for seg in segments]
-execute_times = [access_times[seg]['Execute'] for seg in segments]
-
-# Plotting
-fig, ax = plt.subplots(figsize=(10, 6))
-x = range(len(segments))
-bar_width = 0.25
-
-# Plot bars
-ax.bar([i - bar_width for i in x], read_times, width=bar_width, label='Read')
-ax.bar(x, write_times, width=bar_width, label='Write')
-ax.bar([i + bar_width for i in x], execute_times, width=bar_width, label='Execute')
-
-# Labeling
-ax.set_xlabel('Memory Segment')
-ax.set_ylabel('Access Time (ns)')
-ax.set_title('Simulated Access Time per Segment and Operation')
-ax.set_xticks(x)
-ax.set_xticklabels(segments)
-
-# Log scale and visible ticks
-ax.set_yscale('log')
-ax.set_yticks([10, 100, 1000, 10000])
-ax.get_yaxis().set_major_formatter(plt.ScalarFormatter())
-ax.legend()
-ax.grid(True)
-
-plt.tight_layout()
-plt.show()
+# --- Main Execution ---
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt # Only the demo plot needs matplotlib, so the classes import without it
+
+    # Setup process
+    process_path = "C:\\Users\\spand\\OneDrive\\Desktop\\OS_Seg.py"
+    process = Process(process_path)
+    process.add_segment("Code", 400, "r-xp")
+    process.add_segment("Data", 300, "r--p")
+    process.add_segment("Stack", 200, "rw-p")
+    process.show_segments()
+
+    # Simulated access time in nanoseconds
+    access_times = {
+        'Code': {'Read': 20, 'Write': 9999, 'Execute': 15},
+        'Data': {'Read': 25, 'Write': 30, 'Execute': 9999},
+        'Stack': {'Read': 22, 'Write': 28, 'Execute': 9999}
+    }
+
+    segments = list(access_times.keys())
+    read_times = [access_times[seg]['Read'] for seg in segments]
+    write_times = [access_times[seg]['Write'] for seg in segments]
+    execute_times = [access_times[seg]['Execute'] for seg in segments]
+
+    # Plotting
+    fig, ax = plt.subplots(figsize=(10, 6))
+    x = range(len(segments))
+    bar_width = 0.25
+
+    # Plot bars
+    ax.bar([i - bar_width for i in x], read_times, width=bar_width, label='Read')
+    ax.bar(x, write_times, width=bar_width, label='Write')
+    ax.bar([i + bar_width for i in x], execute_times, width=bar_width, label='Execute')
+
+    # Labeling
+    ax.set_xlabel('Memory Segment')
+    ax.set_ylabel('Access Time (ns)')
+    ax.set_title('Simulated Access Time per Segment and Operation')
+    ax.set_xticks(x)
+    ax.set_xticklabels(segments)
+
+    # Log scale and visible ticks
+    ax.set_yscale('log')
+    ax.set_yticks([10, 100, 1000, 10000])
+    ax.get_yaxis().set_major_formatter(plt.ScalarFormatter())
+    ax.legend()
+    ax.grid(True)
+
+    plt.tight_layout()
+    plt.show()
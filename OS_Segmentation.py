@@ -1,4 +1,53 @@
-import collections
+from replacement_policies import FIFOPolicy, LRUPolicy, OptimalPolicy, SetOrderOptimalPolicy, SimulationResult, run_policy
+
+
+class TableTrace:
+    """
+    Trace sink that prints one row of the verbose step table per reference.
+
+    The run_* functions call it as trace(step, page, frames, fault, victim)
+    after every reference; simulate_* pass one in to print their tables.
+    """
+
+    def __init__(self, width, show_victim=False, sort_frames=False):
+        self.width = width # Padding of the frames column
+        self.show_victim = show_victim # Whether to print the victim column (Optimal)
+        self.sort_frames = sort_frames # Sort frames for a stable display order
+
+    def __call__(self, step, page, frames, fault, victim):
+        frame_list = sorted(frames) if self.sort_frames else list(frames)
+        frame_str = str(frame_list).ljust(self.width) # Pad for alignment
+        fault_str = "Yes" if fault else "No"
+        if self.show_victim:
+            victim_str = str("-" if victim is None else victim).ljust(6)
+            print(f"{step:<4} | {page:<4} | {frame_str} | {victim_str} | {fault_str}")
+        else:
+            print(f"{step:<4} | {page:<4} | {frame_str} | {fault_str}")
+
+
+def fault_bitmap_get(fault_bitmap, i):
+    """
+    Returns True if reference i faulted according to a SimulationResult bitmap.
+    """
+    return bool(fault_bitmap[i >> 3] & (1 << (i & 7)))
+
+#-------------------------------------------------
+
+def run_fifo(page_reference_string, num_frames, record_steps=False, trace=None):
+    """
+    Runs the FIFO page replacement algorithm without printing anything.
+
+    Args:
+        page_reference_string (iterable): Sequence of page numbers requested.
+        num_frames (int): Number of available physical memory frames.
+        record_steps (bool): Also return a per-step fault bitmap.
+        trace (callable): Optional sink called as trace(step, page, frames, fault, victim).
+
+    Returns:
+        SimulationResult: Fault, hit and eviction counts.
+    """
+    return run_policy(FIFOPolicy(num_frames), page_reference_string, record_steps, trace)
+
 
 def simulate_fifo(page_reference_string, num_frames):
     """
@@ -11,38 +60,34 @@ def simulate_fifo(page_reference_string, num_frames):
     Returns:
         int: Total number of page faults.
     """
-    frames = collections.deque(maxlen=num_frames) # Use deque for efficient FIFO queue
-    frame_set = set() # For quick checking if page is in frames
-    page_faults = 0
     print("\n--- FIFO Simulation ---")
     print(f"Frames: {num_frames}, Reference String: {page_reference_string}")
     print("Step | Page | Frames Status         | Fault?")
     print("-----+------+-----------------------+--------")
 
-    for i, page in enumerate(page_reference_string):
-        fault = False
-        if page not in frame_set:
-            page_faults += 1
-            fault = True
-            if len(frames) == num_frames:
-                # Frames are full, remove the oldest (leftmost in deque)
-                evicted_page = frames.popleft()
-                frame_set.remove(evicted_page)
-            # Add the new page to the end (rightmost in deque)
-            frames.append(page)
-            frame_set.add(page)
-
-        # Print status for this step
-        frame_list = list(frames)
-        frame_str = str(frame_list).ljust(21) # Pad for alignment
-        fault_str = "Yes" if fault else "No"
-        print(f"{i+1:<4} | {page:<4} | {frame_str} | {fault_str}")
+    page_faults = run_fifo(page_reference_string, num_frames, trace=TableTrace(21)).faults
 
     print(f"\nTotal Page Faults (FIFO): {page_faults}")
     return page_faults
 
 #-------------------------------------------------
 
+def run_lru(page_reference_string, num_frames, record_steps=False, trace=None):
+    """
+    Runs the LRU page replacement algorithm without printing anything.
+
+    Args:
+        page_reference_string (iterable): Sequence of page numbers requested.
+        num_frames (int): Number of available physical memory frames.
+        record_steps (bool): Also return a per-step fault bitmap.
+        trace (callable): Optional sink called as trace(step, page, frames, fault, victim).
+
+    Returns:
+        SimulationResult: Fault, hit and eviction counts.
+    """
+    return run_policy(LRUPolicy(num_frames), page_reference_string, record_steps, trace)
+
+
 def simulate_lru(page_reference_string, num_frames):
     """
     Simulates the LRU page replacement algorithm.
@@ -54,67 +99,36 @@ def simulate_lru(page_reference_string, num_frames):
     Returns:
         int: Total number of page faults.
     """
-    # We use an OrderedDict to maintain access order easily.
-    # The rightmost item is the most recently used (MRU).
-    # The leftmost item is the least recently used (LRU).
-    frames = collections.OrderedDict()
-    page_faults = 0
     print("\n--- LRU Simulation ---")
     print(f"Frames: {num_frames}, Reference String: {page_reference_string}")
     print("Step | Page | Frames Status (LRU->MRU) | Fault?")
     print("-----+------+--------------------------+--------")
 
-    for i, page in enumerate(page_reference_string):
-        fault = False
-        if page not in frames:
-            page_faults += 1
-            fault = True
-            if len(frames) == num_frames:
-                # Frames are full, remove the LRU item (first item)
-                frames.popitem(last=False) # popitem(last=False) removes the first item (LRU)
-            # Add the new page (it becomes the MRU)
-            frames[page] = None # Value doesn't matter, only keys and their order
-        else:
-            # Page hit! Move the accessed page to the end (make it MRU)
-            frames.move_to_end(page)
-
-        # Print status for this step
-        frame_list = list(frames.keys())
-        frame_str = str(frame_list).ljust(26) # Pad for alignment
-        fault_str = "Yes" if fault else "No"
-        print(f"{i+1:<4} | {page:<4} | {frame_str} | {fault_str}")
+    page_faults = run_lru(page_reference_string, num_frames, trace=TableTrace(26)).faults
 
     print(f"\nTotal Page Faults (LRU): {page_faults}")
     return page_faults
 
 #-------------------------------------------------
 
-def find_optimal_victim(current_frames, future_references):
-    """
-    Helper for Optimal: Finds the page in current_frames that will be
-    used furthest in the future (or not at all).
+def run_optimal(page_reference_string, num_frames, record_steps=False, trace=None):
     """
-    victim = -1
-    max_future_distance = -1
+    Runs the Optimal (OPT/MIN) page replacement algorithm without printing anything.
 
-    for frame_page in current_frames:
-        try:
-            # Find the next index where this page appears in the future
-            future_index = future_references.index(frame_page)
-            if future_index > max_future_distance:
-                max_future_distance = future_index
-                victim = frame_page
-        except ValueError:
-            # Page is not referenced again in the future, perfect victim!
-            return frame_page
+    Victims come from OptimalPolicy's next-use max-heap, so each fault costs
+    O(log frames) instead of a scan of the remaining string.
 
-    # If all pages in frames are referenced again, return the one used furthest away
-    if victim == -1: # Should only happen if current_frames is empty, which isn't the case here
-         # Or if all remaining future refs are in current_frames. Pick the last one.
-         if current_frames: return list(current_frames)[0] # Fallback: FIFO-like if needed, but logic above covers most. Or pick last used. max_future_distance page needed.
-         else: return -1 # Should not happen
+    Args:
+        page_reference_string (list): Sequence of page numbers requested.
+        num_frames (int): Number of available physical memory frames.
+        record_steps (bool): Also return a per-step fault bitmap.
+        trace (callable): Optional sink called as trace(step, page, frames, fault, victim).
 
-    return victim # The page whose next use is furthest away
+    Returns:
+        SimulationResult: Fault, hit and eviction counts.
+    """
+    policy = OptimalPolicy(num_frames, page_reference_string)
+    return run_policy(policy, page_reference_string, record_steps, trace)
 
 
 def simulate_optimal(page_reference_string, num_frames):
@@ -128,36 +142,15 @@ def simulate_optimal(page_reference_string, num_frames):
     Returns:
         int: Total number of page faults.
     """
-    frames = set() # Order doesn't matter intrinsically, just presence
-    frame_list_for_print = [] # Maintain a list for printing order if desired
-    page_faults = 0
     print("\n--- Optimal Simulation ---")
     print(f"Frames: {num_frames}, Reference String: {page_reference_string}")
     print("Step | Page | Frames Status         | Victim | Fault?")
     print("-----+------+-----------------------+--------+--------")
 
-    for i, page in enumerate(page_reference_string):
-        fault = False
-        victim_page = "-" # Placeholder for victim
-        if page not in frames:
-            page_faults += 1
-            fault = True
-            if len(frames) == num_frames:
-                # Frames are full, find the optimal victim to evict
-                future_refs = page_reference_string[i+1:]
-                victim_page = find_optimal_victim(frames, future_refs)
-                frames.remove(victim_page)
-                frame_list_for_print.remove(victim_page)
-
-            # Add the new page
-            frames.add(page)
-            frame_list_for_print.append(page) # Add to list for printing consistency
-
-        # Print status for this step
-        frame_str = str(sorted(list(frames))).ljust(21) # Sort for consistent display
-        fault_str = "Yes" if fault else "No"
-        victim_str = str(victim_page).ljust(6)
-        print(f"{i+1:<4} | {page:<4} | {frame_str} | {victim_str} | {fault_str}")
+    # Ties between pages that are never referenced again are broken the way this table always showed them.
+    trace = TableTrace(21, show_victim=True, sort_frames=True)
+    policy = SetOrderOptimalPolicy(num_frames, page_reference_string)
+    page_faults = run_policy(policy, page_reference_string, trace=trace).faults
 
     print(f"\nTotal Page Faults (Optimal): {page_faults}")
     return page_faults
@@ -1,42 +1,76 @@
 # This program was written by Vincent Hollander for group 3 for the final project in CSCI 3453.
 # I do not consent to this program being used for AI training, LLM training, AI data scraping, or LLM data scraping.
+import sys
 import time
 import matplotlib.pyplot as plt
 import random
 import numpy as np
+from latency_model import SimulatedClock
+from latency_recorder import LatencyRecorder
+from frame_allocator import FrameAllocator
+from page_tables import FlatPageTable
+from tlb import TLB, effective_access_time
+from profiling import Profiler, print_report
+from prefetch import SequentialPrefetcher
+
+NUM_PAGES = 5 # The process has been split into 5 different pages, this is because the size of the process is about the size of 5 frames.
+NUM_FRAMES = 30 # The virtual and main memory both are the same size. Their size is independent of the process.
 
 # Creating the different tables as global arrays. I have them empty so I can load specific, meaningful values using createPageTables().
-pageTable = np.full(5, 0) # A page table the size of 5 means that the process has been split into 5 different pages, this is because the size of the process is about the size of 5 frames.
-mainMemory = np.full(30, 0) #The virtual and main memory both are the same size. Their size is independent of the process. I am going to fill them at first with 0s to represent nothing in the table.
-virtualMemory = np.full(30, 0)
+pageTable = FlatPageTable(NUM_PAGES) # Any PageTable from page_tables works here, e.g. RadixPageTable(levels=2) for a sparse address space.
+mainMemory = np.full(NUM_FRAMES, 0) # I am going to fill them at first with 0s to represent nothing in the table.
+virtualMemory = np.full(NUM_FRAMES, 0)
+
+# The allocator that hands out free frames of main memory in O(1), timing every allocation.
+frameAllocator = FrameAllocator(NUM_FRAMES, recorder=LatencyRecorder(keep_samples=False))
+
+# The simulated clock that memory and disk accesses are charged to. By default it only adds up simulated time, so runs finish instantly;
+# SimulatedClock(real_time=True) also sleeps for every charge, which makes the slow disk visible in demos.
+clock = SimulatedClock()
+
+# The TLB that sits in front of the page table and caches recent page number to frame number translations.
+tlb = TLB(entries=4, ways=2, policy='lru')
+
+# The prefetcher that reads the following pages ahead during a page fault. None turns read-ahead off; --prefetch turns it on.
+prefetcher = None
 
 # Function to populate the tables.
 def createPageTables():
     # Clearing all the tables so the loop works.
-    pageTable.fill(0)
+    pageTable.clear()
     mainMemory.fill(0)
     virtualMemory.fill(0)
+    frameAllocator.reset()
+    tlb.flush() # The old translations no longer match the new tables.
 
     # Loop to randomly fill in the page table with some values being in main memory and some being in virtual.
-    for i in range(5):
+    for i in range(NUM_PAGES):
         random.seed()
-        x = random.randrange(29)
-        if (x % 3 == 0 or x % 3 == 2) and mainMemory[x+1] == 0:
-            mainMemory[x] = i
-            pageTable[i] = x
+        x = random.randrange(NUM_FRAMES - 1)
+        if x % 3 == 0 or x % 3 == 2: # About two out of three pages start out in main memory.
+            frame = frameAllocator.allocate() # The allocator hands out a free frame directly instead of probing for one.
+            mainMemory[frame] = i
+            pageTable.map(i, frame)
         else:
-            pageTable[i] = 31
+            pageTable.unmap(i) # The page is not present, so looking it up causes a page fault.
             virtualMemory[x] = i
 
 # This is the function that simulates using a Page Table to find process data.
 def usePageTable(pageNum, offset):
     actualPageNum = pageNum - 1
-    frameNum = pageTable[actualPageNum] # The MMU uses the page number to access the page table and find the listed frame number.
-    if(frameNum != 31): # This would be the MMU checking that the listed value is a valid frame number and not indeterminate.
+    clock.charge('tlb') # The MMU checks the TLB first.
+    frameNum = tlb.lookup(actualPageNum)
+    if frameNum is None: # On a TLB miss the MMU has to read the page table.
+        frameNum = pageTable.lookup(actualPageNum) # The MMU uses the page number to access the page table and find the listed frame number.
+        clock.charge('memory') # Reading the page table entry is one main memory access.
+        if frameNum is not None:
+            tlb.insert(actualPageNum, frameNum) # Valid translations are cached for the next access.
+    if(frameNum is not None): # This would be the MMU checking that the listed value is a valid frame number and not indeterminate.
         memAddress = np.int64(frameNum + offset) # If the frame number is valid, then combine that with the offset to get the memory address of where the data is in main memory.
     else: # This simulates the Page Table having "indeterminate" as a value in the table, which is a page fault.
         return 0 
 
+    clock.charge('memory') # Reading the data is a second main memory access.
     if(mainMemory[memAddress] != 0): # The MMU now retreives the data from the memory address, assuming that the offset is valid and main memory has not been altered.
         # This simulates the MMU successfully retrieving the data. Notice it is mostly instant.
         return 1
@@ -46,69 +80,85 @@ def usePageTable(pageNum, offset):
 # This is the function that simulates a page fault.
 def pageFault(pageNum):
     # The MMU causes a trap to the kernel.
-    time.sleep(0.5) # This represents the OS accessing the virtual memory (which takes longer than accessing main memory).
+    clock.charge('disk') # This represents the OS accessing the virtual memory (which takes longer than accessing main memory).
     processData = virtualMemory[pageNum] # When the OS finds the correct page, it goes to load it into main memory for easier access next time.
-    for i in mainMemory: 
-        if i == 0: # The OS must find an open frame in main memory to place the data.
-            i = processData # The OS loads the process data into the open frame.
-            pageTable[pageNum-1] = i-1 # Then it replaces the indeterminate with the frame number.
-            virtualMemory[pageNum] = 0 # The data is then cleared out of virtual memory as it now exists in main memory.
-            break # It only needs to do this once, we do not want to fill up main memory with the same thing over and over.
+    frame = frameAllocator.allocate() # The OS takes an open frame from the free list instead of scanning main memory for one.
+    if frame is not None:
+        mainMemory[frame] = processData # The OS loads the process data into the open frame.
+        pageTable.map(pageNum-1, frame) # Then it replaces the indeterminate with the frame number.
+        virtualMemory[pageNum] = 0 # The data is then cleared out of virtual memory as it now exists in main memory.
+    if prefetcher is not None:
+        readAhead(pageNum)
+
+# This is the function that loads the pages the prefetcher expects next while the disk is already busy with the fault.
+def readAhead(pageNum):
+    # Only free frames are used, so read-ahead never pushes out a page that is already loaded.
+    for page in prefetcher.predict(pageNum, frameAllocator.free_frames()):
+        if not 1 <= page <= NUM_PAGES or pageTable.lookup(page - 1) is not None:
+            continue # Pages outside the process or already in main memory are skipped.
+        frame = frameAllocator.allocate()
+        if frame is None:
+            break
+        mainMemory[frame] = virtualMemory[page] # The same disk request brings the page in, so no extra disk time is charged.
+        pageTable.map(page - 1, frame)
+        virtualMemory[page] = 0
 
 if __name__ == '__main__':
     print("This is a program to simulate paging as a form of memory management! This is to simulate the time it takes for a page table to perform under standard circumstances.")
-    # Setting up variables for data analysis
-    pageTableTime = 0
-    pageFaultTime = 0
-    pageTableAccess = 0
-    pageFaultAccess = 0
-    pageTableTimes = np.array(0)
-    pageFaultTimes = np.array(0)
+    # Passing --real-time makes page faults actually wait for the simulated disk instead of only adding to the simulated clock.
+    if "--real-time" in sys.argv:
+        clock = SimulatedClock(real_time=True)
+    # Passing --profile counts and times every page table, TLB and frame allocator call. Without it nothing is wrapped, so nothing slows down.
+    profiler = Profiler(enabled="--profile" in sys.argv)
+    # Passing --prefetch reads the following pages in during every page fault, so a sequential scan faults less often.
+    if "--prefetch" in sys.argv:
+        prefetcher = profiler.attach(SequentialPrefetcher())
+    for component in (pageTable, tlb, frameAllocator):
+        profiler.attach(component)
+    usePageTable = profiler.wrap(usePageTable, "usePageTable") # The nested calls then show up under the function that made them.
+    pageFault = profiler.wrap(pageFault, "pageFault")
+    # Setting up recorders for data analysis. They write into preallocated buffers, so recording a time does not copy every earlier one.
+    pageTableTimes = LatencyRecorder()
+    pageFaultTimes = LatencyRecorder()
     for x in range (10000):
         # Re-initializing the page tables so that the page fault triggers if selected multiple times in one session.
         createPageTables()
-        for num in range(5):
+        for num in range(1, NUM_PAGES + 1): # usePageTable takes 1-based page numbers.
+            clock.reference() # Counting the memory reference for the effective access time.
             t1Start = time.perf_counter() # Starting timer.
             result1 = usePageTable(num, 1) # Calling pageTable function.
             t1Stop = time.perf_counter() # Stopping timer.
             t1Full = t1Stop - t1Start # Calculating the time of this page table access.
-            pageTableTime += t1Full
-            pageTableTimes = np.append(pageTableTimes, t1Full)
-            pageTableAccess += 1
+            pageTableTimes.record(t1Full)
             # This is the return value of the page table if a page fault is triggered.
             if result1 == 0:
                 t2Start = time.perf_counter() # Starting page fault handling timer.
                 pageFault(num) # Calling the pageFault function.
                 t2Stop = time.perf_counter() # Stopping timer.
                 t2Full = t2Stop - t2Start # Calculating the time of page fault handling.
-                pageFaultTime += t2Full
                 t3Start = time.perf_counter() # Starting the page table timer.
                 usePageTable(num,1) # Calling page table now that the memory value is fixed.
                 t3Stop = time.perf_counter() # Stopping timer.
                 t3Full = t3Stop - t3Start
-                pageFaultTime += t3Full
-                pageTableTime += t3Full
-                pageTableTimes = np.append(pageTableTimes, t3Full)
+                pageTableTimes.record(t3Full)
                 t3Full += t2Full
-                pageFaultTimes = np.append(pageFaultTimes, t3Full)
-                pageFaultAccess += 1
-                pageTableAccess += 1
+                pageFaultTimes.record(t3Full)
   
     # Plotting a line graph to compare page table and page fault times.
-    x = np.arange(0, pageTableAccess+1)
-    x2 = np.arange(0, pageFaultAccess+1)
+    x = np.arange(0, pageTableTimes.count)
+    x2 = np.arange(0, pageFaultTimes.count)
     plt.title("Access Times") 
     plt.xlabel("X axis") 
     plt.ylabel("Y axis") 
-    plt.plot(x, pageTableTimes, label = "Page Table Access Times")
-    plt.plot(x2, pageFaultTimes, label = "Page Fault Handling Times") 
+    plt.plot(x, pageTableTimes.samples(), label = "Page Table Access Times")
+    plt.plot(x2, pageFaultTimes.samples(), label = "Page Fault Handling Times") 
     plt.legend()
     plt.show()
 
     # Plotting a bar graph to compage the average times of page table access and page fault handling.
     barX = np.array(["Avg. Page Table Access Time", "Avg. Page Fault Time"])
-    avgPageTable = pageTableTime / pageTableAccess
-    avgPageFault = pageFaultTime / pageFaultAccess
+    avgPageTable = pageTableTimes.mean()
+    avgPageFault = pageFaultTimes.mean()
     barY = np.array([avgPageTable, avgPageFault])
     plt.bar(barX,barY)
     plt.show()
@@ -116,3 +166,29 @@ if __name__ == '__main__':
     # Printing the average times out so the exact number is known too.
     print("Average Page Table Access Time: ", avgPageTable)
     print("Average Page Fault Handle Time: ", avgPageFault)
+
+    # Printing the tail latencies, which the averages hide.
+    for name, recorder in (("Page Table Access", pageTableTimes), ("Page Fault Handle", pageFaultTimes)):
+        stats = recorder.summary()
+        print(f"{name} Time p50: {stats['p50']}  p99: {stats['p99']}  p99.9: {stats['p999']}")
+
+    # Printing the simulated clock, which includes the disk time of every page fault.
+    report = clock.report()
+    print("Simulated Effective Access Time: ", report["effective_access_time"])
+    for tier, totals in report["tiers"].items():
+        print(f"Simulated {tier} time: {totals['time']} ({totals['accesses']} accesses)")
+
+    # Printing how well the TLB did and what that means for the access time without page faults.
+    print("TLB Hit Ratio: ", tlb.hit_ratio())
+    print("Effective Access Time with this TLB (no faults): ", effective_access_time(tlb.hit_ratio(), clock.tier_costs['tlb'], clock.tier_costs['memory']))
+
+    # Printing the page table overhead so different table types can be compared.
+    print("Page Table: ", pageTable.stats())
+    print("Frame Allocator: ", frameAllocator.stats())
+    print("Frame Allocation Time p50/p99: ", frameAllocator.recorder.percentile(50), frameAllocator.recorder.percentile(99))
+
+    # Printing where the time went phase by phase, and saving it for a flame graph, when --profile was given.
+    if profiler.enabled:
+        profiler.detach()
+        print_report(profiler.report())
+        profiler.write_folded("paging_profile.folded") # flamegraph.pl or speedscope can draw this file.
@@ -0,0 +1,233 @@
+"""
+Search for Belady's anomaly over large families of reference strings.
+
+Belady's anomaly is a reference string on which a policy faults more with
+f + 1 frames than with f frames. Stack algorithms such as LRU and OPT can
+never show it; FIFO can, as the classic string 1 2 3 4 1 2 5 1 2 3 4 5 with
+3 and 4 frames does. This tool checks whole families of strings for it:
+
+- 'random': count random strings drawn from a seed.
+- 'enumerate': every string of the given length over the given number of
+  pages, up to renaming the pages. Only strings in canonical form (each new
+  page is the smallest unused number) are visited, since renaming pages
+  never changes fault counts; that cuts the family by up to pages!.
+
+For FIFO all frame counts are evaluated in one pass over the string: a page
+that was the k-th page loaded stays resident in f frames until the
+(k + f)-th load, so one load counter and one page -> load number dict per
+frame count are enough. Other policies are run once per frame count.
+
+The family is cut into chunks that run on a ProcessPoolExecutor. The report
+gives the strings checked, anomalies per second and the strings with the
+worst fault ratio faults(f + 1) / faults(f).
+
+Usage:
+    python belady_search.py --policy fifo --family enumerate --length 12 --pages 5
+    python belady_search.py --policy clock --family random --count 200000
+"""
+
+import argparse
+import concurrent.futures
+import random
+import time
+
+from replacement_policies import make_policy, policy_names, run_policy
+
+
+def fifo_fault_counts(page_reference_string, max_frames):
+    """
+    Counts FIFO faults for every frame count from 1 to max_frames in one pass.
+
+    Returns:
+        list: faults[f - 1] is the fault count with f frames.
+    """
+    loaded = [{} for _ in range(max_frames)] # Per frame count: page -> load number
+    faults = [0] * max_frames
+    frame_counts = range(max_frames)
+    for page in page_reference_string:
+        for i in frame_counts:
+            load = loaded[i].get(page)
+            # With i + 1 frames the page is resident until i + 1 more loads have happened.
+            if load is None or load < faults[i] - i - 1:
+                loaded[i][page] = faults[i]
+                faults[i] += 1
+    return faults
+
+
+def policy_fault_counts(policy, page_reference_string, max_frames):
+    """
+    Counts faults of any policy for every frame count from 1 to max_frames.
+    """
+    if policy == 'fifo':
+        return fifo_fault_counts(page_reference_string, max_frames)
+    return [run_policy(make_policy(policy, frames, page_reference_string), page_reference_string).faults
+            for frames in range(1, max_frames + 1)]
+
+
+def anomalies(fault_counts):
+    """
+    Finds the frame counts where one more frame gives more faults.
+
+    Returns:
+        list: (f, faults with f frames, faults with f + 1 frames) tuples.
+    """
+    return [(f, fault_counts[f - 1], fault_counts[f])
+            for f in range(1, len(fault_counts))
+            if fault_counts[f] > fault_counts[f - 1]]
+
+#-------------------------------------------------
+
+def canonical_strings(length, num_pages, prefix=()):
+    """
+    Yields every string of the given length over num_pages pages that
+    starts with prefix and is in canonical form: page 0 appears first, and
+    each page after it appears only once every smaller page has.
+    """
+    string = list(prefix)
+    used = max(string) + 1 if string else 0
+
+    def extend(used):
+        if len(string) == length:
+            yield tuple(string)
+            return
+        for page in range(min(used + 1, num_pages)):
+            string.append(page)
+            yield from extend(max(used, page + 1))
+            string.pop()
+
+    yield from extend(used)
+
+
+def _enumerate_chunks(length, num_pages, prefix_length):
+    """
+    Splits the canonical family into chunks by their first prefix_length pages.
+    """
+    prefix_length = min(prefix_length, length)
+    return [('enumerate', prefix) for prefix in canonical_strings(prefix_length, num_pages)]
+
+
+def _random_chunks(count, chunk_size, seed):
+    return [('random', (seed, start, min(chunk_size, count - start))) for start in range(0, count, chunk_size)]
+
+
+def _search_chunk(policy, chunk, length, num_pages, max_frames, top):
+    """
+    Worker entry point: checks one chunk of the family.
+
+    Returns:
+        tuple: (strings checked, anomalies found, anomalous strings, worst
+        cases as (ratio, f, faults f, faults f + 1, string) tuples).
+    """
+    kind, argument = chunk
+    if kind == 'enumerate':
+        strings = canonical_strings(length, num_pages, argument)
+    else:
+        seed, start, count = argument
+        rng = random.Random(f"{seed}:{start}")
+        pages = range(num_pages)
+        strings = (rng.choices(pages, k=length) for _ in range(count))
+
+    checked = 0
+    found = 0
+    anomalous = 0
+    worst = []
+    for string in strings:
+        checked += 1
+        cases = anomalies(policy_fault_counts(policy, string, max_frames))
+        if cases:
+            anomalous += 1
+            found += len(cases)
+            for f, fewer, more in cases:
+                worst.append((more / fewer, f, fewer, more, tuple(string)))
+            if len(worst) > 4 * top:
+                worst = sorted(worst, reverse=True)[:top]
+    return checked, found, anomalous, sorted(worst, reverse=True)[:top]
+
+
+def search(policy='fifo', family='random', length=12, num_pages=5, max_frames=None, count=100000,
+           seed=0, max_workers=None, chunk_size=5000, top=5):
+    """
+    Searches a family of reference strings for Belady's anomaly in parallel.
+
+    Args:
+        policy (str): Replacement policy name (see replacement_policies.policy_names).
+        family (str): 'random' or 'enumerate'.
+        length (int): Length of each reference string.
+        num_pages (int): Number of distinct pages strings are drawn from.
+        max_frames (int): Largest frame count checked; defaults to num_pages,
+            beyond which nothing is ever evicted.
+        count (int): Number of strings for the random family.
+        seed (int): Seed for the random family.
+        max_workers (int): Worker processes; defaults to the number of CPUs.
+        chunk_size (int): Random strings per worker task.
+        top (int): Number of worst cases to keep.
+
+    Returns:
+        dict: Strings checked, anomalies, rates and the worst cases.
+    """
+    if policy not in policy_names():
+        raise ValueError(f"Unknown replacement policy: {policy}")
+    if family == 'enumerate':
+        chunks = _enumerate_chunks(length, num_pages, prefix_length=max(1, length // 2))
+    elif family == 'random':
+        chunks = _random_chunks(count, chunk_size, seed)
+    else:
+        raise ValueError(f"Unknown family: {family}")
+    if max_frames is None:
+        max_frames = num_pages
+
+    checked = 0
+    found = 0
+    anomalous = 0
+    worst = []
+    start = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_search_chunk, policy, chunk, length, num_pages, max_frames, top) for chunk in chunks]
+        for future in concurrent.futures.as_completed(futures):
+            chunk_checked, chunk_found, chunk_anomalous, chunk_worst = future.result()
+            checked += chunk_checked
+            found += chunk_found
+            anomalous += chunk_anomalous
+            worst = sorted(worst + chunk_worst, reverse=True)[:top]
+    elapsed = time.perf_counter() - start
+
+    return {
+        "policy": policy,
+        "family": family,
+        "strings": checked,
+        "anomalies": found,
+        "anomalous_strings": anomalous,
+        "seconds": elapsed,
+        "strings_per_second": checked / elapsed if elapsed else 0.0,
+        "anomalies_per_second": found / elapsed if elapsed else 0.0,
+        "worst": worst,
+    }
+
+
+def print_report(report):
+    """
+    Prints a search report.
+    """
+    print(f"Policy: {report['policy']}, family: {report['family']}")
+    print(f"Strings checked: {report['strings']} ({report['strings_per_second']:.0f}/s)")
+    print(f"Anomalies: {report['anomalies']} in {report['anomalous_strings']} strings "
+          f"({report['anomalies_per_second']:.1f}/s)")
+    for ratio, f, fewer, more, string in report['worst']:
+        print(f"  ratio {ratio:.3f}: {fewer} faults with {f} frames, {more} with {f + 1}: {' '.join(map(str, string))}")
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search reference strings for Belady's anomaly.")
+    parser.add_argument("--policy", default="fifo", choices=policy_names())
+    parser.add_argument("--family", default="random", choices=["random", "enumerate"])
+    parser.add_argument("--length", type=int, default=12)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--max-frames", type=int, default=None, help="largest frame count checked (default: --pages)")
+    parser.add_argument("--count", type=int, default=100000, help="strings in the random family")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all CPUs)")
+    parser.add_argument("--top", type=int, default=5, help="worst cases to show")
+    args = parser.parse_args()
+
+    print_report(search(args.policy, args.family, args.length, args.pages, args.max_frames, args.count,
+                        args.seed, args.workers, top=args.top))
@@ -0,0 +1,298 @@
+"""
+Benchmark of every page replacement simulator on synthetic workloads.
+
+Workloads are generated from a fixed seed, so every run sees exactly the
+same reference strings:
+- uniform: every page equally likely.
+- zipf: page popularity follows a Zipf distribution (a few very hot pages).
+- loop: a loop over slightly more pages than fit in memory, the worst case
+  for LRU and FIFO.
+- scan: one sequential pass after another over all pages.
+- phase: the program moves through phases, each touching its own small
+  working set.
+
+Each simulator entry point (the run_* functions of OS_Segmentation,
+fifoPageReplacement, LRUCache and optimalPage) runs on each workload at each
+size. The benchmark reports references per second, peak memory allocated
+during the run (from tracemalloc) and the fault count. Results can be saved
+as a JSON baseline, and later runs compared against it: a changed fault
+count, or throughput or memory worse than the tolerance allows, is reported
+as a regression and makes the script exit with status 1.
+
+Usage:
+    python benchmark.py --sizes 1000 100000 --save-baseline baseline.json
+    python benchmark.py --sizes 1000 100000 --baseline baseline.json
+"""
+
+import argparse
+import array
+import contextlib
+import io
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from OS_Segmentation import run_fifo, run_lru, run_optimal
+from fifoPageReplacement import fifoPageReplacement
+from leastRecentlyUsedPageReplacement import LRUCache
+from optimalPagingSimulation import optimalPage
+
+CHUNK_SIZE = 65536 # References generated per step, so 10^7-reference workloads never exist as a list
+
+RESULT_FIELDS = ["workload", "size", "simulator", "frames", "faults", "refs_per_second", "peak_bytes"]
+
+
+def uniform_workload(length, num_pages, rng):
+    """
+    Yields chunks of references where every page is equally likely.
+    """
+    pages = range(num_pages)
+    for start in range(0, length, CHUNK_SIZE):
+        yield rng.choices(pages, k=min(CHUNK_SIZE, length - start))
+
+
+def zipf_workload(length, num_pages, rng, alpha=0.9):
+    """
+    Yields chunks of references whose popularity follows Zipf(alpha). The
+    popularity ranks are shuffled over the pages so hot pages are not all
+    adjacent.
+    """
+    pages = list(range(num_pages))
+    rng.shuffle(pages)
+    cum_weights = []
+    total = 0.0
+    for rank in range(1, num_pages + 1):
+        total += 1.0 / rank ** alpha
+        cum_weights.append(total)
+    for start in range(0, length, CHUNK_SIZE):
+        yield rng.choices(pages, cum_weights=cum_weights, k=min(CHUNK_SIZE, length - start))
+
+
+def loop_workload(length, num_pages, rng):
+    """
+    Yields chunks of a loop over num_pages // 8 pages.
+    """
+    loop_size = max(1, num_pages // 8)
+    for start in range(0, length, CHUNK_SIZE):
+        yield [i % loop_size for i in range(start, min(start + CHUNK_SIZE, length))]
+
+
+def scan_workload(length, num_pages, rng):
+    """
+    Yields chunks of repeated sequential scans over every page.
+    """
+    for start in range(0, length, CHUNK_SIZE):
+        yield [i % num_pages for i in range(start, min(start + CHUNK_SIZE, length))]
+
+
+def phase_workload(length, num_pages, rng, phases=8):
+    """
+    Yields chunks of references that stay inside one working set of
+    num_pages // 10 pages per phase, with a new working set every phase.
+    """
+    phase_length = max(1, -(-length // phases))
+    set_size = max(1, num_pages // 10)
+    for phase_start in range(0, length, phase_length):
+        working_set = rng.sample(range(num_pages), set_size)
+        phase_end = min(phase_start + phase_length, length)
+        for start in range(phase_start, phase_end, CHUNK_SIZE):
+            yield rng.choices(working_set, k=min(CHUNK_SIZE, phase_end - start))
+
+
+WORKLOADS = {
+    'uniform': uniform_workload,
+    'zipf': zipf_workload,
+    'loop': loop_workload,
+    'scan': scan_workload,
+    'phase': phase_workload,
+}
+
+
+def make_workload(name, length, num_pages, seed=0):
+    """
+    Generates a reproducible workload.
+
+    Args:
+        name (str): A key of WORKLOADS.
+        length (int): Number of references.
+        num_pages (int): Number of distinct virtual pages.
+        seed (int): Seed; the same (name, length, num_pages, seed) always
+            gives the same references.
+
+    Returns:
+        array.array: The references as unsigned 64-bit integers.
+    """
+    if name not in WORKLOADS:
+        raise ValueError(f"Unknown workload: {name}")
+    rng = random.Random(f"{name}:{seed}") # String seeds are hashed deterministically
+    refs = array.array('Q')
+    for chunk in WORKLOADS[name](length, num_pages, rng):
+        refs.extend(chunk)
+    return refs
+
+#-------------------------------------------------
+
+def _run_lru_cache(refs, num_frames):
+    cache = LRUCache(num_frames, verbose=False)
+    for page in refs:
+        cache.accessPage(page)
+    return cache.pageFaults
+
+
+def _run_optimal_page(refs, num_frames):
+    with contextlib.redirect_stdout(io.StringIO()): # optimalPage always prints its hit and miss counts
+        hits = optimalPage(refs, len(refs), num_frames)
+    return len(refs) - hits
+
+
+# Simulator name -> function(refs, num_frames) returning the fault count.
+SIMULATORS = {
+    'OS_Segmentation.run_fifo': lambda refs, num_frames: run_fifo(refs, num_frames).faults,
+    'OS_Segmentation.run_lru': lambda refs, num_frames: run_lru(refs, num_frames).faults,
+    'OS_Segmentation.run_optimal': lambda refs, num_frames: run_optimal(refs, num_frames).faults,
+    'fifoPageReplacement': lambda refs, num_frames: fifoPageReplacement(refs, num_frames, verbose=False),
+    'LRUCache': _run_lru_cache,
+    'optimalPage': _run_optimal_page,
+}
+
+
+def measure(simulator, refs, num_frames, trace_memory=True, repeat=3):
+    """
+    Runs one simulator on one workload.
+
+    Throughput comes from the fastest of `repeat` timed runs, which filters
+    out most scheduling noise. Peak memory comes from one more run, because
+    tracemalloc slows every allocation down.
+
+    Returns:
+        tuple: (faults, references per second, peak bytes allocated by the
+        run or None if trace_memory is False).
+    """
+    run = SIMULATORS[simulator]
+    elapsed = float('inf')
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        faults = run(refs, num_frames)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    peak = None
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            run(refs, num_frames)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return faults, len(refs) / elapsed if elapsed > 0 else float('inf'), peak
+
+
+def run_benchmark(workloads, sizes, simulators, num_frames=100, num_pages=1000, seed=0, trace_memory=True, repeat=3):
+    """
+    Runs every simulator on every workload at every size.
+
+    Returns:
+        list: One dict per run with the keys in RESULT_FIELDS.
+    """
+    rows = []
+    for workload in workloads:
+        for size in sizes:
+            refs = make_workload(workload, size, num_pages, seed)
+            for simulator in simulators:
+                faults, rate, peak = measure(simulator, refs, num_frames, trace_memory, repeat)
+                rows.append({
+                    "workload": workload,
+                    "size": size,
+                    "simulator": simulator,
+                    "frames": num_frames,
+                    "faults": faults,
+                    "refs_per_second": rate,
+                    "peak_bytes": peak,
+                })
+    return rows
+
+
+def save_baseline(rows, path):
+    """
+    Writes benchmark results as a JSON baseline.
+    """
+    with open(path, 'w') as f:
+        json.dump({"python": sys.version.split()[0], "results": rows}, f, indent=1)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(rows, baseline, tolerance=0.2):
+    """
+    Compares results against a baseline.
+
+    Fault counts must match exactly, since the workloads are reproducible.
+    Throughput may drop, and peak memory grow, by at most the tolerance.
+
+    Args:
+        rows (list): Results of run_benchmark.
+        baseline (list): Results loaded from a baseline file.
+        tolerance (float): Allowed relative slowdown or memory growth.
+
+    Returns:
+        list: One message per regression; empty when there are none.
+    """
+    key = lambda row: (row["workload"], row["size"], row["simulator"], row["frames"])
+    previous = {key(row): row for row in baseline}
+    regressions = []
+    for row in rows:
+        old = previous.get(key(row))
+        if old is None:
+            continue # Not in the baseline, so nothing to compare against
+        name = "{}/{}/{}/{} frames".format(*key(row))
+        if row["faults"] != old["faults"]:
+            regressions.append(f"{name}: faults changed from {old['faults']} to {row['faults']}")
+        if row["refs_per_second"] < old["refs_per_second"] * (1 - tolerance):
+            regressions.append(f"{name}: {row['refs_per_second']:.0f} refs/s, baseline {old['refs_per_second']:.0f}")
+        if row["peak_bytes"] is not None and old["peak_bytes"] is not None:
+            if row["peak_bytes"] > old["peak_bytes"] * (1 + tolerance):
+                regressions.append(f"{name}: peak {row['peak_bytes']} bytes, baseline {old['peak_bytes']}")
+    return regressions
+
+
+def print_results(rows):
+    """
+    Prints benchmark results as a table.
+    """
+    print("Workload | Size      | Simulator                   | Faults    | Refs/s      | Peak KiB")
+    print("---------+-----------+-----------------------------+-----------+-------------+---------")
+    for row in rows:
+        peak = "-" if row["peak_bytes"] is None else f"{row['peak_bytes'] / 1024:.0f}"
+        print(f"{row['workload']:<8} | {row['size']:<9} | {row['simulator']:<27} | {row['faults']:<9} | {row['refs_per_second']:<11.0f} | {peak}")
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the page replacement simulators on synthetic workloads.")
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOADS), choices=list(WORKLOADS))
+    parser.add_argument("--simulators", nargs="+", default=list(SIMULATORS), choices=list(SIMULATORS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000, 100000], help="references per workload, up to 10^7")
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=1000, help="distinct virtual pages per workload")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per cell; the fastest counts")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--save-baseline", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare the results against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown or memory growth")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.workloads, args.sizes, args.simulators, args.frames, args.pages, args.seed, not args.no_memory, args.repeat)
+    print_results(results)
+    if args.save_baseline:
+        save_baseline(results, args.save_baseline)
+    if args.baseline:
+        regressions = compare(results, load_baseline(args.baseline), args.tolerance)
+        for regression in regressions:
+            print("REGRESSION:", regression)
+        if regressions:
+            sys.exit(1)
+        print("No regressions against", args.baseline)
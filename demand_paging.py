@@ -0,0 +1,422 @@
+"""
+Demand paging with dirty pages and asynchronous write-back.
+
+PythonPagingSimulation.pageFault treats every fault as a read from backing
+store, and evicting a page costs nothing. In a real system a page that was
+written since it was loaded is dirty, and its frame can only be reused once
+the page has been written back. This module models that:
+
+- References carry an access: 'r' or 'w' (a bare page number is a read).
+- Every resident page has a DIRTY and a REFERENCED bit. A write sets DIRTY,
+  every access sets REFERENCED, and the OS clears the REFERENCED bits every
+  reference_interval references, so evicting a page whose bit is still set
+  shows the policy threw out a page in active use.
+- Victims are chosen by the policies in replacement_policies. A clean victim
+  is simply dropped. A dirty victim is copied into a write-back buffer and
+  its write is queued on the disk, so the frame is reused at once. At most
+  `depth` writes can be outstanding; a fault that needs a buffer slot while
+  all are taken stalls until the oldest write finishes. depth=0 writes every
+  dirty victim synchronously.
+- A fault on a page that is still in the write-back buffer is rescued from
+  the buffer without a disk read.
+
+The disk is an asyncio model in simulated time. Requests complete through
+SimulatedTime timers (asyncio futures), and the pager, a coroutine, drives
+the simulated clock forward whenever it has to wait, so page-ins,
+write-backs and computation overlap exactly as far as the queue depth
+allows. The disk serves one request at a time, page-ins ahead of queued
+write-backs unless read_priority is off, so write-backs use the time the
+disk would otherwise sit idle. The report separates clean and dirty evictions
+and gives the bytes and bandwidth used in each direction.
+"""
+
+import asyncio
+import collections
+import heapq
+
+from latency_model import DEFAULT_TIER_COSTS
+from replacement_policies import make_policy
+
+DIRTY = 1
+REFERENCED = 2
+
+PAGE_SIZE = 4096 # Bytes moved by one page-in or write-back
+ACCESSES = ('r', 'w')
+
+
+class SimulatedTime:
+    """
+    A simulated clock for coroutines.
+
+    at(when) returns a future that completes once the clock reaches `when`.
+    Nothing runs the clock on its own: a coroutine that has to wait calls
+    wait(), which fires the timers in time order until what it waits for
+    is done.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        Sets the clock back to 0 and drops every timer.
+        """
+        self.now = 0.0
+        self.timers = [] # Heap of (time, sequence, future)
+        self.sequence = 0 # Tie breaker, so timers at the same time fire in the order they were set
+
+    def at(self, when):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.timers, (when, self.sequence, future))
+        self.sequence += 1
+        return future
+
+    async def _fire_next(self):
+        when, _, future = heapq.heappop(self.timers)
+        self.now = max(self.now, when)
+        future.set_result(when)
+        await asyncio.sleep(0) # Let the coroutine waiting on the timer run before time moves on
+
+    async def wait(self, awaitable):
+        """
+        Advances the clock until a future or task is done.
+        """
+        while not awaitable.done():
+            if not self.timers:
+                raise RuntimeError("waiting on something no simulated timer will ever complete")
+            await self._fire_next()
+        return awaitable.result()
+
+    async def advance(self, seconds):
+        """
+        Lets `seconds` of simulated time pass, firing every timer due in it.
+        """
+        target = self.now + seconds
+        while self.timers and self.timers[0][0] <= target:
+            await self._fire_next()
+        self.now = target
+
+
+class AsyncDisk:
+    """
+    A disk that serves one request at a time.
+
+    Page-ins go ahead of queued write-backs when read_priority is set, since
+    a process is blocked on every page-in but on no write-back; otherwise all
+    requests are served in arrival order.
+
+    Args:
+        time (SimulatedTime): The clock the disk runs on.
+        read_time (float): Seconds per page-in.
+        write_time (float): Seconds per write-back.
+        depth (int): Write-backs that may be outstanding at once.
+        read_priority (bool): Serve page-ins before queued write-backs.
+        page_size (int): Bytes per page.
+    """
+
+    def __init__(self, time, read_time, write_time, depth=8, read_priority=True, page_size=PAGE_SIZE):
+        if depth < 0:
+            raise ValueError("depth must not be negative")
+        self.time = time
+        self.read_time = read_time
+        self.write_time = write_time
+        self.depth = depth
+        self.read_priority = read_priority
+        self.page_size = page_size
+        self.reset()
+
+    def reset(self):
+        """
+        Empties the queues and clears the counters.
+        """
+        self.read_queue = collections.deque() # Queued requests as (future, cost, written callback or None)
+        self.write_queue = collections.deque()
+        self.outstanding = collections.deque() # Futures of write-backs not yet on disk, oldest first
+        self.busy = False
+        self.reads = 0
+        self.writes = 0
+        self.busy_time = 0.0
+        self.stalls = 0 # Write-backs that had to wait for a free slot
+        self.stall_time = 0.0
+
+    def _start_next(self):
+        queue = self.read_queue if self.read_queue else self.write_queue
+        if not queue:
+            self.busy = False
+            return
+        self.busy = True
+        request = queue.popleft()
+        self.busy_time += request[1]
+        # The timer's callback runs before the coroutine that fired it resumes.
+        self.time.at(self.time.now + request[1]).add_done_callback(lambda _: self._finish(*request))
+
+    def _finish(self, future, cost, written):
+        if written is None:
+            self.reads += 1
+        else:
+            self.writes += 1
+            self.outstanding.popleft() # Write-backs are served in order, so the oldest finishes first
+            written()
+        future.set_result(None)
+        self._start_next()
+
+    def _submit(self, queue, cost, written):
+        future = asyncio.get_running_loop().create_future()
+        queue.append((future, cost, written))
+        if not self.busy:
+            self._start_next()
+        return future
+
+    def read(self):
+        """
+        Queues a page-in.
+
+        Returns:
+            asyncio.Future: Completes once the page has arrived.
+        """
+        queue = self.read_queue if self.read_priority else self.write_queue
+        return self._submit(queue, self.read_time, None)
+
+    async def write_back(self, written=lambda: None):
+        """
+        Queues a write-back and returns once it fits in the queue depth.
+
+        Args:
+            written (callable): Called as soon as the write is on disk.
+        """
+        self.outstanding.append(self._submit(self.write_queue, self.write_time, written))
+        if len(self.outstanding) > self.depth:
+            self.stalls += 1
+            start = self.time.now
+            while len(self.outstanding) > self.depth:
+                await self.time.wait(self.outstanding[0])
+            self.stall_time += self.time.now - start
+
+    async def drain(self):
+        """
+        Waits until every outstanding write-back is on disk.
+        """
+        while self.outstanding:
+            await self.time.wait(self.outstanding[-1])
+
+#-------------------------------------------------
+
+class DemandPager:
+    """
+    Demand paging of one process with dirty-page write-back.
+
+    Args:
+        num_frames (int): Physical frames.
+        policy (str): Replacement policy name (see replacement_policies.policy_names).
+        depth (int): Outstanding write-backs allowed; 0 writes synchronously.
+        read_priority (bool): Let page-ins overtake queued write-backs.
+        tier_costs (dict): Costs in seconds, merged over
+            latency_model.DEFAULT_TIER_COSTS. 'memory' is charged per
+            reference, 'disk' per page-in and 'disk_write' (default: the
+            'disk' cost) per write-back.
+        page_size (int): Bytes per page.
+        reference_interval (int): References between clearings of the
+            REFERENCED bits; None never clears them.
+        page_reference_string (list): Needed by the optimal policy only.
+    """
+
+    def __init__(self, num_frames, policy='lru', depth=8, read_priority=True, tier_costs=None, page_size=PAGE_SIZE,
+                 reference_interval=1000, page_reference_string=None):
+        self.tier_costs = dict(DEFAULT_TIER_COSTS)
+        if tier_costs:
+            self.tier_costs.update(tier_costs)
+        self.tier_costs.setdefault('disk_write', self.tier_costs['disk'])
+        self.policy = make_policy(policy, num_frames, page_reference_string)
+        self.depth = depth
+        self.read_priority = read_priority
+        self.page_size = page_size
+        self.reference_interval = reference_interval
+        self.time = SimulatedTime()
+        self.disk = AsyncDisk(self.time, self.tier_costs['disk'], self.tier_costs['disk_write'], depth, read_priority,
+                              page_size)
+        self.reset()
+
+    def reset(self):
+        """
+        Returns to a cold start: time 0, an idle disk, no resident pages and
+        zeroed counters. The clock, disk and policy are reset in place, so a
+        profiler attached to them stays attached.
+        """
+        self.time.reset()
+        self.disk.reset()
+        self.policy.reset()
+        self.bits = {} # Resident page -> DIRTY | REFERENCED
+        self.write_buffer = collections.Counter() # Evicted dirty page -> its write-backs still in flight
+        self.references = 0
+        self.write_references = 0
+        self.faults = 0
+        self.rescued = 0 # Faults served from the write-back buffer
+        self.clean_evictions = 0
+        self.dirty_evictions = 0
+        self.referenced_evictions = 0 # Victims whose REFERENCED bit was still set
+
+    async def access(self, page, access='r'):
+        """
+        Performs one reference.
+
+        Args:
+            page (int): The page referenced.
+            access (str): 'r' or 'w'.
+
+        Returns:
+            bool: True if the reference faulted.
+        """
+        if access not in ACCESSES:
+            raise ValueError(f"Unknown access: {access}")
+        self.references += 1
+        await self.time.advance(self.tier_costs['memory'])
+        fault = self.policy.access(page)
+        if fault:
+            self.faults += 1
+            page_in = None
+            if page in self.write_buffer:
+                self.rescued += 1 # The in-flight write will still make the disk copy current
+            else:
+                page_in = self.disk.read() # Queued before the victim's write-back, which only needs the buffer
+            victim = self.policy.last_victim
+            if victim is not None:
+                await self._evict(victim)
+            if page_in is not None:
+                await self.time.wait(page_in)
+            self.bits[page] = 0
+
+        if access == 'w':
+            self.write_references += 1
+            self.bits[page] |= DIRTY | REFERENCED
+        else:
+            self.bits[page] |= REFERENCED
+        if self.reference_interval and self.references % self.reference_interval == 0:
+            self.clear_referenced()
+        return fault
+
+    async def _evict(self, victim):
+        flags = self.bits.pop(victim)
+        if flags & REFERENCED:
+            self.referenced_evictions += 1
+        if not flags & DIRTY:
+            self.clean_evictions += 1
+            return
+        self.dirty_evictions += 1
+        self.write_buffer[victim] += 1
+        await self.disk.write_back(lambda: self._written(victim))
+
+    def _written(self, page):
+        self.write_buffer[page] -= 1
+        if not self.write_buffer[page]:
+            del self.write_buffer[page]
+
+    def clear_referenced(self):
+        """
+        Clears every resident page's REFERENCED bit, as the OS does periodically.
+        """
+        bits = self.bits
+        for page in bits:
+            bits[page] &= ~REFERENCED
+
+    async def run(self, references):
+        """
+        Runs a reference stream from a cold start (see reset()) and waits for
+        the last write-back.
+
+        Args:
+            references (iterable): Page numbers (reads) or (page, access) pairs.
+
+        Returns:
+            dict: The report, see report().
+        """
+        self.reset()
+        access = self.access
+        for reference in references:
+            if isinstance(reference, tuple):
+                await access(*reference)
+            else:
+                await access(reference)
+        await self.disk.drain()
+        return self.report()
+
+    def report(self):
+        """
+        Returns fault, eviction and I/O counters as a dict.
+        """
+        disk = self.disk
+        elapsed = self.time.now
+        bytes_read = disk.reads * self.page_size
+        bytes_written = disk.writes * self.page_size
+        return {
+            "policy": self.policy.name,
+            "frames": self.policy.num_frames,
+            "depth": self.depth,
+            "read_priority": self.read_priority,
+            "references": self.references,
+            "write_references": self.write_references,
+            "faults": self.faults,
+            "fault_rate": self.faults / self.references if self.references else 0.0,
+            "rescued": self.rescued,
+            "clean_evictions": self.clean_evictions,
+            "dirty_evictions": self.dirty_evictions,
+            "referenced_evictions": self.referenced_evictions,
+            "dirty_resident": sum(1 for flags in self.bits.values() if flags & DIRTY),
+            "write_stalls": disk.stalls,
+            "stall_time": disk.stall_time,
+            "elapsed": elapsed,
+            "bytes_read": bytes_read,
+            "bytes_written": bytes_written,
+            "read_bandwidth": bytes_read / elapsed if elapsed else 0.0,
+            "write_bandwidth": bytes_written / elapsed if elapsed else 0.0,
+            "disk_utilization": disk.busy_time / elapsed if elapsed else 0.0,
+        }
+
+
+def simulate_demand_paging(references, num_frames, policy='lru', depth=8, tier_costs=None, **options):
+    """
+    Runs a read/write reference stream through a DemandPager.
+
+    Args:
+        references (list): Page numbers or (page, access) pairs.
+        Other arguments: see DemandPager.
+
+    Returns:
+        dict: DemandPager.report().
+    """
+    page_reference_string = None
+    if policy == 'optimal':
+        page_reference_string = [r[0] if isinstance(r, tuple) else r for r in references]
+    pager = DemandPager(num_frames, policy, depth, tier_costs=tier_costs, page_reference_string=page_reference_string,
+                        **options)
+    return asyncio.run(pager.run(references))
+
+
+def with_writes(page_reference_string, write_fraction=0.3, seed=0):
+    """
+    Tags a plain reference string with accesses: each reference is a write
+    with probability write_fraction.
+
+    Returns:
+        list: (page, 'r' or 'w') pairs.
+    """
+    import random
+
+    rng = random.Random(seed)
+    return [(page, 'w' if rng.random() < write_fraction else 'r') for page in page_reference_string]
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    from benchmark import make_workload
+
+    refs = with_writes(make_workload('zipf', 50000, 2000, seed=1), write_fraction=0.3)
+    # An SSD-like disk, with 20 us of computation per reference for write-backs to overlap with.
+    costs = {'memory': 20e-6, 'disk': 100e-6, 'disk_write': 150e-6}
+
+    print("Policy | Depth | Faults | Clean Ev. | Dirty Ev. | Rescued | Stalls | Write MB/s | Elapsed (s)")
+    print("-------+-------+--------+-----------+-----------+---------+--------+------------+------------")
+    for policy in ('fifo', 'lru', 'clock'):
+        for depth in (0, 1, 8, 64):
+            report = simulate_demand_paging(refs, 600, policy, depth, costs)
+            print(f"{policy:<6} | {depth:<5} | {report['faults']:<6} | {report['clean_evictions']:<9} | "
+                  f"{report['dirty_evictions']:<9} | {report['rescued']:<7} | {report['write_stalls']:<6} | "
+                  f"{report['write_bandwidth'] / 1e6:<10.2f} | {report['elapsed']:.3f}")
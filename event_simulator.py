@@ -0,0 +1,255 @@
+"""
+Event-driven simulation of several processes sharing a CPU, memory and a disk.
+
+The page replacement drivers run one reference string from start to finish
+and only count faults. Here time is explicit: a priority queue (heapq) holds
+timed events, and a process that faults blocks on the disk while the CPU
+runs someone else. That shows what paging does to CPU utilization and
+throughput, not just to the fault count.
+
+Events:
+- REFERENCE: the running process issues its next memory reference. A hit
+  costs one memory access; a fault sends a page-in request to the disk and
+  blocks the process.
+- DISK_DONE: the disk finishes a page-in and starts the next queued one.
+- FAULT_DONE: the faulting process's page table is updated and it becomes
+  ready to run again.
+- SWITCH_DONE: a context switch finishes and the next ready process runs.
+
+The CPU is scheduled round robin: a process runs for `quantum` references,
+or until it faults, before the next ready process gets the CPU.
+
+Victims are chosen by the policies in replacement_policies, with either
+- local replacement: each process gets total_frames // processes frames and
+  only ever replaces its own pages, or
+- global replacement: one policy over all frames, so a process can take
+  frames from another. Pages are keyed by (pid, page).
+OPT can only be used locally: its victim choice needs the future reference
+order, and under global replacement that order depends on the schedule the
+simulation is still producing.
+"""
+
+import collections
+import heapq
+
+from latency_model import DEFAULT_TIER_COSTS
+from replacement_policies import OptimalPolicy, make_policy
+
+REFERENCE = 0
+DISK_DONE = 1
+FAULT_DONE = 2
+SWITCH_DONE = 3
+
+SCOPES = ('local', 'global')
+
+_END = object() # Returned by next() once a trace is exhausted
+
+
+class SimProcess:
+    """
+    One process: its reference stream, state and counters.
+    """
+
+    def __init__(self, pid, trace):
+        self.pid = pid
+        self.trace = iter(trace)
+        self.policy = None # Its own policy under local replacement
+        self.references = 0
+        self.faults = 0
+        self.slice_left = 0 # References left in the current time slice
+        self.finish_time = None
+
+    def stats(self):
+        return {
+            "pid": self.pid,
+            "references": self.references,
+            "faults": self.faults,
+            "finish_time": self.finish_time,
+        }
+
+
+class EventSimulator:
+    """
+    Runs several processes over a shared pool of frames in simulated time.
+
+    Args:
+        traces (list): One reference string per process.
+        total_frames (int): Physical frames.
+        policy (str): Replacement policy name, e.g. 'fifo', 'lru' or 'optimal'.
+        scope (str): 'local' or 'global' replacement.
+        quantum (int): References per time slice.
+        tier_costs (dict): Costs in seconds, merged over
+            latency_model.DEFAULT_TIER_COSTS; 'memory' is charged per
+            reference and page table update, 'disk' per page-in.
+        switch_time (float): Cost of a context switch, in seconds.
+    """
+
+    def __init__(self, traces, total_frames, policy='lru', scope='local', quantum=100, tier_costs=None, switch_time=5e-6):
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown replacement scope: {scope}")
+        if not traces:
+            raise ValueError("at least one trace is needed")
+        self.tier_costs = dict(DEFAULT_TIER_COSTS)
+        if tier_costs:
+            self.tier_costs.update(tier_costs)
+        self.scope = scope
+        self.quantum = quantum
+        self.switch_time = switch_time
+        self.processes = [SimProcess(pid, trace) for pid, trace in enumerate(traces)]
+
+        if scope == 'global':
+            if policy == OptimalPolicy.name:
+                raise ValueError("OPT needs the future reference order, which global replacement only knows after the run")
+            self.global_policy = make_policy(policy, total_frames)
+        else:
+            frames = total_frames // len(traces)
+            if frames < 1:
+                raise ValueError("every process needs at least one frame")
+            self.global_policy = None
+            for process, trace in zip(self.processes, traces):
+                process.policy = make_policy(policy, frames, trace)
+        self.policy_name = policy
+        self.total_frames = total_frames
+
+        self.events = [] # Heap of (time, sequence, kind, pid)
+        self.sequence = 0 # Tie breaker, so events at the same time run in the order they were scheduled
+        self.now = 0.0
+        self.ready = collections.deque() # pids waiting for the CPU
+        self.running = None # pid on the CPU, or None when it is idle or switching
+        self.switching = False
+        self.disk_queue = collections.deque() # pids waiting for the disk
+        self.disk_busy = False
+        self.cpu_busy_time = 0.0 # Time spent executing references
+        self.switch_total = 0.0 # Time spent in context switches
+        self.disk_busy_time = 0.0
+        self.context_switches = 0
+
+    def _schedule(self, time, kind, pid):
+        heapq.heappush(self.events, (time, self.sequence, kind, pid))
+        self.sequence += 1
+
+    def _access(self, process, page):
+        if self.global_policy is not None:
+            return self.global_policy.access((process.pid, page))
+        return process.policy.access(page)
+
+    def _dispatch(self, start=None):
+        """
+        Starts a context switch to the next ready process if the CPU is free.
+        The switch begins at `start`, or now.
+        """
+        if self.running is None and not self.switching and self.ready:
+            self.switching = True
+            self.context_switches += 1
+            self.switch_total += self.switch_time
+            start = self.now if start is None else start
+            self._schedule(start + self.switch_time, SWITCH_DONE, self.ready.popleft())
+
+    def _start_disk(self):
+        if not self.disk_busy and self.disk_queue:
+            self.disk_busy = True
+            cost = self.tier_costs['disk']
+            self.disk_busy_time += cost
+            self._schedule(self.now + cost, DISK_DONE, self.disk_queue.popleft())
+
+    def run(self):
+        """
+        Runs until every process has finished its trace.
+
+        Returns:
+            dict: The report, see report().
+        """
+        memory_time = self.tier_costs['memory']
+        self.ready.extend(process.pid for process in self.processes)
+        self._dispatch()
+
+        while self.events:
+            self.now, _, kind, pid = heapq.heappop(self.events)
+            process = self.processes[pid]
+
+            if kind == SWITCH_DONE:
+                self.switching = False
+                self.running = pid
+                process.slice_left = self.quantum
+                self._schedule(self.now, REFERENCE, pid)
+
+            elif kind == REFERENCE:
+                page = next(process.trace, _END)
+                if page is _END:
+                    process.finish_time = self.now
+                    self.running = None
+                    self._dispatch()
+                    continue
+                process.references += 1
+                process.slice_left -= 1
+                if self._access(process, page):
+                    # Page fault: block on the disk and give up the CPU.
+                    process.faults += 1
+                    self.disk_queue.append(pid)
+                    self._start_disk()
+                    self.running = None
+                    self._dispatch()
+                    continue
+                self.cpu_busy_time += memory_time
+                if process.slice_left <= 0 and self.ready:
+                    # Time slice used up and someone is waiting: preempt once this reference is done.
+                    self.ready.append(pid)
+                    self.running = None
+                    self._dispatch(self.now + memory_time)
+                else:
+                    if process.slice_left <= 0:
+                        process.slice_left = self.quantum # Nobody else is ready, so keep running
+                    self._schedule(self.now + memory_time, REFERENCE, pid)
+
+            elif kind == DISK_DONE:
+                self.disk_busy = False
+                self._start_disk()
+                # Updating the page table entry costs one memory access.
+                self._schedule(self.now + memory_time, FAULT_DONE, pid)
+
+            elif kind == FAULT_DONE:
+                self.ready.append(pid)
+                self._dispatch()
+
+        return self.report()
+
+    def report(self):
+        """
+        Returns utilization, throughput and per-process results as a dict.
+        """
+        references = sum(p.references for p in self.processes)
+        faults = sum(p.faults for p in self.processes)
+        elapsed = self.now
+        return {
+            "policy": self.policy_name,
+            "scope": self.scope,
+            "frames": self.total_frames,
+            "elapsed": elapsed,
+            "references": references,
+            "faults": faults,
+            "fault_rate": faults / references if references else 0.0,
+            "cpu_utilization": self.cpu_busy_time / elapsed if elapsed else 0.0,
+            "disk_utilization": self.disk_busy_time / elapsed if elapsed else 0.0,
+            "throughput": references / elapsed if elapsed else 0.0,
+            "context_switches": self.context_switches,
+            "processes": [p.stats() for p in self.processes],
+        }
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    import random
+
+    # Four processes with working sets of different sizes on an SSD-like disk.
+    rng = random.Random(0)
+    traces = [rng.choices(range(pages), k=5000) for pages in (8, 16, 32, 64)]
+
+    print("Policy  | Scope  | Faults | CPU Util | Disk Util | Refs/s")
+    print("--------+--------+--------+----------+-----------+----------")
+    for policy in ('fifo', 'lru', 'optimal'):
+        for scope in SCOPES:
+            if policy == 'optimal' and scope == 'global':
+                continue
+            simulator = EventSimulator(traces, total_frames=96, policy=policy, scope=scope, tier_costs={'disk': 100e-6})
+            report = simulator.run()
+            print(f"{policy:<7} | {scope:<6} | {report['faults']:<6} | {report['cpu_utilization']:<8.2%} | "
+                  f"{report['disk_utilization']:<9.2%} | {report['throughput']:.0f}")
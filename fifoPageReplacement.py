@@ -4,6 +4,9 @@ This script simulates the FIFO (First-In-First-Out) Page Replacement Algorithm.
 It allows the user to:
 - Input the number of memory frames.
 - Enter a sequence of page references.
+- Or pass the number of frames and a trace file on the command line, which is
+  streamed from disk instead of being read into memory:
+  python fifoPageReplacement.py <frames> <trace file>
 
 The program then:
 - Applies the FIFO page replacement logic.
@@ -11,6 +14,11 @@ The program then:
 - Reports the total number of page faults at the end.
 """
 
+import sys
+
+from replacement_policies import FIFOPolicy
+from trace_reader import iter_references, open_trace
+
 def getInput():
 
     """
@@ -35,7 +43,7 @@ def getInput():
     return frameSize, pages
 
 
-def fifoPageReplacement (pages, frameSize):
+def fifoPageReplacement (pages, frameSize, verbose=True):
 
     """
     Simulates the FIFO (First-In-First-Out) Page Replacement algorithm.
@@ -44,40 +52,49 @@ def fifoPageReplacement (pages, frameSize):
     ----------
         pages (list): A list of integers representing the page reference string.
         frameSize (int): The number of memory frames available.
+        verbose (bool): Print the memory status after every reference (default True).
 
     The function:
     - Prints whether each page reference results in a hit or a fault.
     - Displays the current state of memory after each operation.
     - Shows the total number of page faults at the end.
-    
+
+    With verbose=False nothing is printed, which keeps long reference strings fast.
+
+    Returns:
+    -------
+        - pageFaultsCounter (int): The total number of page faults.
     """
     
-    memory = [] # List to simulate memory frames (act like a queue).
-    pageFaultsCounter = 0 # Counter the total page faults.
+    memory = FIFOPolicy(frameSize) # The shared FIFO policy (a queue plus a set for O(1) hit checks).
 
     for page in pages:
 
-        # To check if the page is already in memory (Hit).
-        if page not in memory:
-            
-            pageFaultsCounter += 1 # To increase the page fault no in case if page is not in the memory.
+        # To access the page: True means a page fault (not in memory), and the policy then removes the oldest page if memory is full.
+        if memory.access(page):
+
+            if verbose:
+                print(f"Page {page} -> Fault -> memory: {memory.resident()}") # To show status after this operation.
 
-            # As per the FIFO algorithm, if memory is full, remove the oldest page.
-            if len(memory) >= frameSize:
-            
-                memory.pop(0) # To remove the oldest (first) page.
-            
-            memory.append(page) # To add the new page in the memory.
+        elif verbose:
+            print(f"Page {page} -> Hit -> memory: {memory.resident()}") # Page Hit (already in the memory).
 
-            print(f"Page {page} -> Fault -> memory: {memory}") # To show status after this operation.
+    pageFaultsCounter = memory.page_faults # Counter the total page faults.
 
-        else:
-            print(f"Page {page} -> Hit -> memory: {memory}") # Page Hit (already in the memory).
+    if verbose:
+        print(f"\nTotal Page Faults: {pageFaultsCounter}")
 
-    print(f"\nTotal Page Faults: {pageFaultsCounter}")
+    return pageFaultsCounter
 
 
 if __name__ == "__main__":
-    frameSize, pages = getInput() # To get input from user.
+    if len(sys.argv) == 3:
+        frameSize = int(sys.argv[1]) # No. of memory frames from the command line.
+        pages = iter_references(open_trace(sys.argv[2])) # To stream the page references from the trace file.
+
+        pageFaults = fifoPageReplacement(pages, frameSize, verbose=False) # Per-step output is skipped for trace files.
+        print(f"Total Page Faults: {pageFaults}")
+    else:
+        frameSize, pages = getInput() # To get input from user.
     
-    fifoPageReplacement(pages, frameSize); # To execute FIFO page replacement with input.
+        fifoPageReplacement(pages, frameSize); # To execute FIFO page replacement with input.
@@ -0,0 +1,203 @@
+"""
+Physical frame allocators for the paging simulation.
+
+- FrameAllocator: single frames from a free-list stack, with a bitmap that
+  records which frames are in use. Allocate and free are both O(1), no
+  matter how large physical memory is.
+- BuddyAllocator: contiguous runs of frames in power-of-two blocks. A block
+  is split in halves until it fits a request, and freed blocks are merged
+  with their free buddy, so allocate and free are O(log frames).
+
+Both count allocations, frees and failures, report fragmentation, and can
+time every allocation into a LatencyRecorder.
+"""
+
+import time
+
+
+class FrameAllocator:
+    """
+    O(1) single-frame allocator backed by a free list and an in-use bitmap.
+
+    Args:
+        num_frames (int): Number of physical frames.
+        recorder (LatencyRecorder): Optional recorder for allocation latency.
+    """
+
+    def __init__(self, num_frames, recorder=None):
+        self.num_frames = num_frames
+        self.recorder = recorder
+        self.allocations = 0
+        self.frees = 0
+        self.failures = 0 # Allocations that found no free frame
+        self.reset()
+
+    def reset(self):
+        """
+        Marks every frame free again.
+        """
+        self.free_list = list(range(self.num_frames - 1, -1, -1)) # Popped from the end, so low frames go first
+        self.in_use = bytearray(self.num_frames)
+
+    def allocate(self, count=1):
+        """
+        Allocates one frame.
+
+        Returns:
+            int: The frame number, or None if every frame is in use.
+        """
+        if count != 1:
+            raise ValueError("FrameAllocator hands out single frames; use BuddyAllocator for contiguous runs")
+        start = time.perf_counter() if self.recorder is not None else 0.0
+        if not self.free_list:
+            self.failures += 1
+            return None
+        frame = self.free_list.pop()
+        self.in_use[frame] = 1
+        self.allocations += 1
+        if self.recorder is not None:
+            self.recorder.record(time.perf_counter() - start)
+        return frame
+
+    def free(self, frame):
+        """
+        Returns a frame to the free list.
+        """
+        if not 0 <= frame < self.num_frames:
+            raise ValueError(f"frame {frame} is outside [0, {self.num_frames})")
+        if not self.in_use[frame]:
+            raise ValueError(f"frame {frame} is not allocated")
+        self.in_use[frame] = 0
+        self.free_list.append(frame)
+        self.frees += 1
+
+    def free_frames(self):
+        return len(self.free_list)
+
+    def stats(self):
+        """
+        Returns allocation counters as a dict. Single frames never fragment.
+        """
+        return {
+            "allocations": self.allocations,
+            "frees": self.frees,
+            "failures": self.failures,
+            "free_frames": self.free_frames(),
+            "external_fragmentation": 0.0,
+        }
+
+#-------------------------------------------------
+
+class BuddyAllocator:
+    """
+    Buddy allocator for contiguous multi-frame requests.
+
+    Physical memory is first cut into aligned power-of-two blocks. A request
+    for n frames gets a block of the next power of two at or above n.
+
+    Args:
+        num_frames (int): Number of physical frames.
+        recorder (LatencyRecorder): Optional recorder for allocation latency.
+    """
+
+    def __init__(self, num_frames, recorder=None):
+        self.num_frames = num_frames
+        self.max_order = max(0, num_frames.bit_length() - 1)
+        self.recorder = recorder
+        self.allocations = 0
+        self.frees = 0
+        self.failures = 0
+        self.reset()
+
+    def reset(self):
+        """
+        Marks every frame free again.
+        """
+        self.free_lists = [set() for _ in range(self.max_order + 1)] # order -> base frames of free blocks
+        self.allocated = {} # base frame -> (order, frames requested)
+        self.requested_frames = 0
+        base = 0
+        for order in range(self.max_order, -1, -1):
+            # Greedy decomposition from frame 0 keeps every block aligned to its size.
+            if base + (1 << order) <= self.num_frames:
+                self.free_lists[order].add(base)
+                base += 1 << order
+
+    def allocate(self, count=1):
+        """
+        Allocates count contiguous frames.
+
+        Returns:
+            int: The first frame of the block, or None if no block is large enough.
+        """
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        start = time.perf_counter() if self.recorder is not None else 0.0
+        order = max(0, (count - 1).bit_length())
+        available = order
+        while available <= self.max_order and not self.free_lists[available]:
+            available += 1
+        if available > self.max_order:
+            self.failures += 1
+            return None
+
+        base = self.free_lists[available].pop()
+        while available > order:
+            # Split the block and keep the upper half free.
+            available -= 1
+            self.free_lists[available].add(base + (1 << available))
+
+        self.allocated[base] = (order, count)
+        self.requested_frames += count
+        self.allocations += 1
+        if self.recorder is not None:
+            self.recorder.record(time.perf_counter() - start)
+        return base
+
+    def free(self, base):
+        """
+        Frees a block and merges it with its buddy as long as the buddy is free.
+        """
+        if not 0 <= base < self.num_frames:
+            raise ValueError(f"frame {base} is outside [0, {self.num_frames})")
+        if base not in self.allocated:
+            raise ValueError(f"frame {base} is not the start of an allocated block")
+        order, count = self.allocated.pop(base)
+        self.requested_frames -= count
+        while order < self.max_order:
+            buddy = base ^ (1 << order)
+            if buddy not in self.free_lists[order]:
+                break
+            self.free_lists[order].remove(buddy)
+            base = min(base, buddy)
+            order += 1
+        self.free_lists[order].add(base)
+        self.frees += 1
+
+    def free_frames(self):
+        return sum(len(blocks) << order for order, blocks in enumerate(self.free_lists))
+
+    def largest_free_block(self):
+        for order in range(self.max_order, -1, -1):
+            if self.free_lists[order]:
+                return 1 << order
+        return 0
+
+    def stats(self):
+        """
+        Returns allocation counters and fragmentation as a dict.
+
+        internal_fragmentation is the number of allocated frames beyond what
+        was requested; external_fragmentation is 1 - largest free block / free
+        frames, 0 when all free memory is one block.
+        """
+        free = self.free_frames()
+        allocated_frames = sum(1 << order for order, _ in self.allocated.values())
+        return {
+            "allocations": self.allocations,
+            "frees": self.frees,
+            "failures": self.failures,
+            "free_frames": free,
+            "internal_fragmentation": allocated_frames - self.requested_frames,
+            "external_fragmentation": 1.0 - self.largest_free_block() / free if free else 0.0,
+        }
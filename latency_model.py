@@ -0,0 +1,83 @@
+"""
+Simulated latency model for the paging simulation.
+
+Instead of blocking on time.sleep() to imitate a slow device, every memory
+event is charged to a storage tier (TLB, main memory, disk, ...) and added
+to a simulated clock. A run of any length then finishes instantly and the
+clock gives the effective access time directly. A real-time mode still
+sleeps for every charge, for demos where the delay should be visible.
+"""
+
+import time
+
+# Default cost per access of each storage tier, in seconds.
+DEFAULT_TIER_COSTS = {
+    'tlb': 1e-9, # TLB lookup
+    'memory': 100e-9, # One main memory access (a page table entry or the data)
+    'disk': 0.5, # Servicing a page fault from backing store
+}
+
+
+class SimulatedClock:
+    """
+    Accumulates simulated time charged to storage tiers.
+
+    Args:
+        tier_costs (dict): Tier name -> cost in seconds, merged over
+            DEFAULT_TIER_COSTS.
+        real_time (bool): Also sleep for every charge, like a real device.
+    """
+
+    def __init__(self, tier_costs=None, real_time=False):
+        self.tier_costs = dict(DEFAULT_TIER_COSTS)
+        if tier_costs:
+            self.tier_costs.update(tier_costs)
+        self.real_time = real_time
+        self.now = 0.0 # Simulated seconds elapsed
+        self.tier_time = {tier: 0.0 for tier in self.tier_costs}
+        self.tier_count = {tier: 0 for tier in self.tier_costs}
+        self.accesses = 0 # Memory references the clock has been told about
+
+    def charge(self, tier, count=1):
+        """
+        Charges count accesses to a tier and returns the time they took.
+        """
+        if tier not in self.tier_costs:
+            raise KeyError(f"Unknown storage tier: {tier}")
+        cost = self.tier_costs[tier] * count
+        self.now += cost
+        self.tier_time[tier] += cost
+        self.tier_count[tier] += count
+        if self.real_time:
+            time.sleep(cost)
+        return cost
+
+    def reference(self):
+        """
+        Marks the start of one memory reference, for effective access time.
+        """
+        self.accesses += 1
+
+    def effective_access_time(self):
+        """
+        Returns the simulated time per memory reference.
+        """
+        return self.now / self.accesses if self.accesses else 0.0
+
+    def reset(self):
+        self.now = 0.0
+        self.accesses = 0
+        for tier in self.tier_costs:
+            self.tier_time[tier] = 0.0
+            self.tier_count[tier] = 0
+
+    def report(self):
+        """
+        Returns a dict with the effective access time and per-tier totals.
+        """
+        return {
+            "references": self.accesses,
+            "simulated_time": self.now,
+            "effective_access_time": self.effective_access_time(),
+            "tiers": {tier: {"accesses": self.tier_count[tier], "time": self.tier_time[tier]} for tier in self.tier_costs},
+        }
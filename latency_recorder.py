@@ -0,0 +1,161 @@
+"""
+Latency recording for the paging benchmarks.
+
+Appending every measurement to a NumPy array with np.append copies the whole
+array each time, so recording n samples costs O(n^2) and soon dominates the
+thing being measured. LatencyRecorder instead writes samples into
+preallocated fixed-size chunks (O(1) per sample, no copying) and can also
+feed a log-linear histogram in the spirit of HdrHistogram, whose memory is
+fixed no matter how many samples are recorded. Percentiles (p50, p99,
+p99.9) come from the exact samples when they are kept, otherwise from the
+histogram.
+"""
+
+import array
+import math
+
+DEFAULT_CHUNK_SIZE = 65536 # Samples per preallocated chunk
+
+
+class LatencyHistogram:
+    """
+    Fixed-memory log-linear histogram of positive durations in seconds.
+
+    The range [lowest, highest] is split into powers of two and every power of
+    two into sub_buckets equal slices, so any recorded value is reported with
+    a relative error below 1 / sub_buckets.
+    """
+
+    def __init__(self, lowest=1e-9, highest=3600.0, sub_buckets=128):
+        self.lowest = lowest
+        self.sub_buckets = sub_buckets
+        self.octaves = max(1, math.ceil(math.log2(highest / lowest)) + 1)
+        self.counts = array.array('q', bytes(8 * self.octaves * sub_buckets))
+        self.count = 0
+
+    def _index(self, value):
+        """
+        Maps a value to its bucket, clamping to the histogram range.
+        """
+        scaled = max(value / self.lowest, 1.0)
+        mantissa, exponent = math.frexp(scaled) # scaled = mantissa * 2**exponent, 0.5 <= mantissa < 1
+        octave = exponent - 1
+        if octave >= self.octaves:
+            return len(self.counts) - 1
+        sub = int((mantissa * 2.0 - 1.0) * self.sub_buckets)
+        return octave * self.sub_buckets + sub
+
+    def _value(self, index):
+        """
+        Returns the midpoint value of a bucket.
+        """
+        octave, sub = divmod(index, self.sub_buckets)
+        return self.lowest * (2.0 ** octave) * (1.0 + (sub + 0.5) / self.sub_buckets)
+
+    def record(self, value):
+        self.counts[self._index(value)] += 1
+        self.count += 1
+
+    def percentile(self, p):
+        """
+        Returns the value at percentile p (0-100).
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(p / 100.0 * self.count))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank:
+                return self._value(index)
+        return self._value(len(self.counts) - 1)
+
+#-------------------------------------------------
+
+class LatencyRecorder:
+    """
+    Records latency samples in seconds with O(1) cost per sample.
+
+    Args:
+        keep_samples (bool): Store every sample in preallocated chunks (needed
+            for plotting and exact percentiles).
+        histogram (bool): Also feed a fixed-memory LatencyHistogram.
+        chunk_size (int): Samples per preallocated chunk.
+    """
+
+    def __init__(self, keep_samples=True, histogram=True, chunk_size=DEFAULT_CHUNK_SIZE):
+        if not keep_samples and not histogram:
+            raise ValueError("a recorder needs samples, a histogram, or both")
+        self.keep_samples = keep_samples
+        self.chunk_size = chunk_size
+        self.chunks = []
+        self.fill = chunk_size # Samples used in the last chunk; full forces a new chunk
+        self.histogram = LatencyHistogram() if histogram else None
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = 0.0
+
+    def record(self, value):
+        """
+        Records one latency sample in seconds.
+        """
+        if self.keep_samples:
+            if self.fill == self.chunk_size:
+                self.chunks.append(array.array('d', bytes(8 * self.chunk_size)))
+                self.fill = 0
+            self.chunks[-1][self.fill] = value
+            self.fill += 1
+        if self.histogram is not None:
+            self.histogram.record(value)
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def samples(self):
+        """
+        Returns every recorded sample, in order, as one array('d').
+        """
+        result = array.array('d')
+        for chunk in self.chunks[:-1]:
+            result.extend(chunk)
+        if self.chunks:
+            result.extend(self.chunks[-1][:self.fill])
+        return result
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        """
+        Returns the sample at percentile p (0-100), exact when samples are kept.
+        """
+        if self.count == 0:
+            return 0.0
+        if not self.keep_samples:
+            return self.histogram.percentile(p)
+        ordered = sorted(self.samples())
+        rank = max(1, math.ceil(p / 100.0 * self.count))
+        return ordered[rank - 1]
+
+    def summary(self):
+        """
+        Returns count, mean, min, max, p50, p99 and p999 as a dict.
+        """
+        if self.keep_samples and self.count:
+            ordered = sorted(self.samples())
+            pick = lambda p: ordered[max(1, math.ceil(p / 100.0 * self.count)) - 1]
+        else:
+            pick = self.percentile
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "min": self.minimum if self.count else 0.0,
+            "max": self.maximum,
+            "p50": pick(50),
+            "p99": pick(99),
+            "p999": pick(99.9),
+        }
@@ -4,6 +4,9 @@ This script simulates the Least Recently Used (LRU) Cache replacement algorithm.
 It allows the user to:
 - Input the number of memory frames (cache capacity).
 - Enter a sequence of page references.
+- Or pass the number of frames and a trace file on the command line, which is
+  streamed from disk instead of being read into memory:
+  python leastRecentlyUsedPageReplacement.py <frames> <trace file>
 
 The program then:
 - Applies the LRU page replacement logic.
@@ -11,6 +14,11 @@ The program then:
 - Reports the total number of page faults at the end.
 """
 
+import sys
+
+from replacement_policies import CompactLRUPolicy, LRUPolicy
+from trace_reader import iter_references, open_trace
+
 # Get input from user
 def getInput():
     """
@@ -23,65 +31,29 @@ def getInput():
     pageReferenceString = list(map(int, pageInput.strip().split()))
     return frameSize, pageReferenceString
 
-# Node class for doubly linked list
-class Node:
-    def __init__(self, page):
-        """
-        Initialize a Node object with a given page number.
-        - page: The page number associated with the node.
-        - prev: Previous node in the doubly linked list (initially None).
-        - next: Next node in the doubly linked list (initially None).
-        """
-        self.page = page # Page number
-        self.prev = None # Previous node of doubly linked list
-        self.next = None # Next node of doubly linked list
-
 # LRU Cache class
 class LRUCache:
-    def __init__(self, capacity):
+    def __init__(self, capacity, verbose=True, compact=False):
         """
         Initialize the LRUCache with a given capacity.
         - capacity: The number of frames the cache can hold.
+        - verbose: Print the memory state after every access (default True).
+          Turn it off for long reference strings.
+        - compact: Keep the pages in preallocated arrays (CompactLRUPolicy)
+          instead of a dict, for caches with millions of frames. It uses a
+          fraction of the memory but each access is slower.
         """
         
         self.capacity = capacity # No. of memory frames
-        self.pageMap = {} # Map (page no. to node)
-        self.head = None # Most recently used (MRU) page.
-        self.tail = None # Least recently used (LRU) page.
-        self.pageFaults = 0 # To count the number of page faults.
+        self.verbose = verbose # Whether accessPage prints the memory state
+        self.policy = (CompactLRUPolicy if compact else LRUPolicy)(capacity) # Either keeps pages in LRU -> MRU order.
 
-   
-    def remove(self, node):
+    @property
+    def pageFaults(self):
         """
-        Remove a node from the doubly linked list.
-        - node: The node to remove from the list.
+        The number of page faults so far.
         """
-        
-        if node.prev: 
-            node.prev.next = node.next # To adjust the previous node's next pointer.
-        else:
-            self.head = node.next # If node is head, update the head pointer.
-
-        if node.next:
-            node.next.prev = node.prev # To adjust the next node's previous pointer.
-        else:
-            self.tail = node.prev # If node is tail, update tail pointer.
-
-    
-    def addToFront(self, node):
-        """
-        Add a node to the front (most recently used) of the doubly linked list.
-        - node: The node to add to the front of the list.
-        """
-        
-        node.prev = None
-        node.next = self.head
-        if self.head:
-            self.head.prev = node # To adjust the old head's previous pointer
-        self.head = node # To make the new node the head.
-
-        if self.tail is None:
-            self.tail = node # If the list was empty, make this node the tail.
+        return self.policy.page_faults
 
     def getMemoryState(self):
         """
@@ -89,12 +61,7 @@ class LRUCache:
         - Returns: A list of page numbers in the order from MRU to LRU.
         """
         
-        result = []
-        current = self.head
-        while current:
-            result.append(current.page) # To collect page numbers from MRU to LRU.
-            current = current.next
-        return result
+        return self.policy.resident()[::-1] # The policy lists pages from LRU to MRU.
 
     def accessPage(self, page):
         """
@@ -103,32 +70,23 @@ class LRUCache:
         - If the page is not in the cache (fault), add it to the front.
           - If the cache is full, remove the least recently used (LRU) page.
         - page: The page number being accessed.
+        - Returns: True if the access was a page fault, False if it was a hit.
         """
         
-        if page in self.pageMap:
-            node = self.pageMap[page]
-            self.remove(node) # To remove from its current position
-            self.addToFront(node) # To move to the front (MRU)
-            print(f"Page {page} -> Hit -> Memory: {self.getMemoryState()}")
-
-        else:
-            # Page fault
-            self.pageFaults += 1
-            newNode = Node(page)
-            if len(self.pageMap) >= self.capacity:
-                # If memory is full, remove the LRU (tail)
-                del self.pageMap[self.tail.page] # To remove page from map
-                self.remove(self.tail) # To remove the LRU node
-            self.addToFront(newNode) # To add the new page to the front
-            self.pageMap[page] = newNode # To add the page to the map.
-            print(f"Page {page} -> Fault -> Memory: {self.getMemoryState()}")
-
+        fault = self.policy.access(page)
+        if self.verbose:
+            print(f"Page {page} -> {'Fault' if fault else 'Hit'} -> Memory: {self.getMemoryState()}")
+        return fault
 
 if __name__ == "__main__":
    
-    frameSize, pageReferenceString = getInput() # To get input from the user.
-
-    leastRecentlyUsed = LRUCache(frameSize) # To create an LRU cache with the specified frame size.
+    if len(sys.argv) == 3:
+        frameSize = int(sys.argv[1]) # No. of memory frames from the command line.
+        pageReferenceString = iter_references(open_trace(sys.argv[2])) # To stream the page references from the trace file.
+        leastRecentlyUsed = LRUCache(frameSize, verbose=False) # Per-access output is skipped for trace files.
+    else:
+        frameSize, pageReferenceString = getInput() # To get input from the user.
+        leastRecentlyUsed = LRUCache(frameSize) # To create an LRU cache with the specified frame size.
 
     # To simulate accessing each page in the reference string.
     for page in pageReferenceString:
@@ -0,0 +1,34 @@
+"""
+Next-use index for the Optimal (OPT/MIN) page replacement algorithm.
+
+The naive way to pick an OPT victim is to scan the rest of the reference
+string for every resident page on every fault, which costs O(n * frames)
+per fault. Instead, a single backward pass over the reference string
+records, for every position, the index at which the same page is
+referenced next. replacement_policies.OptimalPolicy keeps resident pages in
+a max-heap keyed by that index, so the whole simulation is O(n log frames).
+"""
+
+import array
+
+
+def next_use_indices(page_reference_string):
+    """
+    Computes the next-occurrence index for every reference in one backward pass.
+
+    Args:
+        page_reference_string (list): Sequence of page numbers requested.
+
+    Returns:
+        array.array: next_use[i] is the position of the next reference to the
+        same page as position i, or len(page_reference_string) if the page is
+        never referenced again.
+    """
+    n = len(page_reference_string)
+    next_use = array.array('q', bytes(8 * n))
+    last_seen = {}
+    for i in range(n - 1, -1, -1):
+        page = page_reference_string[i]
+        next_use[i] = last_seen.get(page, n)
+        last_seen[page] = i
+    return next_use
@@ -0,0 +1,327 @@
+"""
+Page table implementations behind a common PageTable interface.
+
+- FlatPageTable: one entry per virtual page in a dense array. One memory
+  access per lookup, but its size grows with the whole virtual address space.
+- RadixPageTable: a multi-level (e.g. 2- or 4-level) tree whose nodes are
+  allocated only when a page under them is mapped, so sparse address spaces
+  stay small. A lookup costs one memory access per level.
+- InvertedPageTable: one entry per physical frame, found through a hash
+  anchor table with chaining. Its size follows physical memory, not the
+  virtual address space; a lookup costs the anchor read plus the chain walk.
+
+All tables count lookups and simulated memory accesses and report their
+memory footprint, so table overhead can be compared on the same workload.
+"""
+
+import abc
+import array
+import math
+
+ENTRY_SIZE = 8 # Bytes per page table entry
+NO_FRAME = -1 # Stored in entries that hold no translation
+
+
+class PageTable(abc.ABC):
+    """
+    Common interface of all page tables.
+
+    lookup() returns the frame number mapped to a virtual page number, or None
+    when the page is not present (a page fault).
+    """
+
+    def __init__(self):
+        self.lookups = 0 # Number of lookup() calls
+        self.memory_accesses = 0 # Simulated memory reads done by lookups
+        self.mapped = 0 # Pages currently mapped
+
+    @abc.abstractmethod
+    def lookup(self, page):
+        """
+        Returns the frame mapped to page, or None.
+        """
+
+    @abc.abstractmethod
+    def map(self, page, frame):
+        """
+        Maps page to frame, replacing any earlier mapping of the page.
+        """
+
+    @abc.abstractmethod
+    def unmap(self, page):
+        """
+        Removes the page's mapping, if it has one.
+        """
+
+    @abc.abstractmethod
+    def clear(self):
+        """
+        Removes every mapping.
+        """
+
+    @abc.abstractmethod
+    def footprint_bytes(self):
+        """
+        Returns the memory the table itself occupies.
+        """
+
+    @staticmethod
+    def _check_frame(frame):
+        # NO_FRAME is how an entry says "not mapped", so a negative frame would silently lose the mapping.
+        if frame < 0:
+            raise ValueError(f"frame must be non-negative, got {frame}")
+
+    def stats(self):
+        """
+        Returns lookup, memory access and footprint counters as a dict.
+        """
+        return {
+            "type": type(self).__name__,
+            "mapped": self.mapped,
+            "lookups": self.lookups,
+            "memory_accesses": self.memory_accesses,
+            "accesses_per_lookup": self.memory_accesses / self.lookups if self.lookups else 0.0,
+            "footprint_bytes": self.footprint_bytes(),
+        }
+
+#-------------------------------------------------
+
+class FlatPageTable(PageTable):
+    """
+    A dense array with one entry per virtual page.
+
+    Args:
+        num_pages (int): Number of virtual pages.
+    """
+
+    def __init__(self, num_pages):
+        super().__init__()
+        self.num_pages = num_pages
+        self.entries = array.array('q', [NO_FRAME]) * num_pages
+
+    def lookup(self, page):
+        self.lookups += 1
+        self.memory_accesses += 1
+        frame = self.entries[page]
+        return None if frame == NO_FRAME else frame
+
+    def map(self, page, frame):
+        self._check_frame(frame)
+        if self.entries[page] == NO_FRAME:
+            self.mapped += 1
+        self.entries[page] = frame
+
+    def unmap(self, page):
+        if self.entries[page] != NO_FRAME:
+            self.mapped -= 1
+            self.entries[page] = NO_FRAME
+
+    def clear(self):
+        self.entries = array.array('q', [NO_FRAME]) * self.num_pages
+        self.mapped = 0
+
+    def footprint_bytes(self):
+        return self.num_pages * ENTRY_SIZE
+
+#-------------------------------------------------
+
+class RadixPageTable(PageTable):
+    """
+    A multi-level page table whose inner nodes are allocated lazily.
+
+    The virtual page number is split into `levels` equal index fields (the top
+    field takes any leftover bits), each selecting an entry in one level.
+
+    Args:
+        levels (int): Number of levels, at least 2, e.g. 2 or 4. A single
+            level is a FlatPageTable.
+        address_bits (int): Width of a virtual address.
+        page_bits (int): log2 of the page size.
+    """
+
+    def __init__(self, levels=4, address_bits=48, page_bits=12):
+        if levels < 2:
+            raise ValueError("a radix page table needs at least 2 levels; use FlatPageTable for one")
+        super().__init__()
+        self.levels = levels
+        self.vpn_bits = address_bits - page_bits
+        self.index_bits = math.ceil(self.vpn_bits / levels)
+        self.fanout = 1 << self.index_bits
+        self.mask = self.fanout - 1
+        self.shifts = [self.index_bits * (levels - 1 - level) for level in range(levels)]
+        self.root = [None] * self.fanout
+        self.nodes = 1 # Allocated nodes, including the root
+
+    def _check(self, page):
+        if not 0 <= page < (1 << self.vpn_bits):
+            raise IndexError(f"page {page} is outside the {self.vpn_bits}-bit virtual page space")
+
+    def lookup(self, page):
+        self._check(page)
+        self.lookups += 1
+        node = self.root
+        for shift in self.shifts[:-1]:
+            self.memory_accesses += 1
+            node = node[(page >> shift) & self.mask]
+            if node is None:
+                return None # An unallocated subtree means nothing below it is mapped
+        self.memory_accesses += 1
+        frame = node[page & self.mask]
+        return None if frame == NO_FRAME else frame
+
+    def map(self, page, frame):
+        self._check(page)
+        self._check_frame(frame)
+        node = self.root
+        for depth, shift in enumerate(self.shifts[:-1]):
+            index = (page >> shift) & self.mask
+            child = node[index]
+            if child is None:
+                # The last inner level points at leaf nodes of frame numbers.
+                leaf = depth == self.levels - 2
+                child = array.array('q', [NO_FRAME]) * self.fanout if leaf else [None] * self.fanout
+                node[index] = child
+                self.nodes += 1
+            node = child
+        if node[page & self.mask] == NO_FRAME:
+            self.mapped += 1
+        node[page & self.mask] = frame
+
+    def unmap(self, page):
+        self._check(page)
+        node = self.root
+        for shift in self.shifts[:-1]:
+            node = node[(page >> shift) & self.mask]
+            if node is None:
+                return
+        if node[page & self.mask] != NO_FRAME:
+            node[page & self.mask] = NO_FRAME
+            self.mapped -= 1
+
+    def clear(self):
+        self.root = [None] * self.fanout
+        self.nodes = 1
+        self.mapped = 0
+
+    def footprint_bytes(self):
+        return self.nodes * self.fanout * ENTRY_SIZE
+
+#-------------------------------------------------
+
+class InvertedPageTable(PageTable):
+    """
+    A hashed inverted page table with one entry per physical frame.
+
+    Entry f records which (pid, page) lives in frame f. A hash anchor table
+    maps hash(pid, page) to the first frame of a collision chain, and each
+    entry links to the next frame in its chain.
+
+    Args:
+        num_frames (int): Number of physical frames.
+        anchor_size (int): Hash anchor table size; defaults to the next power
+            of two at or above num_frames.
+    """
+
+    def __init__(self, num_frames, anchor_size=None):
+        super().__init__()
+        self.num_frames = num_frames
+        if anchor_size is None:
+            anchor_size = 1 << max(0, (num_frames - 1).bit_length())
+        self.anchor_size = anchor_size
+        self.anchors = array.array('q', [NO_FRAME]) * anchor_size
+        self.entry_pid = array.array('q', [NO_FRAME]) * num_frames
+        self.entry_page = array.array('q', [NO_FRAME]) * num_frames
+        self.entry_next = array.array('q', [NO_FRAME]) * num_frames
+
+    def _bucket(self, page, pid):
+        return hash((pid, page)) % self.anchor_size
+
+    def lookup(self, page, pid=0):
+        self.lookups += 1
+        self.memory_accesses += 1 # Reading the hash anchor
+        frame = self.anchors[self._bucket(page, pid)]
+        while frame != NO_FRAME:
+            self.memory_accesses += 1 # Reading one inverted table entry
+            if self.entry_page[frame] == page and self.entry_pid[frame] == pid:
+                return frame
+            frame = self.entry_next[frame]
+        return None
+
+    def map(self, page, frame, pid=0):
+        self._check_frame(frame)
+        if self.entry_page[frame] != NO_FRAME:
+            self._unlink(frame) # The frame is being reused for a new page
+        existing = self._find(page, pid)
+        if existing is not None:
+            self._unlink(existing) # The page moves to a new frame
+        bucket = self._bucket(page, pid)
+        self.entry_pid[frame] = pid
+        self.entry_page[frame] = page
+        self.entry_next[frame] = self.anchors[bucket]
+        self.anchors[bucket] = frame
+        self.mapped += 1
+
+    def unmap(self, page, pid=0):
+        frame = self._find(page, pid)
+        if frame is not None:
+            self._unlink(frame)
+
+    def _find(self, page, pid):
+        frame = self.anchors[self._bucket(page, pid)]
+        while frame != NO_FRAME:
+            if self.entry_page[frame] == page and self.entry_pid[frame] == pid:
+                return frame
+            frame = self.entry_next[frame]
+        return None
+
+    def _unlink(self, frame):
+        """
+        Removes a frame's entry from its collision chain and clears it.
+        """
+        bucket = self._bucket(self.entry_page[frame], self.entry_pid[frame])
+        previous = NO_FRAME
+        current = self.anchors[bucket]
+        while current != frame:
+            previous = current
+            current = self.entry_next[current]
+        if previous == NO_FRAME:
+            self.anchors[bucket] = self.entry_next[frame]
+        else:
+            self.entry_next[previous] = self.entry_next[frame]
+        self.entry_pid[frame] = NO_FRAME
+        self.entry_page[frame] = NO_FRAME
+        self.entry_next[frame] = NO_FRAME
+        self.mapped -= 1
+
+    def clear(self):
+        for table in (self.anchors, self.entry_pid, self.entry_page, self.entry_next):
+            for i in range(len(table)):
+                table[i] = NO_FRAME
+        self.mapped = 0
+
+    def footprint_bytes(self):
+        # Anchor table plus pid, page and chain link per frame.
+        return (self.anchor_size + 3 * self.num_frames) * ENTRY_SIZE
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    import random
+
+    # A sparse 48-bit address space: 16 regions of 256 pages scattered over 2^36 virtual pages.
+    rng = random.Random(0)
+    pages = [base + offset for base in rng.sample(range(0, 1 << 36, 1 << 20), 16) for offset in range(256)]
+    num_frames = len(pages)
+
+    tables = [RadixPageTable(levels=2), RadixPageTable(levels=4), InvertedPageTable(num_frames)]
+    for table in tables:
+        for frame, page in enumerate(pages):
+            table.map(page, frame)
+        for page in pages:
+            table.lookup(page)
+
+    print(f"Flat table for 2^36 pages would need {(1 << 36) * ENTRY_SIZE / 2**30:.0f} GiB")
+    print("Table                   | Footprint (KiB) | Accesses/Lookup")
+    print("------------------------+-----------------+----------------")
+    for table, name in zip(tables, ["Radix, 2 levels", "Radix, 4 levels", "Inverted (hashed)"]):
+        stats = table.stats()
+        print(f"{name:<23} | {stats['footprint_bytes'] / 1024:<15.0f} | {stats['accesses_per_lookup']:.2f}")
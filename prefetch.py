@@ -0,0 +1,416 @@
+"""
+Prefetching (read-ahead) in the fault path.
+
+The simulators load exactly the faulting page, so a sequential workload pays
+a full fault for every page it touches. PrefetchingPolicy wraps any
+replacement policy with a prefetcher: after a demand fault, and after the
+first reference to a page that was prefetched (so a stream that is being
+followed keeps going without faulting), the prefetcher predicts pages that
+are loaded through the wrapped policy like any other page. Prefetched pages
+therefore compete for frames under the same replacement rules.
+
+Prefetchers:
+- 'sequential': read-ahead of the next `window` pages. The window starts at
+  initial_window and doubles, up to max_window, while triggers keep landing
+  inside the previous read-ahead; a jump elsewhere resets it.
+- 'stride': detects a constant distance between triggers and, once it has
+  been confirmed, prefetches `degree` pages further along it.
+- 'markov': a table of which trigger followed which before; predicts the
+  most frequent successors of the current page.
+
+Metrics (demand references only; prefetch loads are counted separately):
+- accuracy: prefetched pages referenced before they were evicted, over all
+  prefetches.
+- coverage: demand faults the prefetches removed, useful / (useful + faults).
+- pollution faults: demand faults on pages that a prefetch had evicted.
+compare_prefetchers() also runs the policy without prefetching, so the net
+change in faults is exact.
+
+Read-ahead never evicts its own work: the number of pages asked for is
+capped at the frames not holding outstanding prefetches, and a candidate
+whose load would evict a prefetched page that has not been referenced yet
+(or the page just referenced) is not loaded.
+
+OPT cannot be wrapped: it relies on seeing exactly the reference string.
+PythonPagingSimulation.py uses the sequential prefetcher in its page fault
+handler when run with --prefetch.
+"""
+
+import abc
+import collections
+
+from replacement_policies import OptimalPolicy, ReplacementPolicy, make_policy, read_snapshot, run_policy
+
+
+class Prefetcher(abc.ABC):
+    """
+    Common interface of the prefetchers.
+    """
+
+    name = None
+
+    @abc.abstractmethod
+    def predict(self, page, limit):
+        """
+        Called on every trigger (a demand fault or the first reference to a
+        prefetched page), even when limit is 0, so the prefetcher keeps
+        tracking the stream.
+
+        Args:
+            page (int): The trigger.
+            limit (int): Most pages that can be prefetched now.
+
+        Returns:
+            iterable: At most limit pages to prefetch, most useful first.
+        """
+
+
+class SequentialPrefetcher(Prefetcher):
+    """
+    Read-ahead with an adaptive window.
+
+    Args:
+        initial_window (int): Pages read ahead at the start of a stream.
+        max_window (int): Largest read-ahead.
+    """
+
+    name = 'sequential'
+
+    def __init__(self, initial_window=2, max_window=32):
+        if not 1 <= initial_window <= max_window:
+            raise ValueError("need 1 <= initial_window <= max_window")
+        self.initial_window = initial_window
+        self.max_window = max_window
+        self.window = initial_window
+        self.last = None # Latest trigger
+
+    def predict(self, page, limit):
+        if self.last is not None and 0 < page - self.last <= self.window:
+            self.window = min(self.window * 2, self.max_window) # Still inside the read-ahead: the stream goes on
+        else:
+            self.window = self.initial_window
+        # The window never grows past what fits, so the next trigger lands inside it
+        self.window = max(1, min(self.window, limit))
+        self.last = page
+        return range(page + 1, page + 1 + min(self.window, limit))
+
+
+class StridePrefetcher(Prefetcher):
+    """
+    Constant-stride detection over the trigger stream.
+
+    Args:
+        degree (int): Pages prefetched along a confirmed stride.
+        confirmations (int): Times a stride must repeat before it is used.
+    """
+
+    name = 'stride'
+
+    def __init__(self, degree=4, confirmations=1):
+        self.degree = degree
+        self.confirmations = confirmations
+        self.last = None
+        self.stride = 0
+        self.confidence = 0 # Consecutive repeats of the current stride
+
+    def predict(self, page, limit):
+        if self.last is not None:
+            stride = page - self.last
+            if stride == self.stride:
+                self.confidence += 1
+            else:
+                self.stride = stride
+                self.confidence = 0
+        self.last = page
+        if not self.stride or self.confidence < self.confirmations:
+            return ()
+        return [page + self.stride * k for k in range(1, min(self.degree, limit) + 1)]
+
+
+class MarkovPrefetcher(Prefetcher):
+    """
+    First-order Markov prediction over the trigger stream.
+
+    Args:
+        successors (int): Most frequent successors prefetched per trigger.
+        max_entries (int): Pages the table remembers, least recently
+            updated dropped first; None is unbounded.
+    """
+
+    name = 'markov'
+
+    def __init__(self, successors=2, max_entries=None):
+        self.successors = successors
+        self.max_entries = max_entries
+        self.table = collections.OrderedDict() # page -> Counter of the triggers that followed it
+        self.last = None
+
+    def predict(self, page, limit):
+        table = self.table
+        if self.last is not None:
+            row = table.get(self.last)
+            if row is None:
+                row = table[self.last] = collections.Counter()
+                if self.max_entries is not None and len(table) > self.max_entries:
+                    table.popitem(last=False)
+            else:
+                table.move_to_end(self.last)
+            row[page] += 1
+        self.last = page
+        row = table.get(page)
+        if not row or limit <= 0:
+            return ()
+        return [successor for successor, _ in row.most_common(min(self.successors, limit))]
+
+
+PREFETCHERS = {
+    prefetcher.name: prefetcher
+    for prefetcher in (SequentialPrefetcher, StridePrefetcher, MarkovPrefetcher)
+}
+
+
+def make_prefetcher(name, **options):
+    """
+    Builds a prefetcher by name; options go to its constructor.
+    """
+    if name not in PREFETCHERS:
+        raise ValueError(f"Unknown prefetcher: {name}")
+    return PREFETCHERS[name](**options)
+
+#-------------------------------------------------
+
+class PrefetchingPolicy(ReplacementPolicy):
+    """
+    A replacement policy with a prefetcher in its fault path.
+
+    Its page_faults, hits and evictions count demand references only, so
+    run_policy() and the sweeps compare it directly with the bare policy.
+    Pages pushed out to make room for a prefetch are counted in
+    prefetch_evictions instead.
+
+    Args:
+        policy (ReplacementPolicy): The policy that manages the frames. It
+            is reset along with this one, starting with the wrap.
+        prefetcher (Prefetcher): Predicts the pages to load ahead.
+        num_pages (int): Pages of the address space; predictions outside
+            [0, num_pages) are dropped. None only drops negative pages.
+    """
+
+    def __init__(self, policy, prefetcher, num_pages=None):
+        if isinstance(policy, OptimalPolicy):
+            raise ValueError("OPT replays a fixed reference string, so prefetched pages cannot be inserted into it")
+        self.policy = policy
+        self.prefetcher = prefetcher
+        self.num_pages = num_pages
+        self.name = f"{policy.name}+{prefetcher.name}"
+        super().__init__(policy.num_frames)
+
+    def _clear(self):
+        # The prefetcher keeps what it has learned about the stream.
+        self.policy.reset()
+        self.prefetched = set() # Prefetched pages not referenced yet
+        self.evicted_by_prefetch = set() # Pages a prefetch evicted and nothing has loaded again since
+        self.prefetches = 0
+        self.useful_prefetches = 0
+        self.unused_evictions = 0 # Prefetched pages evicted before they were referenced
+        self.prefetch_evictions = 0 # Pages evicted to load a prefetch
+        self.pollution_faults = 0
+
+    def access(self, page):
+        policy = self.policy
+        if policy.access(page):
+            self.page_faults += 1
+            if page in self.evicted_by_prefetch:
+                self.pollution_faults += 1
+                self.evicted_by_prefetch.discard(page)
+            self.last_victim = policy.last_victim
+            if self.last_victim is not None:
+                self._evicted(self.last_victim)
+            self._prefetch(page)
+            return True
+
+        self.hits += 1
+        if page in self.prefetched:
+            self.prefetched.discard(page)
+            self.useful_prefetches += 1
+            self._prefetch(page)
+        return False
+
+    def _evicted(self, victim):
+        self.evictions += 1
+        if victim in self.prefetched:
+            self.prefetched.discard(victim)
+            self.unused_evictions += 1
+
+    def _prefetch(self, page):
+        policy = self.policy
+        prefetched = self.prefetched
+        # Frames left once the page just referenced and the outstanding prefetches are kept
+        budget = self.num_frames - 1 - len(prefetched)
+        for candidate in self.prefetcher.predict(page, max(budget, 0)):
+            if budget <= 0:
+                break
+            if candidate < 0 or (self.num_pages is not None and candidate >= self.num_pages):
+                continue
+            if candidate == page or candidate in policy:
+                continue
+            if len(policy) >= self.num_frames:
+                victim = policy.next_victim(candidate)
+                if victim == page or victim in prefetched:
+                    break # Loading it would throw away the read-ahead in flight
+            budget -= 1
+            policy.access(candidate)
+            self.prefetches += 1
+            prefetched.add(candidate)
+            self.evicted_by_prefetch.discard(candidate)
+            victim = policy.last_victim
+            if victim is not None:
+                self.prefetch_evictions += 1
+                if victim in prefetched:
+                    prefetched.discard(victim)
+                    self.unused_evictions += 1
+                else:
+                    self.evicted_by_prefetch.add(victim)
+
+    def evict(self):
+        victim = self.policy.evict()
+        self._evicted(victim)
+        return victim
+
+    def next_victim(self, page=None):
+        return self.policy.next_victim(page)
+
+    def stats(self):
+        """
+        Returns the demand counters plus the prefetch metrics as a dict.
+        """
+        stats = super().stats()
+        useful = self.useful_prefetches
+        stats.update({
+            "prefetches": self.prefetches,
+            "useful_prefetches": useful,
+            "unused_evictions": self.unused_evictions,
+            "prefetch_evictions": self.prefetch_evictions,
+            "pollution_faults": self.pollution_faults,
+            "accuracy": useful / self.prefetches if self.prefetches else 0.0,
+            "coverage": useful / (useful + self.page_faults) if useful + self.page_faults else 0.0,
+            "disk_reads": self.page_faults + self.prefetches,
+        })
+        return stats
+
+    def resident(self):
+        return self.policy.resident()
+
+    def _state(self):
+        # The wrapped policy's counters and state go first, then the prefetch
+        # bookkeeping; its class name is kept so it is restored into the same kind.
+        policy = self.policy
+        params, sequences = policy._state()
+        return ([policy.page_faults, policy.hits, policy.evictions,
+                 self.prefetches, self.useful_prefetches, self.unused_evictions, self.prefetch_evictions,
+                 self.pollution_faults, len(params), *params],
+                [*sequences, sorted(self.prefetched), sorted(self.evicted_by_prefetch),
+                 list(type(policy).__name__.encode())])
+
+    def _load_state(self, params, sequences):
+        policy = self.policy
+        name = bytes(sequences[-1]).decode()
+        if name != type(policy).__name__:
+            raise ValueError(f"snapshot wraps a {name}, not a {type(policy).__name__}")
+        (policy.page_faults, policy.hits, policy.evictions,
+         self.prefetches, self.useful_prefetches, self.unused_evictions, self.prefetch_evictions,
+         self.pollution_faults, count) = params[:9]
+        policy._load_state(params[9:9 + count], sequences[:-3])
+        self.prefetched = set(sequences[-3])
+        self.evicted_by_prefetch = set(sequences[-2])
+
+    def __contains__(self, page):
+        return page in self.policy
+
+    def __len__(self):
+        return len(self.policy)
+
+
+def restore_prefetching_policy(path, policy, prefetcher, num_pages=None):
+    """
+    Rebuilds a PrefetchingPolicy from a file written by its snapshot().
+
+    Args:
+        path (str): The snapshot file.
+        policy (ReplacementPolicy): A new, empty policy of the kind that was
+            wrapped, with the same number of frames.
+        prefetcher (Prefetcher): The prefetcher to continue with. Prediction
+            history is not saved, so it starts afresh.
+        num_pages (int): Address space size, see PrefetchingPolicy.
+
+    Returns:
+        PrefetchingPolicy: The policy, ready to be fed the rest of its stream.
+    """
+    snapshot = read_snapshot(path)
+    if snapshot["name"] != PrefetchingPolicy.__name__:
+        raise ValueError(f"{path} holds a {snapshot['name']}, not a PrefetchingPolicy")
+    if snapshot["num_frames"] != policy.num_frames:
+        raise ValueError(f"snapshot has {snapshot['num_frames']} frames, the policy {policy.num_frames}")
+    wrapped = PrefetchingPolicy(policy, prefetcher, num_pages)
+    wrapped._load_state(snapshot["params"], snapshot["sequences"])
+    wrapped.page_faults, wrapped.hits, wrapped.evictions = snapshot["page_faults"], snapshot["hits"], snapshot["evictions"]
+    return wrapped
+
+
+def compare_prefetchers(page_reference_string, num_frames, policy='lru', prefetchers=None, num_pages=None):
+    """
+    Runs a policy with each prefetcher and without one.
+
+    Args:
+        page_reference_string (list): The references.
+        num_frames (int): Physical frames.
+        policy (str): Replacement policy name.
+        prefetchers (dict): Label -> Prefetcher; defaults to one of each
+            kind with default settings.
+        num_pages (int): Address space size, see PrefetchingPolicy.
+
+    Returns:
+        list: One stats() dict per prefetcher, plus 'baseline_faults' and
+        'fault_reduction' (baseline faults minus faults) against the bare
+        policy.
+    """
+    if prefetchers is None:
+        prefetchers = {name: make_prefetcher(name) for name in PREFETCHERS}
+    baseline = run_policy(make_policy(policy, num_frames), page_reference_string).faults
+    rows = []
+    for label, prefetcher in prefetchers.items():
+        wrapped = PrefetchingPolicy(make_policy(policy, num_frames), prefetcher, num_pages)
+        run_policy(wrapped, page_reference_string)
+        stats = wrapped.stats()
+        stats["prefetcher"] = label
+        stats["baseline_faults"] = baseline
+        stats["fault_reduction"] = baseline - wrapped.page_faults
+        rows.append(stats)
+    return rows
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    import random
+
+    from benchmark import make_workload
+
+    rng = random.Random(0)
+    num_pages = 20000
+    # Sequential runs of 10-200 pages from random starting points, like reads of many files.
+    runs = []
+    while len(runs) < 100000:
+        start = rng.randrange(num_pages)
+        runs.extend(range(start, min(num_pages, start + rng.randint(10, 200))))
+    workloads = {
+        "sequential runs": runs[:100000],
+        "scan": list(make_workload('scan', 100000, num_pages)),
+        "stride 3": [(3 * i) % num_pages for i in range(100000)],
+        "zipf": list(make_workload('zipf', 100000, num_pages, seed=1)),
+    }
+
+    print("Workload        | Prefetcher | Faults (none) | Accuracy | Coverage | Pollution Faults")
+    print("----------------+------------+---------------+----------+----------+-----------------")
+    for label, refs in workloads.items():
+        for row in compare_prefetchers(refs, 1000, 'lru', num_pages=num_pages):
+            print(f"{label:<15} | {row['prefetcher']:<10} | {row['faults']:>6} ({row['baseline_faults']:>6}) | "
+                  f"{row['accuracy']:<8.2%} | {row['coverage']:<8.2%} | {row['pollution_faults']}")
@@ -0,0 +1,235 @@
+"""
+Profiling hooks for the simulators' hot paths.
+
+A Profiler counts and times calls to the methods that make up each phase of
+the simulators: lookup, victim selection, insertion, allocation, I/O and so
+on. attach(obj) replaces those methods on that one object with timing
+wrappers, and detach() puts the originals back. Nothing is patched until
+attach() is called, and a Profiler created with enabled=False never
+patches anything, so a simulator that is not being profiled runs exactly
+the code it always ran, at no cost.
+
+The methods of each phase are listed in PHASES by class name. attach()
+walks the object's class hierarchy, so every replacement policy gets
+access/victim_selection, and classes with finer-grained helpers (such as
+CompactLRUPolicy's hash table lookup) get those phases too.
+
+Calls are recorded per call stack, because phases nest: LRU's access calls
+evict to select a victim. For every stack the profiler keeps the call count,
+total time and self time (total time minus the time of nested phases), so
+victim selection can be told apart from the bookkeeping around it. Results
+can be exported as JSON, or in the folded stack format ("a;b;c value" per
+line) read by flamegraph.pl and speedscope.
+"""
+
+import functools
+import inspect
+import json
+import time
+
+# Class name -> {method name: phase}. Subclasses inherit the phases of their base classes.
+PHASES = {
+    'ReplacementPolicy': {'access': 'access', 'evict': 'victim_selection'},
+    'CompactLRUPolicy': {'_find': 'lookup', '_push_mru': 'insertion', '_unlink': 'bookkeeping',
+                         '_delete': 'bookkeeping'},
+    'ClockProPolicy': {'_run_hot_hand': 'hot_hand'},
+    'ARCPolicy': {'_replace': 'victim_selection'},
+    'PrefetchingPolicy': {'_prefetch': 'prefetch'},
+    'Prefetcher': {'predict': 'prediction'},
+    'PageTable': {'lookup': 'lookup', 'map': 'insertion', 'unmap': 'removal'},
+    'TLB': {'lookup': 'lookup', 'insert': 'insertion', 'invalidate': 'removal'},
+    'FrameAllocator': {'allocate': 'allocator', 'free': 'allocator'},
+    'BuddyAllocator': {'allocate': 'allocator', 'free': 'allocator'},
+    'SegmentAllocator': {'allocate': 'allocator', 'free': 'allocator', 'compact': 'compaction'},
+    'SegmentMMU': {'translate': 'translation', '_descriptor': 'lookup'},
+    'AsyncDisk': {'read': 'io', 'write_back': 'io', 'drain': 'io'},
+    'DemandPager': {'access': 'access', '_evict': 'eviction', 'clear_referenced': 'bookkeeping'},
+}
+
+
+def phases_for(obj):
+    """
+    Returns {method name: phase} for an object, merged over its class hierarchy.
+    """
+    phases = {}
+    for cls in reversed(type(obj).__mro__): # Base classes first, so subclasses override them
+        phases.update(PHASES.get(cls.__name__, {}))
+    return phases
+
+
+class Profiler:
+    """
+    Counts and times phases per call stack.
+
+    Args:
+        enabled (bool): When False, attach() and wrap() do nothing.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.records = {} # Stack (tuple of frame names) -> [calls, total ns, self ns]
+        self.stack = [] # Active calls as [stack, ns spent in nested phases]
+        self.attached = [] # (object, method name, original instance attribute or None)
+
+    def wrap(self, function, frame):
+        """
+        Returns function wrapped so that its calls are recorded under the
+        frame name, or function itself when the profiler is disabled.
+        """
+        if not self.enabled:
+            return function
+        records = self.records
+        stack = self.stack
+        clock = time.perf_counter_ns
+
+        def enter():
+            path = stack[-1][0] + (frame,) if stack else (frame,)
+            entry = [path, 0]
+            stack.append(entry)
+            return entry
+
+        def leave(entry, start):
+            elapsed = clock() - start
+            stack.pop()
+            if stack:
+                stack[-1][1] += elapsed
+            record = records.get(entry[0])
+            if record is None:
+                record = records[entry[0]] = [0, 0, 0]
+            record[0] += 1
+            record[1] += elapsed
+            record[2] += elapsed - entry[1]
+
+        if inspect.iscoroutinefunction(function):
+            # The time of an async phase includes the time it spends waiting.
+            @functools.wraps(function)
+            async def timed(*args, **kwargs):
+                entry = enter()
+                start = clock()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    leave(entry, start)
+        else:
+            @functools.wraps(function)
+            def timed(*args, **kwargs):
+                entry = enter()
+                start = clock()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    leave(entry, start)
+        return timed
+
+    def attach(self, obj, phases=None, label=None):
+        """
+        Instruments one object's phase methods.
+
+        Args:
+            obj: A policy, page table, TLB, allocator, MMU, disk or pager.
+            phases (dict): {method name: phase}; defaults to phases_for(obj).
+            label (str): Prefix of the frame names, "label.phase"; defaults
+                to the object's name attribute (e.g. 'lru') or class name.
+
+        Returns:
+            obj, for chaining.
+        """
+        if not self.enabled:
+            return obj
+        if phases is None:
+            phases = phases_for(obj)
+        if label is None:
+            name = getattr(obj, 'name', None)
+            label = name if isinstance(name, str) else type(obj).__name__
+        for method, phase in phases.items():
+            original = obj.__dict__.get(method)
+            setattr(obj, method, self.wrap(getattr(obj, method), f"{label}.{phase}"))
+            self.attached.append((obj, method, original))
+        return obj
+
+    def detach(self):
+        """
+        Restores every instrumented method. Recorded results are kept.
+        """
+        for obj, method, original in reversed(self.attached):
+            if original is None:
+                delattr(obj, method)
+            else:
+                setattr(obj, method, original)
+        self.attached = []
+
+    def reset(self):
+        """
+        Clears the recorded results.
+        """
+        self.records.clear()
+
+    def report(self):
+        """
+        Returns the results as a dict: one entry per call stack, and totals
+        per frame. A frame's total only counts its outermost calls, so a
+        phase that calls itself is not counted twice.
+        """
+        stacks = []
+        frames = {}
+        for path, (calls, total, self_time) in sorted(self.records.items()):
+            stacks.append({
+                "stack": list(path),
+                "calls": calls,
+                "total_ns": total,
+                "self_ns": self_time,
+            })
+            frame = frames.setdefault(path[-1], {"calls": 0, "total_ns": 0, "self_ns": 0})
+            frame["calls"] += calls
+            frame["self_ns"] += self_time
+            if path[-1] not in path[:-1]:
+                frame["total_ns"] += total
+        for frame in frames.values():
+            frame["mean_ns"] = frame["total_ns"] / frame["calls"] if frame["calls"] else 0.0
+        return {"stacks": stacks, "frames": frames}
+
+    def folded(self):
+        """
+        Returns the self time of every call stack in folded stack format,
+        one "frame;frame;frame nanoseconds" line per stack.
+        """
+        return [f"{';'.join(path)} {self_time}" for path, (_, _, self_time) in sorted(self.records.items())]
+
+    def write_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def write_folded(self, path):
+        with open(path, 'w') as f:
+            f.write('\n'.join(self.folded()) + '\n')
+
+
+def print_report(report):
+    """
+    Prints the per-frame totals of a Profiler report, slowest first.
+    """
+    frames = report["frames"]
+    total = sum(frame["self_ns"] for frame in frames.values())
+    print("Frame                          | Calls     | Self (ms) | Self % | Mean (ns)")
+    print("-------------------------------+-----------+-----------+--------+----------")
+    for name, frame in sorted(frames.items(), key=lambda item: -item[1]["self_ns"]):
+        share = frame["self_ns"] / total if total else 0.0
+        print(f"{name:<30} | {frame['calls']:<9} | {frame['self_ns'] / 1e6:<9.1f} | {share:<6.1%} | {frame['mean_ns']:.0f}")
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    from benchmark import make_workload
+    from replacement_policies import CompactLRUPolicy, POLICIES, run_policy
+
+    refs = make_workload('zipf', 200000, 5000, seed=1)
+    profiler = Profiler()
+    for name in sorted(POLICIES):
+        policy = profiler.attach(POLICIES[name](500))
+        run_policy(policy, refs)
+    run_policy(profiler.attach(CompactLRUPolicy(500)), refs)
+    profiler.detach()
+
+    print_report(profiler.report())
+    print("\nFolded stacks (ns of self time):")
+    for line in profiler.folded():
+        print(" ", line)
@@ -0,0 +1,1290 @@
+"""
+Page replacement policies behind one common protocol.
+
+Every policy is a ReplacementPolicy: construct it with a frame count, call
+access(page) once per reference (True means the reference faulted), evict()
+to force out the current victim, and stats() for the running counters.
+run_policy() drives a policy over a whole reference string and returns a
+SimulationResult.
+
+For continuous streams, feed() takes the references a batch at a time and
+stats() can be read between batches. snapshot() writes a policy's complete
+state (counters plus its internal order) to a compact binary file of int64
+arrays, and restore_policy() rebuilds it, so a long-running simulation can
+stop and resume exactly where it left off. Snapshots need integer pages.
+
+The simulators in OS_Segmentation, fifoPageReplacement,
+leastRecentlyUsedPageReplacement and optimalPagingSimulation all delegate
+to the policies here.
+
+Policies:
+- FIFOPolicy: first in, first out, as a deque plus a membership set.
+- LRUPolicy: least recently used, as an OrderedDict in LRU -> MRU order.
+- CompactLRUPolicy: the same LRU order kept in parallel prev/next/page
+  integer arrays indexed by slot, plus an array hash table for lookups.
+  It needs less than half of LRUPolicy's memory per frame but does its
+  bookkeeping in Python, so it is slower per reference.
+- OptimalPolicy: Belady's OPT/MIN. It needs the whole reference string up
+  front and picks victims from a max-heap keyed by next use (see
+  optimal_engine.next_use_indices).
+- ClockPolicy: CLOCK / second chance. One reference bit per frame and a
+  hand that clears bits until it finds a page whose bit is already clear.
+- ClockProPolicy: CLOCK-Pro style. Resident pages are hot or cold; cold pages
+  start a test period and leave a non-resident ghost when evicted. A fault
+  on a ghost proves a short reuse distance, so the page comes back hot and
+  the cold share of memory grows; ghosts that expire shrink it again.
+- LFUPolicy: least frequently used with O(1) frequency buckets; ties within
+  a frequency are broken by LRU.
+- ARCPolicy: Adaptive Replacement Cache, balancing recency (T1) and
+  frequency (T2) with ghost lists B1/B2 steering the target size p.
+- TwoQPolicy: full 2Q. New pages enter the FIFO A1in; pages evicted from it
+  are remembered in the ghost FIFO A1out, and only a fault on A1out
+  promotes a page into the LRU main queue Am.
+
+Apart from OPT (O(log frames)), all of them do O(1) amortized work per
+reference.
+"""
+
+import abc
+import array
+import collections
+import heapq
+import os
+import struct
+import sys
+
+from optimal_engine import next_use_indices
+
+# Result of a silent simulation run.
+# - faults: Total number of page faults.
+# - hits: Total number of page hits.
+# - evictions: Pages removed from memory to make room.
+# - fault_bitmap: bytearray with bit (i % 8) of byte (i // 8) set when
+#   reference i faulted, or None when per-step recording was not requested.
+SimulationResult = collections.namedtuple("SimulationResult", ["faults", "hits", "evictions", "fault_bitmap"])
+
+EMPTY_SLOT = -1 # Unused entry in CompactLRUPolicy's hash table
+
+FIBONACCI_MULTIPLIER = 0x9E3779B97F4A7C15 # 2^64 / phi, odd
+
+SNAPSHOT_MAGIC = b'RPOL'
+SNAPSHOT_VERSION = 1
+
+
+def fibonacci_hash(page, modulus):
+    """
+    Maps a page number to [0, modulus) with Fibonacci hashing: the top bits
+    of page * 2^64/phi, so strided and clustered pages spread evenly.
+    """
+    return ((page * FIBONACCI_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) * modulus >> 64
+
+
+class ReplacementPolicy(abc.ABC):
+    """
+    Common interface of the replacement policies.
+
+    Args:
+        num_frames (int): Number of available physical memory frames.
+    """
+
+    name = None # Short name used by run_policy callers and sweeps
+
+    def __init__(self, num_frames):
+        if num_frames < 1:
+            raise ValueError("num_frames must be at least 1")
+        self.num_frames = num_frames
+        self.reset()
+
+    def reset(self):
+        """
+        Returns to a cold start: no resident pages and zeroed counters. The
+        policy is reset in place, so references to it stay valid.
+        """
+        self.page_faults = 0
+        self.hits = 0
+        self.evictions = 0
+        self.last_victim = None # Page evicted by the latest access, or None
+        self._clear()
+
+    @abc.abstractmethod
+    def _clear(self):
+        """
+        Empties the policy-specific state.
+        """
+
+    @abc.abstractmethod
+    def access(self, page):
+        """
+        Processes one reference. On a fault with every frame in use the
+        victim is chosen by evict() and left in last_victim.
+
+        Returns:
+            bool: True if the reference was a page fault.
+        """
+
+    @abc.abstractmethod
+    def evict(self):
+        """
+        Removes the page the policy would replace next and returns it.
+        Raises KeyError when no page is resident.
+        """
+
+    @abc.abstractmethod
+    def next_victim(self, page=None):
+        """
+        Returns the page evict() would remove next, or that access(page) of a
+        non-resident page would replace, without changing any state. None
+        when nothing is resident.
+        """
+
+    def stats(self):
+        """
+        Returns the running counters as a dict.
+        """
+        references = self.page_faults + self.hits
+        return {
+            "policy": self.name,
+            "frames": self.num_frames,
+            "resident": len(self),
+            "references": references,
+            "faults": self.page_faults,
+            "hits": self.hits,
+            "evictions": self.evictions,
+            "fault_rate": self.page_faults / references if references else 0.0,
+        }
+
+    @abc.abstractmethod
+    def resident(self):
+        """
+        Returns the resident pages, in the policy's natural order.
+        """
+
+    def feed(self, pages):
+        """
+        Processes a batch of references, e.g. the next block of a live stream.
+
+        Returns:
+            int: The number of page faults in this batch.
+        """
+        faults_before = self.page_faults
+        access = self.access
+        for page in pages:
+            access(page)
+        return self.page_faults - faults_before
+
+    @abc.abstractmethod
+    def _state(self):
+        """
+        Returns the policy-specific state as (params, sequences): a list of
+        ints and a list of int sequences, enough for _load_state to rebuild
+        the policy exactly.
+        """
+
+    @abc.abstractmethod
+    def _load_state(self, params, sequences):
+        """
+        Rebuilds the policy-specific state from what _state returned.
+        """
+
+    def snapshot(self, path):
+        """
+        Writes the policy's state to a binary snapshot file.
+
+        The file is written next to path and renamed over it, so a crash
+        never leaves a half-written snapshot behind.
+        """
+        params, sequences = self._state()
+        name = type(self).__name__.encode()
+        parts = [
+            SNAPSHOT_MAGIC,
+            struct.pack('<HB', SNAPSHOT_VERSION, len(name)), name,
+            struct.pack('<4q', self.num_frames, self.page_faults, self.hits, self.evictions),
+            struct.pack(f'<H{len(params)}q', len(params), *params),
+            struct.pack('<H', len(sequences)),
+        ]
+        for sequence in sequences:
+            try:
+                values = array.array('q', sequence)
+            except (TypeError, OverflowError):
+                raise ValueError("snapshots need pages that are 64-bit integers") from None
+            if sys.byteorder == 'big':
+                values.byteswap()
+            parts.append(struct.pack('<Q', len(values)))
+            parts.append(values.tobytes())
+
+        temporary = f"{path}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(b''.join(parts))
+        os.replace(temporary, path)
+
+    @abc.abstractmethod
+    def __contains__(self, page):
+        """
+        Returns True if the page is resident.
+        """
+
+    @abc.abstractmethod
+    def __len__(self):
+        """
+        Returns the number of resident pages.
+        """
+
+
+def run_policy(policy, page_reference_string, record_steps=False, trace=None):
+    """
+    Runs a policy over a reference string without printing anything.
+
+    Args:
+        policy (ReplacementPolicy): The policy to drive.
+        page_reference_string (iterable): Sequence of page numbers requested.
+        record_steps (bool): Also return a per-step fault bitmap.
+        trace (callable): Optional sink called as trace(step, page, frames, fault, victim).
+
+    Returns:
+        SimulationResult: Fault, hit and eviction counts of this run.
+    """
+    access = policy.access
+    faults_before = policy.page_faults
+    hits_before = policy.hits
+    evictions_before = policy.evictions
+    fault_bitmap = bytearray() if record_steps else None
+
+    if fault_bitmap is None and trace is None:
+        for page in page_reference_string:
+            access(page)
+    else:
+        for i, page in enumerate(page_reference_string):
+            fault = access(page)
+            if fault_bitmap is not None:
+                if i & 7 == 0:
+                    fault_bitmap.append(0)
+                if fault:
+                    fault_bitmap[i >> 3] |= 1 << (i & 7)
+            if trace is not None:
+                trace(i + 1, page, policy.resident(), fault, policy.last_victim if fault else None)
+
+    return SimulationResult(policy.page_faults - faults_before, policy.hits - hits_before,
+                            policy.evictions - evictions_before, fault_bitmap)
+
+#-------------------------------------------------
+
+class FIFOPolicy(ReplacementPolicy):
+    """
+    First in, first out: the page resident the longest is replaced.
+    """
+
+    name = 'fifo'
+
+    def _clear(self):
+        self.frames = collections.deque() # Oldest page on the left
+        self.frame_set = set() # For quick checking if page is in frames
+
+    def access(self, page):
+        if page in self.frame_set:
+            self.hits += 1
+            return False
+
+        self.page_faults += 1
+        self.last_victim = self.evict() if len(self.frames) == self.num_frames else None
+        self.frames.append(page)
+        self.frame_set.add(page)
+        return True
+
+    def evict(self):
+        if not self.frames:
+            raise KeyError("no resident pages to evict")
+        victim = self.frames.popleft()
+        self.frame_set.remove(victim)
+        self.evictions += 1
+        return victim
+
+    def next_victim(self, page=None):
+        return self.frames[0] if self.frames else None
+
+    def resident(self):
+        return list(self.frames)
+
+    def _state(self):
+        return [], [self.frames]
+
+    def _load_state(self, params, sequences):
+        self.frames = collections.deque(sequences[0])
+        self.frame_set = set(self.frames)
+
+    def __contains__(self, page):
+        return page in self.frame_set
+
+    def __len__(self):
+        return len(self.frames)
+
+#-------------------------------------------------
+
+class LRUPolicy(ReplacementPolicy):
+    """
+    Least recently used: an OrderedDict whose first key is the LRU page and
+    whose last key is the MRU page.
+    """
+
+    name = 'lru'
+
+    def _clear(self):
+        self.frames = collections.OrderedDict()
+
+    def access(self, page):
+        frames = self.frames
+        if page in frames:
+            frames.move_to_end(page) # Page hit! Make it the MRU
+            self.hits += 1
+            return False
+
+        self.page_faults += 1
+        self.last_victim = self.evict() if len(frames) == self.num_frames else None
+        frames[page] = None # Value doesn't matter, only keys and their order
+        return True
+
+    def evict(self):
+        if not self.frames:
+            raise KeyError("no resident pages to evict")
+        victim, _ = self.frames.popitem(last=False)
+        self.evictions += 1
+        return victim
+
+    def next_victim(self, page=None):
+        return next(iter(self.frames), None)
+
+    def resident(self):
+        return list(self.frames)
+
+    def _state(self):
+        return [], [self.frames]
+
+    def _load_state(self, params, sequences):
+        self.frames = collections.OrderedDict.fromkeys(sequences[0])
+
+    def __contains__(self, page):
+        return page in self.frames
+
+    def __len__(self):
+        return len(self.frames)
+
+#-------------------------------------------------
+
+class CompactLRUPolicy(ReplacementPolicy):
+    """
+    Least recently used, kept entirely in preallocated integer arrays
+    instead of one object and one dict entry per page.
+
+    Slot i of prev/next/pages describes one resident page, and slot
+    num_frames is the list head: next[head] is the LRU page and prev[head]
+    the MRU page. Slots freed by evict() go on a free-slot stack. Pages are
+    found through an open-addressed hash table of slot numbers (linear
+    probing, backward-shift deletion), so a resident page costs about 50
+    bytes and nothing is allocated per fault. Pages must be integers that
+    fit in 64 bits.
+    """
+
+    name = 'compact_lru'
+
+    def _clear(self):
+        """
+        Empties the list and the hash table.
+        """
+        num_frames = self.num_frames
+        self.head = num_frames # Sentinel slot of the circular list
+        self.prev = array.array('q', [self.head]) * (num_frames + 1)
+        self.next = array.array('q', [self.head]) * (num_frames + 1)
+        self.pages = array.array('q', bytes(8 * num_frames)) # Page held by each slot
+        self.free_slots = array.array('q', range(num_frames - 1, -1, -1)) # Popped from the end
+        # Hash table of slots, at most half full so probe sequences stay short.
+        self.table_bits = max(1, (2 * num_frames - 1).bit_length())
+        self.table_size = 1 << self.table_bits
+        self.table_mask = self.table_size - 1
+        self.table = array.array('q', [EMPTY_SLOT]) * self.table_size
+
+    def _home(self, page):
+        return fibonacci_hash(page, self.table_size)
+
+    def _find(self, page):
+        """
+        Returns the table index holding page, or the empty index where it would go.
+        """
+        table, pages, mask = self.table, self.pages, self.table_mask
+        i = self._home(page)
+        while True:
+            slot = table[i]
+            if slot == EMPTY_SLOT or pages[slot] == page:
+                return i
+            i = (i + 1) & mask
+
+    def _delete(self, i):
+        """
+        Empties table index i and shifts later entries of its probe run back
+        so every remaining page stays reachable from its home index.
+        """
+        table, pages, mask = self.table, self.pages, self.table_mask
+        j = i
+        while True:
+            j = (j + 1) & mask
+            slot = table[j]
+            if slot == EMPTY_SLOT:
+                break
+            home = self._home(pages[slot])
+            # The entry at j may fill the hole at i unless its home lies cyclically in (i, j].
+            if (home <= i or home > j) if i <= j else (j < home <= i):
+                table[i] = slot
+                i = j
+        table[i] = EMPTY_SLOT
+
+    def _unlink(self, slot):
+        prev, next = self.prev, self.next
+        next[prev[slot]] = next[slot]
+        prev[next[slot]] = prev[slot]
+
+    def _push_mru(self, slot):
+        prev, next, head = self.prev, self.next, self.head
+        mru = prev[head]
+        prev[slot] = mru
+        next[slot] = head
+        next[mru] = slot
+        prev[head] = slot
+
+    def access(self, page):
+        i = self._find(page)
+        slot = self.table[i]
+        if slot != EMPTY_SLOT:
+            if self.next[slot] != self.head: # Page hit! Make it the MRU unless it already is
+                self._unlink(slot)
+                self._push_mru(slot)
+            self.hits += 1
+            return False
+
+        self.page_faults += 1
+        if self.free_slots:
+            self.last_victim = None
+        else:
+            self.last_victim = self.evict()
+            i = self._find(page) # The deletion may have shifted the empty index
+        slot = self.free_slots.pop()
+        self.pages[slot] = page
+        self.table[i] = slot
+        self._push_mru(slot)
+        return True
+
+    def evict(self):
+        slot = self.next[self.head]
+        if slot == self.head:
+            raise KeyError("no resident pages to evict")
+        self._unlink(slot)
+        victim = self.pages[slot]
+        self._delete(self._find(victim))
+        self.free_slots.append(slot)
+        self.evictions += 1
+        return victim
+
+    def next_victim(self, page=None):
+        slot = self.next[self.head]
+        return None if slot == self.head else self.pages[slot]
+
+    def resident(self):
+        pages = []
+        slot = self.next[self.head]
+        while slot != self.head:
+            pages.append(self.pages[slot])
+            slot = self.next[slot]
+        return pages
+
+    def _state(self):
+        return [], [self.resident()]
+
+    def _load_state(self, params, sequences):
+        self._clear()
+        for page in sequences[0]: # LRU first, so the last page inserted ends up MRU
+            slot = self.free_slots.pop()
+            self.pages[slot] = page
+            self.table[self._find(page)] = slot
+            self._push_mru(slot)
+
+    def __contains__(self, page):
+        return self.table[self._find(page)] != EMPTY_SLOT
+
+    def __len__(self):
+        return self.num_frames - len(self.free_slots)
+
+#-------------------------------------------------
+
+class OptimalPolicy(ReplacementPolicy):
+    """
+    Belady's Optimal (OPT/MIN): replaces the page used furthest in the future.
+
+    The policy is built from the whole reference string and must then be fed
+    that string in order. Resident pages sit in a max-heap keyed by the index
+    of their next reference. Entries go stale when a page is referenced again
+    (or evicted) and are discarded lazily when they reach the top; the heap is
+    rebuilt from the live entries before stale ones pile up.
+
+    Args:
+        num_frames (int): Number of available physical memory frames.
+        page_reference_string (list): The complete sequence of page numbers.
+    """
+
+    name = 'optimal'
+
+    def __init__(self, num_frames, page_reference_string):
+        super().__init__(num_frames)
+        self.page_reference_string = page_reference_string
+        self.next_use = next_use_indices(page_reference_string)
+        self.compact_at = max(64, 4 * num_frames)
+
+    def _clear(self):
+        self.position = 0 # Index of the next reference to be fed
+        self.frames = {} # Resident page -> index of its next reference
+        self.heap = [] # (-next use, page), may hold stale entries
+
+    def access(self, page):
+        i = self.position
+        if i >= len(self.next_use) or self.page_reference_string[i] != page:
+            raise ValueError(f"OptimalPolicy expected reference {i} of its reference string, got page {page}")
+        self.position = i + 1
+
+        frames = self.frames
+        if page in frames:
+            self.hits += 1
+            fault = False
+        else:
+            self.page_faults += 1
+            self.last_victim = self.evict() if len(frames) == self.num_frames else None
+            fault = True
+
+        nxt = self.next_use[i]
+        frames[page] = nxt
+        heapq.heappush(self.heap, (-nxt, page))
+        if len(self.heap) > self.compact_at:
+            self.heap = [(-key, p) for p, key in frames.items()]
+            heapq.heapify(self.heap)
+        return fault
+
+    def evict(self):
+        heap = self.heap
+        frames = self.frames
+        if not frames:
+            raise KeyError("no resident pages to evict")
+        while True:
+            key, victim = heapq.heappop(heap)
+            if frames.get(victim) == -key:
+                break # A live entry: the page is resident and this is its next use
+        del frames[victim]
+        self.evictions += 1
+        return victim
+
+    def next_victim(self, page=None):
+        heap = self.heap
+        while heap and self.frames.get(heap[0][1]) != -heap[0][0]:
+            heapq.heappop(heap) # Dropping stale entries changes nothing evict() would see
+        return heap[0][1] if heap else None
+
+    def resident(self):
+        return list(self.frames)
+
+    def _state(self):
+        return [self.position], [list(self.frames), list(self.frames.values())]
+
+    def _load_state(self, params, sequences):
+        self.position = params[0]
+        self.frames = dict(zip(sequences[0], sequences[1]))
+        self.heap = [(-key, page) for page, key in self.frames.items()]
+        heapq.heapify(self.heap)
+
+    def __contains__(self, page):
+        return page in self.frames
+
+    def __len__(self):
+        return len(self.frames)
+
+
+class SetOrderOptimalPolicy(OptimalPolicy):
+    """
+    OptimalPolicy with the victim choice OS_Segmentation.simulate_optimal
+    always printed.
+
+    When several resident pages are never referenced again, any of them is
+    an optimal victim. This picks the first of them in the iteration order
+    of a set of the resident pages, so the victim column stays the same.
+    Finding it scans the set, O(frames) per such fault, so only the printed
+    simulation uses this class; OptimalPolicy picks among them in O(log
+    frames). A restored policy iterates a set rebuilt from its snapshot.
+    """
+
+    def _clear(self):
+        super()._clear()
+        self.frame_set = set() # Resident pages, iterated to break ties
+
+    def access(self, page):
+        fault = super().access(page)
+        if fault:
+            self.frame_set.add(page)
+        return fault
+
+    def evict(self):
+        victim = self.next_victim()
+        if victim is None:
+            raise KeyError("no resident pages to evict")
+        del self.frames[victim] # Its heap entry goes stale: a page never referenced again is never loaded again
+        self.frame_set.remove(victim)
+        self.evictions += 1
+        return victim
+
+    def next_victim(self, page=None):
+        victim = super().next_victim(page)
+        never = len(self.next_use)
+        if victim is not None and self.frames[victim] == never:
+            victim = next(p for p in self.frame_set if self.frames[p] == never)
+        return victim
+
+    def _load_state(self, params, sequences):
+        super()._load_state(params, sequences)
+        self.frame_set = set(self.frames)
+
+#-------------------------------------------------
+
+class ClockPolicy(ReplacementPolicy):
+    """
+    CLOCK (second chance): frames form a circle with one reference bit each.
+    """
+
+    name = 'clock'
+
+    def _clear(self):
+        num_frames = self.num_frames
+        self.pages = [None] * num_frames # Frame -> page, None for an empty frame
+        self.referenced = bytearray(num_frames) # Frame -> reference bit
+        self.empty = list(range(num_frames - 1, -1, -1)) # Empty frames, lowest last
+        self.slot = {} # page -> frame
+        self.hand = 0
+
+    def access(self, page):
+        frame = self.slot.get(page)
+        if frame is not None:
+            self.referenced[frame] = 1
+            self.hits += 1
+            return False
+
+        self.page_faults += 1
+        self.last_victim = None if self.empty else self.evict()
+        frame = self.empty.pop()
+        self.pages[frame] = page
+        self.slot[page] = frame
+        self.referenced[frame] = 1
+        return True
+
+    def evict(self):
+        if not self.slot:
+            raise KeyError("no resident pages to evict")
+        # Sweep the hand, giving referenced pages a second chance.
+        pages = self.pages
+        referenced = self.referenced
+        hand = self.hand
+        while referenced[hand] or pages[hand] is None:
+            referenced[hand] = 0
+            hand = (hand + 1) % self.num_frames
+        victim = pages[hand]
+        del self.slot[victim]
+        pages[hand] = None
+        self.empty.append(hand)
+        self.hand = (hand + 1) % self.num_frames
+        self.evictions += 1
+        return victim
+
+    def next_victim(self, page=None):
+        pages = self.pages
+        referenced = self.referenced
+        first_resident = None
+        for step in range(self.num_frames):
+            frame = (self.hand + step) % self.num_frames
+            if pages[frame] is not None:
+                if not referenced[frame]:
+                    return pages[frame]
+                if first_resident is None:
+                    first_resident = pages[frame]
+        # Every resident page is referenced: the sweep clears them all and comes back to the first.
+        return first_resident
+
+    def resident(self):
+        return [page for page in self.pages if page is not None]
+
+    def _state(self):
+        occupied = [frame for frame, page in enumerate(self.pages) if page is not None]
+        return [self.hand], [self.empty, occupied, [self.pages[frame] for frame in occupied], list(self.referenced)]
+
+    def _load_state(self, params, sequences):
+        self.hand = params[0]
+        self.empty = list(sequences[0])
+        self.pages = [None] * self.num_frames
+        self.slot = {}
+        for frame, page in zip(sequences[1], sequences[2]):
+            self.pages[frame] = page
+            self.slot[page] = frame
+        self.referenced = bytearray(sequences[3])
+
+    def __contains__(self, page):
+        return page in self.slot
+
+    def __len__(self):
+        return len(self.slot)
+
+#-------------------------------------------------
+
+class ClockProPolicy(ReplacementPolicy):
+    """
+    CLOCK-Pro style replacement with hot/cold pages and non-resident ghosts.
+
+    The cold clock and hot clock are kept as two circular queues instead of
+    one list with three hands; the ghost queue plays the role of the test
+    hand and holds at most num_frames non-resident pages.
+    """
+
+    name = 'clockpro'
+
+    def _clear(self):
+        self.hot = collections.deque() # Hot resident pages in clock order
+        self.cold = collections.deque() # Cold resident pages in clock order
+        self.referenced = {} # Resident page -> reference bit
+        self.in_test = set() # Cold resident pages in their test period
+        self.ghosts = collections.OrderedDict() # Non-resident cold pages still in their test period
+        self.cold_target = 1 # Adaptive number of frames reserved for cold pages
+
+    def _run_hot_hand(self):
+        """
+        Demotes the first hot page whose reference bit is clear to cold.
+        """
+        while True:
+            page = self.hot.popleft()
+            if self.referenced[page]:
+                self.referenced[page] = 0
+                self.hot.append(page)
+            else:
+                self.cold.append(page) # Demoted pages are cold but not in test
+                return
+
+    def evict(self):
+        if not self.hot and not self.cold:
+            raise KeyError("no resident pages to evict")
+        # Keep the hot share within its target, then run the cold hand until
+        # it reaches a cold page whose reference bit is clear.
+        while len(self.hot) > self.num_frames - self.cold_target:
+            self._run_hot_hand()
+
+        while True:
+            if not self.cold:
+                self._run_hot_hand()
+            page = self.cold.popleft()
+            if self.referenced[page]:
+                self.referenced[page] = 0
+                if page in self.in_test:
+                    # Re-referenced during its test period: the page is hot.
+                    self.in_test.discard(page)
+                    self.hot.append(page)
+                    if len(self.hot) > self.num_frames - self.cold_target:
+                        self._run_hot_hand()
+                else:
+                    self.in_test.add(page)
+                    self.cold.append(page)
+                continue
+
+            del self.referenced[page]
+            if page in self.in_test:
+                self.in_test.discard(page)
+                self.ghosts[page] = None
+                if len(self.ghosts) > self.num_frames:
+                    # The oldest test period ran out without a reuse: favour hot pages.
+                    self.ghosts.popitem(last=False)
+                    self.cold_target = max(1, self.cold_target - 1)
+            self.evictions += 1
+            return page
+
+    def next_victim(self, page=None):
+        # The hands move through both clocks before they settle on a victim,
+        # so the sweep is run on a scratch copy of the clocks.
+        if not self.referenced:
+            return None
+        scratch = ClockProPolicy(self.num_frames)
+        scratch.hot = collections.deque(self.hot)
+        scratch.cold = collections.deque(self.cold)
+        scratch.referenced = dict(self.referenced)
+        scratch.in_test = set(self.in_test)
+        scratch.cold_target = self.cold_target
+        return scratch.evict()
+
+    def access(self, page):
+        if page in self.referenced:
+            self.referenced[page] = 1
+            self.hits += 1
+            return False
+
+        self.page_faults += 1
+        self.last_victim = self.evict() if len(self.referenced) == self.num_frames else None
+
+        if page in self.ghosts:
+            # Faulted again within its test period: a short reuse distance, so it comes back hot.
+            del self.ghosts[page]
+            self.cold_target = min(self.num_frames - 1, self.cold_target + 1) if self.num_frames > 1 else 1
+            self.hot.append(page)
+        else:
+            self.in_test.add(page)
+            self.cold.append(page)
+        self.referenced[page] = 0
+        return True
+
+    def resident(self):
+        return list(self.hot) + list(self.cold)
+
+    def _state(self):
+        referenced = self.referenced
+        return [self.cold_target], [
+            self.hot, [referenced[page] for page in self.hot],
+            self.cold, [referenced[page] for page in self.cold],
+            self.in_test, self.ghosts,
+        ]
+
+    def _load_state(self, params, sequences):
+        self.cold_target = params[0]
+        hot, hot_bits, cold, cold_bits, in_test, ghosts = sequences
+        self.hot = collections.deque(hot)
+        self.cold = collections.deque(cold)
+        self.referenced = dict(zip(hot, hot_bits))
+        self.referenced.update(zip(cold, cold_bits))
+        self.in_test = set(in_test)
+        self.ghosts = collections.OrderedDict.fromkeys(ghosts)
+
+    def __contains__(self, page):
+        return page in self.referenced
+
+    def __len__(self):
+        return len(self.referenced)
+
+#-------------------------------------------------
+
+class LFUPolicy(ReplacementPolicy):
+    """
+    Least frequently used with O(1) frequency buckets.
+
+    Each bucket is an OrderedDict of the pages with that reference count, in
+    LRU order, and min_frequency points at the lowest non-empty bucket.
+    """
+
+    name = 'lfu'
+
+    def _clear(self):
+        self.frequency = {} # page -> reference count
+        self.buckets = collections.defaultdict(collections.OrderedDict) # count -> pages (LRU first)
+        self.min_frequency = 0
+
+    def access(self, page):
+        frequency = self.frequency.get(page)
+        if frequency is not None:
+            bucket = self.buckets[frequency]
+            del bucket[page]
+            if not bucket:
+                del self.buckets[frequency]
+                if self.min_frequency == frequency:
+                    self.min_frequency = frequency + 1
+            self.frequency[page] = frequency + 1
+            self.buckets[frequency + 1][page] = None
+            self.hits += 1
+            return False
+
+        self.page_faults += 1
+        self.last_victim = self.evict() if len(self.frequency) == self.num_frames else None
+        self.frequency[page] = 1
+        self.buckets[1][page] = None
+        self.min_frequency = 1
+        return True
+
+    def evict(self):
+        if not self.frequency:
+            raise KeyError("no resident pages to evict")
+        if self.min_frequency not in self.buckets:
+            # Only reachable after explicit evictions emptied the lowest bucket.
+            self.min_frequency = min(self.buckets)
+        bucket = self.buckets[self.min_frequency]
+        victim, _ = bucket.popitem(last=False)
+        if not bucket:
+            del self.buckets[self.min_frequency]
+        del self.frequency[victim]
+        self.evictions += 1
+        return victim
+
+    def next_victim(self, page=None):
+        if not self.frequency:
+            return None
+        frequency = self.min_frequency if self.min_frequency in self.buckets else min(self.buckets)
+        return next(iter(self.buckets[frequency]))
+
+    def resident(self):
+        return list(self.frequency)
+
+    def _state(self):
+        # Pages bucket by bucket, lowest count first and LRU first within a bucket.
+        bucket_order = [page for count in sorted(self.buckets) for page in self.buckets[count]]
+        return [self.min_frequency], [bucket_order, [self.frequency[page] for page in bucket_order], self.frequency]
+
+    def _load_state(self, params, sequences):
+        self.min_frequency = params[0]
+        bucket_order, counts, frequency_order = sequences
+        self.buckets = collections.defaultdict(collections.OrderedDict)
+        for page, count in zip(bucket_order, counts):
+            self.buckets[count][page] = None
+        frequency = dict(zip(bucket_order, counts))
+        self.frequency = {page: frequency[page] for page in frequency_order}
+
+    def __contains__(self, page):
+        return page in self.frequency
+
+    def __len__(self):
+        return len(self.frequency)
+
+#-------------------------------------------------
+
+class ARCPolicy(ReplacementPolicy):
+    """
+    Adaptive Replacement Cache (Megiddo and Modha).
+
+    T1 holds pages seen once recently and T2 pages seen at least twice; B1 and
+    B2 remember pages recently evicted from each. A fault on a B1 ghost grows
+    the T1 target p, a fault on a B2 ghost shrinks it.
+    """
+
+    name = 'arc'
+
+    def _clear(self):
+        self.t1 = collections.OrderedDict()
+        self.t2 = collections.OrderedDict()
+        self.b1 = collections.OrderedDict()
+        self.b2 = collections.OrderedDict()
+        self.p = 0 # Target size of T1
+
+    def _replace(self, in_b2):
+        """
+        Evicts the LRU page of T1 or T2 into its ghost list and returns it.
+        """
+        if self.t1 and (len(self.t1) > self.p or (in_b2 and len(self.t1) == self.p) or not self.t2):
+            victim, _ = self.t1.popitem(last=False)
+            self.b1[victim] = None
+        else:
+            victim, _ = self.t2.popitem(last=False)
+            self.b2[victim] = None
+        self.evictions += 1
+        return victim
+
+    def _make_room(self, in_b2):
+        """
+        Replaces a page only when every frame is in use; explicit evict()
+        calls can leave free frames while ghosts are still remembered.
+        """
+        if len(self.t1) + len(self.t2) < self.num_frames:
+            return None
+        return self._replace(in_b2)
+
+    def evict(self):
+        if not self.t1 and not self.t2:
+            raise KeyError("no resident pages to evict")
+        return self._replace(False)
+
+    def next_victim(self, page=None):
+        # A ghost hit adapts p before the replacement, as in access().
+        p = self.p
+        in_b2 = page in self.b2
+        if page in self.b1:
+            p = min(self.num_frames, p + max(len(self.b2) // len(self.b1), 1))
+        elif in_b2:
+            p = max(0, p - max(len(self.b1) // len(self.b2), 1))
+        if self.t1 and (len(self.t1) > p or (in_b2 and len(self.t1) == p) or not self.t2):
+            return next(iter(self.t1))
+        return next(iter(self.t2), None)
+
+    def access(self, page):
+        if page in self.t1:
+            del self.t1[page]
+            self.t2[page] = None
+            self.hits += 1
+            return False
+        if page in self.t2:
+            self.t2.move_to_end(page)
+            self.hits += 1
+            return False
+
+        self.page_faults += 1
+        c = self.num_frames
+        victim = None
+        if page in self.b1:
+            self.p = min(c, self.p + max(len(self.b2) // len(self.b1), 1))
+            victim = self._make_room(False)
+            del self.b1[page]
+            self.t2[page] = None
+        elif page in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) // len(self.b2), 1))
+            victim = self._make_room(True)
+            del self.b2[page]
+            self.t2[page] = None
+        else:
+            l1 = len(self.t1) + len(self.b1)
+            if l1 == c:
+                if len(self.t1) < c:
+                    self.b1.popitem(last=False)
+                    victim = self._make_room(False)
+                else:
+                    victim, _ = self.t1.popitem(last=False) # B1 is empty: drop the page without a ghost
+                    self.evictions += 1
+            else:
+                total = l1 + len(self.t2) + len(self.b2)
+                if total >= c:
+                    if total == 2 * c:
+                        self.b2.popitem(last=False)
+                    victim = self._make_room(False)
+            self.t1[page] = None
+        self.last_victim = victim
+        return True
+
+    def resident(self):
+        return list(self.t1) + list(self.t2)
+
+    def _state(self):
+        return [self.p], [self.t1, self.t2, self.b1, self.b2]
+
+    def _load_state(self, params, sequences):
+        self.p = params[0]
+        self.t1, self.t2, self.b1, self.b2 = (collections.OrderedDict.fromkeys(pages) for pages in sequences)
+
+    def __contains__(self, page):
+        return page in self.t1 or page in self.t2
+
+    def __len__(self):
+        return len(self.t1) + len(self.t2)
+
+#-------------------------------------------------
+
+class TwoQPolicy(ReplacementPolicy):
+    """
+    Full 2Q (Johnson and Shasha).
+
+    Args:
+        num_frames (int): Number of available physical memory frames.
+        in_fraction (float): Share of frames for the A1in FIFO (Kin).
+        out_fraction (float): Size of the A1out ghost FIFO relative to num_frames (Kout).
+    """
+
+    name = '2q'
+
+    def __init__(self, num_frames, in_fraction=0.25, out_fraction=0.5):
+        super().__init__(num_frames)
+        self.k_in = max(1, int(num_frames * in_fraction))
+        self.k_out = max(1, int(num_frames * out_fraction))
+
+    def _clear(self):
+        self.a1_in = collections.OrderedDict() # FIFO of pages seen once
+        self.a1_out = collections.OrderedDict() # Ghost FIFO of pages evicted from A1in
+        self.am = collections.OrderedDict() # LRU of pages re-referenced after A1in
+
+    def evict(self):
+        if not self.a1_in and not self.am:
+            raise KeyError("no resident pages to evict")
+        if len(self.a1_in) > self.k_in or not self.am:
+            victim, _ = self.a1_in.popitem(last=False)
+            self.a1_out[victim] = None
+            if len(self.a1_out) > self.k_out:
+                self.a1_out.popitem(last=False)
+        else:
+            victim, _ = self.am.popitem(last=False)
+        self.evictions += 1
+        return victim
+
+    def next_victim(self, page=None):
+        if len(self.a1_in) > self.k_in or not self.am:
+            return next(iter(self.a1_in), None)
+        return next(iter(self.am))
+
+    def access(self, page):
+        if page in self.am:
+            self.am.move_to_end(page)
+            self.hits += 1
+            return False
+        if page in self.a1_in:
+            self.hits += 1 # Correlated references inside A1in do not promote the page
+            return False
+
+        self.page_faults += 1
+        self.last_victim = self.evict() if len(self.a1_in) + len(self.am) == self.num_frames else None
+        if page in self.a1_out:
+            del self.a1_out[page]
+            self.am[page] = None
+        else:
+            self.a1_in[page] = None
+        return True
+
+    def resident(self):
+        return list(self.a1_in) + list(self.am)
+
+    def _state(self):
+        return [self.k_in, self.k_out], [self.a1_in, self.a1_out, self.am]
+
+    def _load_state(self, params, sequences):
+        self.k_in, self.k_out = params
+        self.a1_in, self.a1_out, self.am = (collections.OrderedDict.fromkeys(pages) for pages in sequences)
+
+    def __contains__(self, page):
+        return page in self.a1_in or page in self.am
+
+    def __len__(self):
+        return len(self.a1_in) + len(self.am)
+
+#-------------------------------------------------
+
+POLICIES = {
+    policy.name: policy
+    for policy in (FIFOPolicy, LRUPolicy, ClockPolicy, ClockProPolicy, LFUPolicy, ARCPolicy, TwoQPolicy)
+}
+
+
+def policy_names():
+    """
+    Returns the names accepted by make_policy.
+    """
+    return sorted(list(POLICIES) + [OptimalPolicy.name])
+
+
+def make_policy(name, num_frames, page_reference_string=None):
+    """
+    Builds a policy by name. 'optimal' also needs the reference string.
+    """
+    if name == OptimalPolicy.name:
+        if page_reference_string is None:
+            raise ValueError("the optimal policy needs the whole reference string")
+        return OptimalPolicy(num_frames, page_reference_string)
+    if name not in POLICIES:
+        raise ValueError(f"Unknown replacement policy: {name}")
+    return POLICIES[name](num_frames)
+
+
+def read_snapshot(path):
+    """
+    Parses a file written by ReplacementPolicy.snapshot().
+
+    Returns:
+        dict: 'name' (the policy class), 'num_frames', 'page_faults', 'hits',
+        'evictions', 'params' and 'sequences'.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:4] != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not a replacement policy snapshot")
+    version, name_length = struct.unpack_from('<HB', data, 4)
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+    offset = 7
+    name = data[offset:offset + name_length].decode()
+    offset += name_length
+    num_frames, page_faults, hits, evictions = struct.unpack_from('<4q', data, offset)
+    offset += 32
+    (param_count,) = struct.unpack_from('<H', data, offset)
+    params = list(struct.unpack_from(f'<{param_count}q', data, offset + 2))
+    offset += 2 + 8 * param_count
+    (sequence_count,) = struct.unpack_from('<H', data, offset)
+    offset += 2
+    sequences = []
+    for _ in range(sequence_count):
+        (length,) = struct.unpack_from('<Q', data, offset)
+        offset += 8
+        values = array.array('q', data[offset:offset + 8 * length])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        sequences.append(values.tolist())
+        offset += 8 * length
+    return {
+        "name": name,
+        "num_frames": num_frames,
+        "page_faults": page_faults,
+        "hits": hits,
+        "evictions": evictions,
+        "params": params,
+        "sequences": sequences,
+    }
+
+
+def restore_policy(path, page_reference_string=None):
+    """
+    Rebuilds a policy from a file written by ReplacementPolicy.snapshot().
+
+    Args:
+        path (str): The snapshot file.
+        page_reference_string (list): Needed to restore an OptimalPolicy (or
+            SetOrderOptimalPolicy), which never stores its reference string.
+
+    Returns:
+        ReplacementPolicy: The policy, ready to be fed the rest of its stream.
+    """
+    snapshot = read_snapshot(path)
+    name = snapshot["name"]
+    num_frames = snapshot["num_frames"]
+    classes = {cls.__name__: cls for cls in (*POLICIES.values(), CompactLRUPolicy, OptimalPolicy,
+                                               SetOrderOptimalPolicy)}
+    if name == 'PrefetchingPolicy':
+        raise ValueError("restore a PrefetchingPolicy snapshot with prefetch.restore_prefetching_policy")
+    if name not in classes:
+        raise ValueError(f"Unknown policy in snapshot: {name}")
+    if issubclass(classes[name], OptimalPolicy):
+        if page_reference_string is None:
+            raise ValueError("restoring the optimal policy needs its reference string")
+        policy = classes[name](num_frames, page_reference_string)
+    else:
+        policy = classes[name](num_frames)
+    policy._load_state(snapshot["params"], snapshot["sequences"])
+    policy.page_faults, policy.hits, policy.evictions = snapshot["page_faults"], snapshot["hits"], snapshot["evictions"]
+    return policy
+
+def run_clock(page_reference_string, num_frames, record_steps=False, trace=None):
+    """
+    Runs CLOCK (second chance) without printing anything; see run_policy.
+    """
+    return run_policy(ClockPolicy(num_frames), page_reference_string, record_steps, trace)
+
+
+def run_clockpro(page_reference_string, num_frames, record_steps=False, trace=None):
+    """
+    Runs CLOCK-Pro style replacement without printing anything; see run_policy.
+    """
+    return run_policy(ClockProPolicy(num_frames), page_reference_string, record_steps, trace)
+
+
+def run_lfu(page_reference_string, num_frames, record_steps=False, trace=None):
+    """
+    Runs LFU without printing anything; see run_policy.
+    """
+    return run_policy(LFUPolicy(num_frames), page_reference_string, record_steps, trace)
+
+
+def run_arc(page_reference_string, num_frames, record_steps=False, trace=None):
+    """
+    Runs ARC without printing anything; see run_policy.
+    """
+    return run_policy(ARCPolicy(num_frames), page_reference_string, record_steps, trace)
+
+
+def run_2q(page_reference_string, num_frames, record_steps=False, trace=None):
+    """
+    Runs 2Q without printing anything; see run_policy.
+    """
+    return run_policy(TwoQPolicy(num_frames), page_reference_string, record_steps, trace)
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    # A loop slightly larger than memory, interleaved with a one-off scan: the
+    # case where LRU evicts every page just before it is needed again.
+    loop = list(range(12)) * 20
+    scan = list(range(1000, 1200))
+    page_refs = loop[:120] + scan + loop[120:]
+
+    num_frames = 10
+    print(f"Frames: {num_frames}, References: {len(page_refs)}")
+    print("Policy    | Faults")
+    print("----------+--------")
+    for name, policy in POLICIES.items():
+        print(f"{name:<9} | {run_policy(policy(num_frames), page_refs).faults}")
@@ -0,0 +1,455 @@
+"""
+Contiguous physical memory allocation for segments.
+
+Segments need one contiguous block each, so freeing them leaves holes and
+memory fragments externally. SegmentAllocator places blocks with one of
+four classic strategies:
+
+- 'first': the lowest-addressed hole that is large enough.
+- 'best': the smallest hole that is large enough.
+- 'worst': the largest hole.
+- 'next': like first fit, but the search starts where the last one ended.
+
+Holes are indexed twice, in balanced search trees (treaps): by (size,
+address), so best fit is the first entry not smaller than the request and
+worst fit the last entry; and by address, to find a freed block's
+neighbours. The address tree also keeps the largest hole of every subtree,
+so first and next fit descend straight to the lowest-addressed hole that is
+large enough. Every placement, allocation and free is O(log holes).
+compact() slides every block down to the bottom of memory and leaves a
+single hole; owners with a base attribute (such as OS_Seg.Segment) are
+relocated with their blocks.
+"""
+
+import random
+import time
+
+STRATEGIES = ('first', 'best', 'worst', 'next')
+
+
+class _Node:
+    __slots__ = ('key', 'value', 'priority', 'left', 'right', 'largest')
+
+    def __init__(self, key, value, priority):
+        self.key = key
+        self.value = value
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.largest = value # Largest value in this subtree
+
+
+def _update(node):
+    largest = node.value
+    if node.left is not None and node.left.largest > largest:
+        largest = node.left.largest
+    if node.right is not None and node.right.largest > largest:
+        largest = node.right.largest
+    node.largest = largest
+
+
+def _split(node, key):
+    """
+    Splits a treap into the keys below key and the keys from key on.
+    """
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        _update(node)
+        return node, right
+    left, node.left = _split(node.left, key)
+    _update(node)
+    return left, node
+
+
+def _merge(left, right):
+    """
+    Joins two treaps whose keys are all lower in left than in right.
+    """
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+def _delete(node, key):
+    if key < node.key:
+        node.left = _delete(node.left, key)
+    elif node.key < key:
+        node.right = _delete(node.right, key)
+    else:
+        return _merge(node.left, node.right)
+    _update(node)
+    return node
+
+
+def _first_fit(node, need, low):
+    """
+    Returns the lowest-keyed node with key >= low (None: no bound) and
+    value >= need, skipping every subtree whose largest value is too small.
+    """
+    if node is None or node.largest < need:
+        return None
+    if low is None or not node.key < low:
+        found = _first_fit(node.left, need, low)
+        if found is not None:
+            return found
+        if node.value >= need:
+            return node
+    return _first_fit(node.right, need, low)
+
+
+class Treap:
+    """
+    An ordered map in a randomized balanced binary search tree, with
+    O(log n) expected insertion, deletion and ordered queries.
+
+    Values are ints, and every subtree keeps its largest value, so
+    first_fit() finds the first key whose value is large enough.
+
+    Args:
+        seed (int): Seed of the node priorities, so runs are reproducible.
+    """
+
+    def __init__(self, seed=0):
+        self.root = None
+        self.size = 0
+        self.random = random.Random(seed).random
+
+    def insert(self, key, value):
+        """
+        Adds a key that is not in the tree yet.
+        """
+        left, right = _split(self.root, key)
+        self.root = _merge(_merge(left, _Node(key, value, self.random())), right)
+        self.size += 1
+
+    def delete(self, key):
+        """
+        Removes a key that is in the tree.
+        """
+        self.root = _delete(self.root, key)
+        self.size -= 1
+
+    def ceiling(self, key):
+        """
+        Returns the smallest key >= key, or None.
+        """
+        node, found = self.root, None
+        while node is not None:
+            if node.key < key:
+                node = node.right
+            else:
+                found = node.key
+                node = node.left
+        return found
+
+    def floor(self, key):
+        """
+        Returns the largest key <= key, or None.
+        """
+        node, found = self.root, None
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            else:
+                found = node.key
+                node = node.right
+        return found
+
+    def last(self):
+        """
+        Returns the largest key, or None when the tree is empty.
+        """
+        node = self.root
+        if node is None:
+            return None
+        while node.right is not None:
+            node = node.right
+        return node.key
+
+    def first_fit(self, need, low=None):
+        """
+        Returns the smallest key >= low whose value is at least need, or None.
+        """
+        node = _first_fit(self.root, need, low)
+        return None if node is None else node.key
+
+    def __len__(self):
+        return self.size
+
+#-------------------------------------------------
+
+class SegmentAllocator:
+    """
+    Variable-size contiguous allocator with an indexed set of free holes.
+
+    Args:
+        memory_size (int): Bytes of physical memory.
+        strategy (str): 'first', 'best', 'worst' or 'next'.
+        compact_on_failure (bool): When no hole fits but enough memory is
+            free in total, compact and try again.
+    """
+
+    def __init__(self, memory_size, strategy='first', compact_on_failure=False):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown placement strategy: {strategy}")
+        if memory_size < 1:
+            raise ValueError("memory_size must be at least 1")
+        self.memory_size = memory_size
+        self.strategy = strategy
+        self.compact_on_failure = compact_on_failure
+        self.allocations = 0
+        self.frees = 0
+        self.failures = 0
+        self.fragmentation_failures = 0 # Failures although enough memory was free in total
+        self.compactions = 0
+        self.bytes_moved = 0 # Bytes copied by compaction
+        self.reset()
+
+    def reset(self):
+        """
+        Frees all of memory again.
+        """
+        self.hole_starts = Treap() # Hole address -> size, with the largest hole of every subtree
+        self.hole_sizes = {} # Hole address -> size
+        self.holes_by_size = Treap() # (size, address) -> size
+        self.blocks = {} # Block address -> (size, owner)
+        self.allocated_bytes = 0
+        self.rover = 0 # Where next fit resumes its search
+        self._add_hole(0, self.memory_size)
+
+    def _add_hole(self, start, size):
+        self.hole_starts.insert(start, size)
+        self.hole_sizes[start] = size
+        self.holes_by_size.insert((size, start), size)
+
+    def _remove_hole(self, start):
+        size = self.hole_sizes.pop(start)
+        self.hole_starts.delete(start)
+        self.holes_by_size.delete((size, start))
+        return size
+
+    def _find(self, size):
+        """
+        Returns the address of the hole the strategy picks, or None.
+        """
+        if self.strategy == 'best':
+            hole = self.holes_by_size.ceiling((size, -1))
+            return None if hole is None else hole[1]
+        if self.strategy == 'worst':
+            hole = self.holes_by_size.last()
+            return hole[1] if hole is not None and hole[0] >= size else None
+
+        low = None
+        if self.strategy == 'next':
+            # Start at the hole holding the rover, or the first one after it, and wrap around.
+            low = self.hole_starts.floor(self.rover)
+            start = self.hole_starts.first_fit(size, low)
+            if start is not None:
+                return start
+        return self.hole_starts.first_fit(size)
+
+    def allocate(self, size, owner=None):
+        """
+        Allocates a contiguous block.
+
+        Args:
+            size (int): Bytes needed.
+            owner: Optional object the block belongs to, e.g. a Segment.
+
+        Returns:
+            int: The block's address, or None if no hole is large enough.
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        start = self._find(size)
+        if start is None and self.compact_on_failure and self.free_bytes() >= size:
+            self.compact()
+            start = self._find(size)
+        if start is None:
+            self.failures += 1
+            if self.free_bytes() >= size:
+                self.fragmentation_failures += 1
+            return None
+
+        hole = self._remove_hole(start)
+        if hole > size:
+            self._add_hole(start + size, hole - size)
+        self.blocks[start] = (size, owner)
+        self.allocated_bytes += size
+        self.allocations += 1
+        self.rover = start + size
+        return start
+
+    def free(self, base):
+        """
+        Frees a block and merges the hole with the holes next to it.
+        """
+        if base not in self.blocks:
+            raise ValueError(f"address {base} is not the start of an allocated block")
+        size, _ = self.blocks.pop(base)
+        self.allocated_bytes -= size
+        self.frees += 1
+
+        start, end = base, base + size
+        if end in self.hole_sizes:
+            end += self._remove_hole(end)
+        previous = self.hole_starts.floor(base)
+        if previous is not None and previous + self.hole_sizes[previous] == start:
+            start = previous
+            self._remove_hole(previous)
+        self._add_hole(start, end - start)
+
+    def compact(self):
+        """
+        Moves every block down to the bottom of memory, leaving one hole.
+
+        Returns:
+            dict: Old address -> new address of every block that moved.
+        """
+        relocations = {}
+        blocks = {}
+        cursor = 0
+        for base in sorted(self.blocks):
+            size, owner = self.blocks[base]
+            if base != cursor:
+                relocations[base] = cursor
+                self.bytes_moved += size
+                if owner is not None and hasattr(owner, 'base'):
+                    owner.base = cursor
+            blocks[cursor] = (size, owner)
+            cursor += size
+
+        self.blocks = blocks
+        self.hole_starts = Treap()
+        self.hole_sizes = {}
+        self.holes_by_size = Treap()
+        if cursor < self.memory_size:
+            self._add_hole(cursor, self.memory_size - cursor)
+        self.rover = cursor
+        self.compactions += 1
+        return relocations
+
+    def free_bytes(self):
+        return self.memory_size - self.allocated_bytes
+
+    def largest_hole(self):
+        hole = self.holes_by_size.last()
+        return 0 if hole is None else hole[0]
+
+    def stats(self):
+        """
+        Returns allocation counters and fragmentation as a dict.
+
+        external_fragmentation is 1 - largest hole / free bytes, 0 when all
+        free memory is one hole.
+        """
+        free = self.free_bytes()
+        return {
+            "strategy": self.strategy,
+            "allocations": self.allocations,
+            "frees": self.frees,
+            "failures": self.failures,
+            "fragmentation_failures": self.fragmentation_failures,
+            "compactions": self.compactions,
+            "bytes_moved": self.bytes_moved,
+            "allocated_bytes": self.allocated_bytes,
+            "free_bytes": free,
+            "holes": len(self.hole_starts),
+            "largest_hole": self.largest_hole(),
+            "external_fragmentation": 1.0 - self.largest_hole() / free if free else 0.0,
+            "utilization": self.allocated_bytes / self.memory_size,
+        }
+
+#-------------------------------------------------
+
+def random_allocation_trace(operations, min_size=16, max_size=4096, max_live=100, free_probability=0.5, seed=0):
+    """
+    Generates a reproducible allocation trace. Blocks are freed at random,
+    and always once max_live blocks are live, so memory load stays steady.
+
+    Yields:
+        tuple: ('alloc', block id, size) or ('free', block id) of a live block.
+    """
+    rng = random.Random(seed)
+    live = []
+    for block_id in range(operations):
+        if live and (len(live) >= max_live or rng.random() < free_probability):
+            # Free a random live block; swap-remove keeps this O(1).
+            i = rng.randrange(len(live))
+            live[i], live[-1] = live[-1], live[i]
+            yield ('free', live.pop())
+        else:
+            live.append(block_id)
+            yield ('alloc', block_id, rng.randint(min_size, max_size))
+
+
+class _TraceBlock:
+    """
+    Owner of one traced block, so compaction can move its address.
+    """
+
+    __slots__ = ('base',)
+
+    def __init__(self):
+        self.base = None
+
+
+def run_allocation_trace(allocator, trace):
+    """
+    Replays an allocation trace. Frees of blocks whose allocation failed
+    are skipped.
+
+    Returns:
+        dict: allocator.stats() plus the mean external fragmentation over
+        the run, elapsed seconds and operations per second.
+    """
+    blocks = {} # block id -> _TraceBlock
+    operations = 0
+    fragmentation_total = 0.0
+    start = time.perf_counter()
+    for operation in trace:
+        operations += 1
+        if operation[0] == 'alloc':
+            _, block_id, size = operation
+            block = _TraceBlock()
+            block.base = allocator.allocate(size, owner=block)
+            blocks[block_id] = block
+        else:
+            block = blocks.pop(operation[1], None)
+            if block is not None and block.base is not None:
+                allocator.free(block.base)
+        if operations % 100 == 0:
+            free = allocator.free_bytes()
+            fragmentation_total += 1.0 - allocator.largest_hole() / free if free else 0.0
+    elapsed = time.perf_counter() - start
+    report = allocator.stats()
+    report["mean_external_fragmentation"] = fragmentation_total / (operations // 100) if operations >= 100 else 0.0
+    report["seconds"] = elapsed
+    report["operations_per_second"] = operations / elapsed if elapsed else 0.0
+    return report
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    memory_size = 4 * 1024 * 1024
+    print("Strategy | Failures | Frag. Failures | Mean Ext. Frag. | Holes | Ops/s")
+    print("---------+----------+----------------+-----------------+-------+---------")
+    for strategy in STRATEGIES:
+        report = run_allocation_trace(SegmentAllocator(memory_size, strategy),
+                                      random_allocation_trace(200000, max_size=64 * 1024))
+        print(f"{strategy:<8} | {report['failures']:<8} | {report['fragmentation_failures']:<14} | "
+              f"{report['mean_external_fragmentation']:<15.3f} | {report['holes']:<5} | {report['operations_per_second']:.0f}")
+
+    report = run_allocation_trace(SegmentAllocator(memory_size, 'first', compact_on_failure=True),
+                                  random_allocation_trace(200000, max_size=64 * 1024))
+    print(f"\nFirst fit with compaction: {report['failures']} failures, {report['compactions']} compactions, "
+          f"{report['bytes_moved'] / 2**20:.0f} MiB moved")
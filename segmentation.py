@@ -0,0 +1,216 @@
+"""
+Segmentation MMU for the processes built with OS_Seg.
+
+A logical address is a (segment, offset) pair. SegmentMMU translates it to a
+physical address the way segmentation hardware does:
+
+1. Find the segment's descriptor (base, limit, permissions). Recently used
+   descriptors are kept in a small LRU descriptor cache; a miss reads the
+   descriptor from the segment table in memory.
+2. Check the offset against the limit.
+3. Check the access ('r', 'w' or 'x') against the segment's perm string,
+   e.g. "r-xp" allows reads and execution but not writes.
+4. Return base + offset.
+
+A failed check is a protection fault. Like PageTable.lookup, translate()
+then returns None; the fault is counted by kind ('segment', 'limit' or
+'permission') and kept in last_fault. run_trace() drives the MMU with a
+trace of accesses and reports translations per second and fault counts.
+"""
+
+import collections
+import time
+
+ACCESS_BITS = {'r': 1, 'w': 2, 'x': 4}
+FAULT_KINDS = ('segment', 'limit', 'permission')
+
+
+def permission_bits(perm):
+    """
+    Converts a perm string such as "rw-p" to a bitmask of ACCESS_BITS.
+    """
+    return sum(bit for access, bit in ACCESS_BITS.items() if access in perm)
+
+
+class SegmentMMU:
+    """
+    Translates (segment, offset) addresses for one process.
+
+    Segments are numbered in the order they were added to the process, and
+    can also be named, e.g. translate("Stack", 16, 'w').
+
+    Args:
+        process (OS_Seg.Process): The process whose segment table is used.
+        cache_entries (int): Descriptors held in the descriptor cache.
+    """
+
+    def __init__(self, process, cache_entries=4):
+        if cache_entries < 1:
+            raise ValueError("cache_entries must be at least 1")
+        self.process = process
+        self.cache_entries = cache_entries
+        self.cache = collections.OrderedDict() # segment number -> (base, limit, permission bits), LRU first
+        self.translations = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.memory_accesses = 0 # Segment table reads on descriptor cache misses
+        self.faults = dict.fromkeys(FAULT_KINDS, 0)
+        self.last_fault = None # (kind, segment, offset, access) of the latest fault
+        self.reload()
+
+    def reload(self):
+        """
+        Rebuilds the segment number lookup and flushes the descriptor cache,
+        e.g. after the process's segments changed.
+        """
+        self.numbers = {segment.name: number for number, segment in enumerate(self.process.segments)}
+        self.cache.clear()
+
+    def invalidate(self, segment):
+        """
+        Drops one segment's cached descriptor, e.g. after it was moved.
+        """
+        self.cache.pop(self.numbers.get(segment, segment), None)
+
+    def _descriptor(self, number):
+        cache = self.cache
+        descriptor = cache.get(number)
+        if descriptor is not None:
+            cache.move_to_end(number)
+            self.cache_hits += 1
+            return descriptor
+
+        self.cache_misses += 1
+        self.memory_accesses += 1
+        segments = self.process.segments
+        if not 0 <= number < len(segments):
+            return None
+        segment = segments[number]
+        descriptor = (segment.base, segment.limit, permission_bits(segment.perm))
+        if len(cache) >= self.cache_entries:
+            cache.popitem(last=False)
+        cache[number] = descriptor
+        return descriptor
+
+    def _fault(self, kind, segment, offset, access):
+        self.faults[kind] += 1
+        self.last_fault = (kind, segment, offset, access)
+        return None
+
+    def translate(self, segment, offset, access='r'):
+        """
+        Translates a logical address.
+
+        Args:
+            segment: Segment number, or segment name.
+            offset (int): Offset within the segment.
+            access (str): 'r', 'w' or 'x'.
+
+        Returns:
+            int: The physical address, or None on a protection fault.
+        """
+        self.translations += 1
+        number = self.numbers.get(segment, segment) if isinstance(segment, str) else segment
+        descriptor = self._descriptor(number) if isinstance(number, int) else None
+        if descriptor is None:
+            return self._fault('segment', segment, offset, access)
+        base, limit, bits = descriptor
+        if not 0 <= offset < limit:
+            return self._fault('limit', segment, offset, access)
+        if not bits & ACCESS_BITS[access]:
+            return self._fault('permission', segment, offset, access)
+        return base + offset
+
+    def cache_hit_ratio(self):
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """
+        Returns translation, cache and fault counters as a dict.
+        """
+        return {
+            "translations": self.translations,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_ratio": self.cache_hit_ratio(),
+            "memory_accesses": self.memory_accesses,
+            "protection_faults": sum(self.faults.values()),
+            **{f"{kind}_faults": count for kind, count in self.faults.items()},
+        }
+
+
+def read_access_trace(path):
+    """
+    Reads a segment access trace: one "segment offset access" line per
+    access, e.g. "Code 12 x" or "2 100 w". Blank lines and lines starting
+    with '#' are skipped.
+
+    Yields:
+        tuple: (segment number or name, offset, access).
+    """
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if not fields or fields[0].startswith('#'):
+                continue
+            segment, offset, access = fields
+            yield (int(segment) if segment.isdigit() else segment, int(offset), access)
+
+
+def run_trace(mmu, accesses):
+    """
+    Translates every access of a trace.
+
+    Args:
+        mmu (SegmentMMU): The MMU to drive.
+        accesses (iterable): (segment, offset, access) tuples.
+
+    Returns:
+        dict: mmu.stats() for this run plus elapsed seconds and translations per second.
+    """
+    translate = mmu.translate
+    before = mmu.translations
+    start = time.perf_counter()
+    for segment, offset, access in accesses:
+        translate(segment, offset, access)
+    elapsed = time.perf_counter() - start
+    report = mmu.stats()
+    report["seconds"] = elapsed
+    report["translations_per_second"] = (mmu.translations - before) / elapsed if elapsed else 0.0
+    return report
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    import random
+
+    from OS_Seg import Process
+
+    process = Process("demo")
+    process.add_segment("Code", 400, "r-xp")
+    process.add_segment("Data", 300, "rw-p")
+    process.add_segment("Stack", 200, "rw-p")
+    process.add_segment("Heap", 1000, "rw-p")
+    process.add_segment("ROData", 100, "r--p")
+    mmu = SegmentMMU(process, cache_entries=4)
+
+    print("Code 10 x ->", mmu.translate("Code", 10, 'x'))
+    print("Stack 16 w ->", mmu.translate("Stack", 16, 'w'))
+    print("Code 10 w ->", mmu.translate("Code", 10, 'w'), mmu.last_fault)
+    print("Data 300 r ->", mmu.translate("Data", 300, 'r'), mmu.last_fault)
+
+    # Mostly valid accesses, with the occasional stray offset or write to read-only data.
+    rng = random.Random(0)
+    accesses = []
+    for _ in range(200000):
+        number = rng.choices(range(5), weights=[50, 20, 20, 9, 1])[0]
+        segment = process.segments[number]
+        offset = rng.randrange(segment.limit + 5)
+        access = 'x' if number == 0 else rng.choice('rw')
+        accesses.append((number, offset, access))
+
+    report = run_trace(SegmentMMU(process, cache_entries=4), accesses)
+    print(f"\nTranslations: {report['translations']} ({report['translations_per_second']:.0f}/s)")
+    print(f"Descriptor cache hit ratio: {report['cache_hit_ratio']:.2%}")
+    print(f"Protection faults: {report['protection_faults']} "
+          f"(limit {report['limit_faults']}, permission {report['permission_faults']}, segment {report['segment_faults']})")
@@ -0,0 +1,229 @@
+"""
+Approximate LRU miss-ratio curves from a spatially sampled trace (SHARDS).
+
+Exact stack distances (stack_distance.py) cost O(log n) per reference and
+memory per distinct page, which is still too much for traces of billions of
+references. SHARDS samples by page instead of by reference: a page is kept
+when hash(page) mod P < T, so every reference to a sampled page is kept and
+its reuse pattern stays intact. With sampling rate R = T / P, a stack
+distance d measured among the sampled pages stands for a distance of about
+d / R in the full trace, and the sampled miss ratio estimates the real one.
+
+Two modes:
+- Fixed rate: R is set up front. Work and memory shrink by a factor of R.
+- Fixed size: at most max_pages sampled pages are tracked. When a new page
+  would exceed that, T drops to the largest hash still tracked, the pages
+  with that hash are forgotten, and the histogram is rescaled to the new
+  rate. Memory is bounded whatever the trace.
+
+Lower rates are faster and smaller but noisier. The SHARDS adjustment
+corrects the first histogram bucket for the difference between the number
+of sampled references expected at rate R and the number actually seen,
+which removes most of the bias from a few very hot pages. compare_with_exact()
+checks an estimate against the exact LRU simulator.
+"""
+
+import heapq
+import math
+
+from replacement_policies import fibonacci_hash
+from stack_distance import StackDistanceTracker
+
+DEFAULT_MODULUS = 1 << 24 # P: hash values are taken mod P
+
+
+def page_hash(page, modulus=DEFAULT_MODULUS):
+    """
+    Maps a page number to [0, modulus) with replacement_policies.fibonacci_hash,
+    so sampling does not follow address patterns.
+    """
+    return fibonacci_hash(page, modulus)
+
+
+class ShardsSampler:
+    """
+    Builds a sampled, rescaled LRU stack-distance histogram.
+
+    Args:
+        rate (float): Initial sampling rate R, between 0 and 1.
+        max_pages (int): Fixed-size mode: most sampled pages tracked at once.
+            None keeps the rate fixed.
+        bucket_size (int): Histogram bucket width in frames. Wider buckets
+            use less memory for very large caches.
+        modulus (int): P, the hash modulus; the threshold T is rate * P.
+    """
+
+    def __init__(self, rate=0.01, max_pages=None, bucket_size=1, modulus=DEFAULT_MODULUS):
+        if not 0 < rate <= 1:
+            raise ValueError("rate must be in (0, 1]")
+        self.modulus = modulus
+        self.threshold = max(1, int(rate * modulus)) # T: pages with hash mod P below T are sampled
+        self.max_pages = max_pages
+        self.bucket_size = bucket_size
+        self.tracker = StackDistanceTracker()
+        self.tracked = [] # Max-heap of (-hash, page) over tracked pages, for fixed-size mode
+        # Counts are stored in units of `scale`: a sampled reference adds
+        # 1 / scale, and a rate drop only shrinks scale instead of touching
+        # every bucket.
+        self.scale = 1.0
+        self.histogram = [0.0] # histogram[b]: sampled references with scaled distance in bucket b (0 unused)
+        self.cold = 0.0 # Sampled first references
+        self.sampled = 0.0 # Sampled references
+        self.references = 0 # All references seen
+
+    @property
+    def rate(self):
+        return self.threshold / self.modulus
+
+    def access(self, page):
+        """
+        Processes one reference of the full trace.
+        """
+        self.references += 1
+        h = page_hash(page, self.modulus)
+        if h >= self.threshold:
+            return
+        weight = 1.0 / self.scale
+        self.sampled += weight
+        distance = self.tracker.access(page)
+        if distance == 0:
+            self.cold += weight
+            if self.max_pages is not None:
+                heapq.heappush(self.tracked, (-h, page))
+                if len(self.tracked) > self.max_pages:
+                    self._lower_threshold()
+            return
+
+        bucket = math.ceil(distance / self.rate / self.bucket_size)
+        histogram = self.histogram
+        if bucket >= len(histogram):
+            histogram.extend([0.0] * (bucket - len(histogram) + 1))
+        histogram[bucket] += weight
+
+    def feed(self, pages):
+        """
+        Processes a batch of references.
+        """
+        access = self.access
+        for page in pages:
+            access(page)
+
+    def _lower_threshold(self):
+        """
+        Drops the largest tracked hash out of the sample and rescales the
+        counts to the new, lower rate.
+        """
+        old_rate = self.rate
+        largest = -self.tracked[0][0]
+        while self.tracked and -self.tracked[0][0] == largest:
+            _, page = heapq.heappop(self.tracked)
+            self.tracker.remove(page)
+        self.threshold = largest
+        self.scale *= self.rate / old_rate
+
+    def miss_ratio_curve(self, max_frames, adjust=True):
+        """
+        Estimates the LRU miss ratio for every frame count 1..max_frames.
+
+        Args:
+            max_frames (int): Largest frame count.
+            adjust (bool): Apply the SHARDS first-bucket adjustment.
+
+        Returns:
+            list: ratios[k - 1] is the estimated miss ratio with k frames.
+        """
+        scale = self.scale
+        histogram = [count * scale for count in self.histogram]
+        total = self.sampled * scale
+        if adjust and self.references:
+            expected = self.references * self.rate
+            if len(histogram) < 2:
+                histogram.append(0.0)
+            histogram[1] += expected - total
+            total = expected
+        if total <= 0:
+            return [0.0] * max_frames
+
+        misses = self.cold * scale + sum(histogram)
+        ratios = []
+        bucket = 1
+        for k in range(1, max_frames + 1):
+            # A bucket's references hit once the cache covers the bucket's upper distance.
+            while bucket < len(histogram) and bucket * self.bucket_size <= k:
+                misses -= histogram[bucket]
+                bucket += 1
+            ratios.append(min(1.0, max(0.0, misses / total)))
+        return ratios
+
+    def fault_curve(self, max_frames, adjust=True):
+        """
+        Estimates LRU fault counts for every frame count 1..max_frames.
+        """
+        return [ratio * self.references for ratio in self.miss_ratio_curve(max_frames, adjust)]
+
+    def stats(self):
+        return {
+            "references": self.references,
+            "rate": self.rate,
+            "sampled_references": self.sampled * self.scale,
+            "tracked_pages": len(self.tracker.last_access),
+            "histogram_buckets": len(self.histogram),
+        }
+
+
+def shards_miss_ratio_curve(page_reference_string, max_frames, rate=0.01, max_pages=None, adjust=True):
+    """
+    Estimates the LRU miss-ratio curve of a reference string in one sampled pass.
+    """
+    sampler = ShardsSampler(rate, max_pages)
+    sampler.feed(page_reference_string)
+    return sampler.miss_ratio_curve(max_frames, adjust)
+
+
+def compare_with_exact(page_reference_string, frame_counts, rate=0.01, max_pages=None):
+    """
+    Compares a SHARDS estimate with the exact LRU simulator
+    (OS_Segmentation.run_lru) at the given frame counts.
+
+    Returns:
+        dict: frame count -> (exact miss ratio, estimated miss ratio), plus
+        'mean_absolute_error' and 'max_absolute_error'.
+    """
+    from OS_Segmentation import run_lru
+
+    refs = page_reference_string
+    estimate = shards_miss_ratio_curve(refs, max(frame_counts), rate, max_pages)
+    comparison = {}
+    errors = []
+    for frames in frame_counts:
+        exact = run_lru(refs, frames).faults / len(refs) if len(refs) else 0.0
+        comparison[frames] = (exact, estimate[frames - 1])
+        errors.append(abs(exact - estimate[frames - 1]))
+    comparison["mean_absolute_error"] = sum(errors) / len(errors) if errors else 0.0
+    comparison["max_absolute_error"] = max(errors, default=0.0)
+    return comparison
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    import time
+
+    from benchmark import make_workload
+    from OS_Segmentation import run_lru
+
+    refs = make_workload('zipf', 500000, 200000, seed=1)
+    frame_counts = [1000, 5000, 20000, 50000, 100000]
+
+    start = time.perf_counter()
+    exact = {frames: run_lru(refs, frames).faults / len(refs) for frames in frame_counts}
+    exact_seconds = time.perf_counter() - start
+
+    print(f"Exact LRU at {len(frame_counts)} frame counts: {exact_seconds:.1f} s")
+    print("Sampling             | Seconds | Mean Abs. Error | Max Abs. Error")
+    print("---------------------+---------+-----------------+---------------")
+    for label, rate, max_pages in [("rate 0.1", 0.1, None), ("rate 0.01", 0.01, None),
+                                   ("rate 0.001", 0.001, None), ("fixed size 2000", 0.1, 2000)]:
+        start = time.perf_counter()
+        estimate = shards_miss_ratio_curve(refs, max(frame_counts), rate, max_pages)
+        seconds = time.perf_counter() - start
+        errors = [abs(exact[frames] - estimate[frames - 1]) for frames in frame_counts]
+        print(f"{label:<20} | {seconds:<7.2f} | {sum(errors) / len(errors):<15.4f} | {max(errors):.4f}")
@@ -0,0 +1,213 @@
+"""
+Single-pass LRU stack-distance (Mattson) engine.
+
+LRU is a stack algorithm: a reference hits in a memory of k frames exactly
+when its stack distance (the number of distinct pages touched since the
+previous reference to the same page, counting itself) is at most k. So one
+pass that records the stack distance of every reference gives the fault
+count for every frame count at once, instead of re-running simulate_lru
+once per memory size.
+
+Distances are computed with a Fenwick (binary indexed) tree over time: each
+page keeps a single mark at the time of its latest reference, and the
+distance is the number of marks after the previous reference to the page.
+That makes every reference O(log n). The tree is periodically renumbered so
+its size follows the number of distinct pages, not the trace length, which
+lets the engine consume streamed traces.
+"""
+
+import array
+
+
+class FenwickTree:
+    """
+    Binary indexed tree over positions 1..size supporting point updates and
+    prefix sums in O(log size).
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.tree = array.array('i', bytes(4 * (size + 1)))
+
+    def add(self, i, delta):
+        """
+        Adds delta at position i (1-based).
+        """
+        tree = self.tree
+        size = self.size
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, i):
+        """
+        Returns the sum of positions 1..i.
+        """
+        tree = self.tree
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+#-------------------------------------------------
+
+class StackDistanceTracker:
+    """
+    Incrementally computes LRU stack distances, one reference at a time.
+
+    Memory is O(distinct pages): when the time axis of the Fenwick tree fills
+    up, the latest-reference marks are renumbered 1..m and the tree rebuilt.
+    """
+
+    def __init__(self, initial_capacity=1024):
+        self.initial_capacity = initial_capacity
+        self.last_access = {} # page -> time of its latest reference
+        self.clock = 0 # Time of the latest reference
+        self.fenwick = FenwickTree(initial_capacity)
+
+    def _compact(self):
+        """
+        Renumbers the live marks 1..m in time order and rebuilds the tree.
+        """
+        live = sorted(self.last_access, key=self.last_access.__getitem__)
+        m = len(live)
+        size = max(self.initial_capacity, 2 * m)
+        for t, page in enumerate(live, 1):
+            self.last_access[page] = t
+
+        # Linear-time build: every position 1..m holds one mark.
+        fenwick = FenwickTree(size)
+        tree = fenwick.tree
+        for i in range(1, size + 1):
+            if i <= m:
+                tree[i] += 1
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self.fenwick = fenwick
+        self.clock = m
+
+    def access(self, page):
+        """
+        Records a reference and returns its stack distance.
+
+        Returns:
+            int: 1 if the page is the most recently used one, 2 if one other
+            distinct page was referenced in between, and so on; 0 for the
+            first reference to a page (infinite distance, a cold miss).
+        """
+        if self.clock == self.fenwick.size:
+            self._compact()
+
+        fenwick = self.fenwick
+        previous = self.last_access.get(page)
+        if previous is None:
+            distance = 0
+        else:
+            # Marks after the previous reference belong to distinct pages touched since.
+            distance = len(self.last_access) - fenwick.prefix_sum(previous) + 1
+            fenwick.add(previous, -1)
+
+        self.clock += 1
+        fenwick.add(self.clock, 1)
+        self.last_access[page] = self.clock
+        return distance
+
+    def remove(self, page):
+        """
+        Forgets a page, as if it had never been referenced. Its next
+        reference will be a cold miss.
+        """
+        previous = self.last_access.pop(page, None)
+        if previous is not None:
+            self.fenwick.add(previous, -1)
+
+#-------------------------------------------------
+
+def stack_distance_histogram(page_reference_string):
+    """
+    Computes the LRU stack-distance histogram of a reference string in one pass.
+
+    Args:
+        page_reference_string (iterable): Sequence of page numbers requested.
+
+    Returns:
+        tuple: (histogram, cold_misses, total) where histogram[d] is the number
+        of references with stack distance d (index 0 is unused), cold_misses
+        the number of first references and total the number of references.
+    """
+    tracker = StackDistanceTracker()
+    access = tracker.access
+    histogram = [0]
+    total = 0
+    for page in page_reference_string:
+        distance = access(page)
+        total += 1
+        if distance >= len(histogram):
+            histogram.extend([0] * (distance - len(histogram) + 1))
+        histogram[distance] += 1
+
+    cold_misses = histogram[0]
+    histogram[0] = 0
+    return histogram, cold_misses, total
+
+
+def fault_curve_from_histogram(histogram, cold_misses, max_frames):
+    """
+    Turns a stack-distance histogram into LRU fault counts for 1..max_frames frames.
+
+    Returns:
+        list: faults[k - 1] is the number of page faults with k frames.
+    """
+    faults = []
+    misses = cold_misses + sum(histogram)
+    for k in range(1, max_frames + 1):
+        if k < len(histogram):
+            misses -= histogram[k] # References at distance k start hitting at k frames
+        faults.append(misses)
+    return faults
+
+
+def lru_fault_curve(page_reference_string, max_frames=None):
+    """
+    Computes LRU page faults for every frame count 1..max_frames in a single pass.
+
+    Args:
+        page_reference_string (iterable): Sequence of page numbers requested.
+        max_frames (int): Largest frame count to report. Defaults to the number
+            of distinct pages, beyond which only cold misses remain.
+
+    Returns:
+        list: faults[k - 1] is the number of page faults with k frames, the same
+        count simulate_lru(page_reference_string, k) returns.
+    """
+    histogram, cold_misses, _ = stack_distance_histogram(page_reference_string)
+    if max_frames is None:
+        max_frames = max(cold_misses, 1)
+    return fault_curve_from_histogram(histogram, cold_misses, max_frames)
+
+
+def lru_miss_ratio_curve(page_reference_string, max_frames=None):
+    """
+    Computes the LRU miss ratio for every frame count 1..max_frames in a single pass.
+
+    Returns:
+        list: ratios[k - 1] is faults / references with k frames.
+    """
+    histogram, cold_misses, total = stack_distance_histogram(page_reference_string)
+    if max_frames is None:
+        max_frames = max(cold_misses, 1)
+    faults = fault_curve_from_histogram(histogram, cold_misses, max_frames)
+    return [f / total if total else 0.0 for f in faults]
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    page_refs = [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2, 1, 2, 0, 1, 7, 0, 1]
+
+    faults = lru_fault_curve(page_refs)
+    print(f"Reference String: {page_refs}")
+    print("Frames | LRU Faults | Miss Ratio")
+    print("-------+------------+-----------")
+    for k, f in enumerate(faults, 1):
+        print(f"{k:<6} | {f:<10} | {f / len(page_refs):.3f}")
@@ -0,0 +1,148 @@
+"""
+Parallel parameter sweep over replacement algorithms, frame counts and traces.
+
+Every (algorithm, frame count, trace) cell of the grid is an independent
+silent simulation, so the grid is spread over a ProcessPoolExecutor to use
+every core. Traces are loaded once in the parent into shared memory as
+uint64 arrays; workers attach to the block by name and read the references
+through a memoryview, so no trace is ever pickled to a worker.
+
+Usage:
+    python sweep.py --algorithms fifo lru optimal --frames 3 4 8 \\
+        --output results.csv trace1.bin trace2.txt
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import time
+from multiprocessing import shared_memory
+
+from replacement_policies import make_policy, policy_names, run_policy
+from trace_reader import load_trace
+
+ALGORITHMS = policy_names()
+
+RESULT_FIELDS = ["trace", "algorithm", "frames", "references", "faults", "hits", "evictions", "seconds"]
+
+def share_trace(path, fmt=None):
+    """
+    Loads a trace into a new shared memory block.
+
+    Returns:
+        tuple: (SharedMemory, number of references). The caller owns the block
+        and must close() and unlink() it.
+    """
+    trace = load_trace(path, fmt)
+    size = trace.itemsize * len(trace)
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    view = shm.buf[:size].cast(trace.typecode)
+    view[:] = trace # Copies straight into the block, without an intermediate bytes copy
+    view.release()
+    return shm, len(trace)
+
+
+def _run_cell(algorithm, num_frames, shm_name, length):
+    """
+    Worker entry point: runs one grid cell against a shared trace. The block
+    is attached for this cell only and closed again, so workers hold no
+    handles between tasks.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    refs = shm.buf[:8 * length].cast('Q') # The block may be rounded up to a page
+    try:
+        start = time.perf_counter()
+        result = run_policy(make_policy(algorithm, num_frames, refs), refs)
+        elapsed = time.perf_counter() - start
+    finally:
+        refs.release()
+        shm.close()
+    return result, elapsed
+
+
+def run_sweep(algorithms, frame_counts, trace_paths, max_workers=None):
+    """
+    Runs every (algorithm, frame count, trace) combination in parallel.
+
+    Args:
+        algorithms (list): Policy names from ALGORITHMS.
+        frame_counts (list): Frame counts to simulate.
+        trace_paths (list): Trace files, in any format trace_reader understands.
+        max_workers (int): Worker processes; defaults to the number of CPUs.
+
+    Returns:
+        list: One dict per cell with the keys in RESULT_FIELDS.
+    """
+    for algorithm in algorithms:
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+
+    shared = {}
+    try:
+        for path in trace_paths:
+            shared[path] = share_trace(path)
+
+        rows = []
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {}
+            for path, (shm, length) in shared.items():
+                for algorithm in algorithms:
+                    for num_frames in frame_counts:
+                        future = pool.submit(_run_cell, algorithm, num_frames, shm.name, length)
+                        futures[future] = (path, algorithm, num_frames, length)
+
+            for future in concurrent.futures.as_completed(futures):
+                path, algorithm, num_frames, length = futures[future]
+                result, elapsed = future.result()
+                rows.append({
+                    "trace": path,
+                    "algorithm": algorithm,
+                    "frames": num_frames,
+                    "references": length,
+                    "faults": result.faults,
+                    "hits": result.hits,
+                    "evictions": result.evictions,
+                    "seconds": elapsed,
+                })
+    finally:
+        for shm, _ in shared.values():
+            shm.close()
+            shm.unlink()
+
+    rows.sort(key=lambda row: (row["trace"], row["algorithm"], row["frames"]))
+    return rows
+
+
+def write_results(rows, path):
+    """
+    Writes sweep results as a CSV table.
+    """
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_results(rows):
+    """
+    Prints sweep results as a table.
+    """
+    print("Trace                | Algorithm | Frames | Faults     | Seconds")
+    print("---------------------+-----------+--------+------------+---------")
+    for row in rows:
+        print(f"{row['trace'][-20:]:<20} | {row['algorithm']:<9} | {row['frames']:<6} | {row['faults']:<10} | {row['seconds']:.3f}")
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run replacement algorithms over a grid of frame counts and traces.")
+    parser.add_argument("traces", nargs="+", help="trace files (text, .csv, .bin/.u32, .u64)")
+    parser.add_argument("--algorithms", nargs="+", default=ALGORITHMS, choices=ALGORITHMS)
+    parser.add_argument("--frames", nargs="+", type=int, default=[3, 4])
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all CPUs)")
+    parser.add_argument("--output", help="write the results table to this CSV file")
+    args = parser.parse_args()
+
+    results = run_sweep(args.algorithms, args.frames, args.traces, args.workers)
+    print_results(results)
+    if args.output:
+        write_results(results, args.output)
@@ -0,0 +1,132 @@
+"""
+The simulators against straightforward versions of the algorithms they
+replaced: a list scanned on every reference for FIFO and LRU, and a look-ahead
+over the rest of the string for OPT.
+"""
+
+import contextlib
+import io
+import random
+
+import pytest
+
+from OS_Segmentation import run_fifo, run_lru, run_optimal, simulate_optimal
+from fifoPageReplacement import fifoPageReplacement
+from leastRecentlyUsedPageReplacement import LRUCache
+from optimalPagingSimulation import optimalPage
+from replacement_policies import SetOrderOptimalPolicy, make_policy, restore_policy, run_policy
+
+TEXTBOOK = [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2, 1, 2, 0, 1, 7, 0, 1]
+BELADY = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]
+
+
+def reference_fifo(refs, num_frames):
+    frames, faults = [], 0
+    for page in refs:
+        if page not in frames:
+            faults += 1
+            if len(frames) == num_frames:
+                frames.pop(0)
+            frames.append(page)
+    return faults
+
+
+def reference_lru(refs, num_frames):
+    frames, faults = [], 0 # LRU first
+    for page in refs:
+        if page in frames:
+            frames.remove(page)
+        else:
+            faults += 1
+            if len(frames) == num_frames:
+                frames.pop(0)
+        frames.append(page)
+    return faults
+
+
+def reference_optimal(refs, num_frames):
+    """
+    Returns (faults, victims), breaking ties between pages that are never
+    referenced again by set iteration order, as the original simulator did.
+    """
+    frames, faults, victims = set(), 0, []
+    for i, page in enumerate(refs):
+        if page in frames:
+            continue
+        faults += 1
+        if len(frames) == num_frames:
+            future = refs[i + 1:]
+            unused = [p for p in frames if p not in future]
+            victim = unused[0] if unused else max(frames, key=future.index)
+            frames.remove(victim)
+            victims.append(victim)
+        frames.add(page)
+    return faults, victims
+
+
+def random_strings(count=300, seed=6):
+    rng = random.Random(seed)
+    for _ in range(count):
+        pages = rng.choice([4, 10, 50, 1000])
+        yield [rng.randrange(pages) for _ in range(rng.randint(0, 80))], rng.randint(1, 8)
+
+
+@pytest.mark.parametrize("refs, num_frames, fifo, lru, opt", [
+    (TEXTBOOK, 3, 15, 12, 9),
+    (TEXTBOOK, 4, 10, 8, 8),
+    (BELADY, 3, 9, 10, 7),
+    (BELADY, 4, 10, 8, 6),
+])
+def test_textbook_fault_counts(refs, num_frames, fifo, lru, opt):
+    assert run_fifo(refs, num_frames).faults == fifo
+    assert run_lru(refs, num_frames).faults == lru
+    assert run_optimal(refs, num_frames).faults == opt
+
+
+def test_fault_counts_match_the_reference_algorithms():
+    for refs, num_frames in random_strings():
+        fifo = reference_fifo(refs, num_frames)
+        lru = reference_lru(refs, num_frames)
+        opt, _ = reference_optimal(refs, num_frames)
+        assert run_fifo(refs, num_frames).faults == fifo
+        assert run_policy(make_policy('fifo', num_frames), refs).faults == fifo
+        assert fifoPageReplacement(refs, num_frames, verbose=False) == fifo
+        assert run_lru(refs, num_frames).faults == lru
+        for compact in (False, True):
+            cache = LRUCache(num_frames, verbose=False, compact=compact)
+            for page in refs:
+                cache.accessPage(page)
+            assert cache.pageFaults == lru
+        assert run_optimal(refs, num_frames).faults == opt
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert optimalPage(refs, len(refs), num_frames) == len(refs) - opt
+
+
+def test_optimal_victims_match_the_original_tie_break():
+    for refs, num_frames in random_strings(seed=7):
+        _, expected = reference_optimal(refs, num_frames)
+        victims = []
+        run_policy(SetOrderOptimalPolicy(num_frames, refs), refs,
+                   trace=lambda step, page, frames, fault, victim: victims.append(victim) if victim is not None else None)
+        assert victims == expected
+
+
+def test_simulate_optimal_prints_the_victims():
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        assert simulate_optimal(TEXTBOOK, 4) == 8
+    victims = [line.split('|')[3].strip() for line in out.getvalue().splitlines() if line[:1].isdigit()]
+    assert [victim for victim in victims if victim != '-'] == ['7', '1', '3', '2']
+
+
+def test_set_order_optimal_snapshot_round_trip(tmp_path):
+    refs = [random.Random(9).randrange(20) for _ in range(400)]
+    path = tmp_path / "optimal.snap"
+    original = SetOrderOptimalPolicy(5, refs)
+    run_policy(original, refs[:200])
+    original.snapshot(path)
+    restored = restore_policy(path, refs)
+    assert type(restored) is SetOrderOptimalPolicy
+    for page in refs[200:]:
+        assert restored.access(page) == original.access(page)
+    assert restored.stats() == original.stats()
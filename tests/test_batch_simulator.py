@@ -0,0 +1,22 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from batch_simulator import batch_fifo, batch_lru
+from replacement_policies import make_policy, run_policy
+
+
+def test_batch_matches_the_policies():
+    rng = random.Random(0)
+    refs = [[rng.randrange(8) for _ in range(60)] for _ in range(20)]
+    for frames in (1, 3, 5):
+        assert list(batch_fifo(refs, frames)) == [run_policy(make_policy('fifo', frames), row).faults for row in refs]
+        assert list(batch_lru(refs, frames)) == [run_policy(make_policy('lru', frames), row).faults for row in refs]
+
+
+@pytest.mark.parametrize("simulate", [batch_fifo, batch_lru])
+def test_zero_frames_is_rejected(simulate):
+    with pytest.raises(ValueError):
+        simulate([[1, 2, 3]], 0)
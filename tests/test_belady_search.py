@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from belady_search import anomalies, canonical_strings, fifo_fault_counts, policy_fault_counts, search
+from replacement_policies import FIFOPolicy, run_policy
+
+BELADY = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]
+
+
+def test_fifo_fault_counts_match_fifo_policy_for_every_frame_count():
+    rng = random.Random(12)
+    for _ in range(200):
+        refs = [rng.randrange(rng.choice([3, 6, 30])) for _ in range(rng.randint(0, 60))]
+        expected = [run_policy(FIFOPolicy(frames), refs).faults for frames in range(1, 11)]
+        assert fifo_fault_counts(refs, 10) == expected
+
+
+def test_classic_anomaly_is_detected():
+    counts = fifo_fault_counts(BELADY, 5)
+    assert counts == [12, 12, 9, 10, 5]
+    assert anomalies(counts) == [(3, 9, 10)]
+
+
+@pytest.mark.parametrize("policy", ["lru", "optimal"])
+def test_stack_algorithms_show_no_anomaly(policy):
+    rng = random.Random(13)
+    for _ in range(100):
+        refs = [rng.randrange(5) for _ in range(20)]
+        assert anomalies(policy_fault_counts(policy, refs, 5)) == []
+    assert anomalies(policy_fault_counts(policy, BELADY, 5)) == []
+
+
+@pytest.mark.parametrize("length, num_pages, expected", [
+    (4, 5, 15), # Bell number B(4): every partition of four positions
+    (4, 2, 8), # Partitions into at most two blocks
+    (0, 3, 1),
+])
+def test_canonical_strings_visit_each_renaming_once(length, num_pages, expected):
+    strings = list(canonical_strings(length, num_pages))
+    assert len(strings) == len(set(strings)) == expected
+    for string in strings:
+        first_seen = list(dict.fromkeys(string))
+        assert first_seen == list(range(len(first_seen))) # Pages appear in order 0, 1, 2, ...
+    assert all(string[:2] == (0, 1) for string in canonical_strings(4, 3, prefix=(0, 1)))
+
+
+def test_search_counts_the_whole_family():
+    report = search('fifo', 'enumerate', length=7, num_pages=3, max_workers=1)
+    assert report["strings"] == len(list(canonical_strings(7, 3)))
+    report = search('fifo', 'random', length=20, num_pages=6, count=10000, chunk_size=3000, max_workers=1)
+    assert report["strings"] == 10000
+    assert report["anomalies"] >= len(report["worst"]) == 5
+    for ratio, f, fewer, more, string in report["worst"]:
+        assert fifo_fault_counts(string, 6)[f - 1:f + 1] == [fewer, more] and ratio == more / fewer
+    with pytest.raises(ValueError):
+        search('mru')
+    with pytest.raises(ValueError):
+        search('fifo', 'exhaustive')
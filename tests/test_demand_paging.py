@@ -0,0 +1,33 @@
+import asyncio
+import random
+
+import pytest
+
+from demand_paging import DemandPager, simulate_demand_paging, with_writes
+from profiling import Profiler
+
+REFS = [random.Random(8).randrange(40) for _ in range(2000)]
+
+
+@pytest.mark.parametrize("policy", ['lru', 'clock', 'optimal'])
+def test_a_second_run_starts_cold(policy):
+    references = with_writes(REFS, seed=1)
+    pager = DemandPager(8, policy, depth=2, page_reference_string=REFS)
+    first = asyncio.run(pager.run(references))
+    second = asyncio.run(pager.run(references))
+    assert second == first
+    assert first == simulate_demand_paging(references, 8, policy, depth=2)
+
+
+def test_profiled_components_stay_instrumented_across_runs():
+    profiler = Profiler()
+    pager = DemandPager(8, 'lru', depth=2)
+    profiler.attach(pager.disk)
+    profiler.attach(pager.policy)
+    references = with_writes(REFS, seed=2)
+    asyncio.run(pager.run(references))
+    calls = profiler.report()["frames"]["lru.access"]["calls"]
+    asyncio.run(pager.run(references))
+    assert profiler.report()["frames"]["lru.access"]["calls"] == 2 * calls
+    assert profiler.report()["frames"]["AsyncDisk.io"]["calls"] > 0
+    profiler.detach()
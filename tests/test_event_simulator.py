@@ -0,0 +1,59 @@
+import pytest
+
+from event_simulator import EventSimulator
+
+# Whole-unit costs, so event times are exact.
+COSTS = {"memory": 1.0, "disk": 10.0}
+
+
+class LoggingSimulator(EventSimulator):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.log = [] # (time, pid, page) of every reference, in the order they ran
+
+    def _access(self, process, page):
+        self.log.append((self.now, process.pid, page))
+        return super()._access(process, page)
+
+
+def test_faulting_process_blocks_while_the_other_runs():
+    simulator = LoggingSimulator([[1, 1, 1], [5]], 2, quantum=100, tier_costs=COSTS, switch_time=2.0)
+    report = simulator.run()
+    # P0 faults at 2 and its page-in runs 2-12. P1 faults at 4 and waits for
+    # the disk until 12, then its page-in runs 12-22. P0 gets the CPU back at
+    # 15 (page table update 12-13, switch 13-15).
+    assert simulator.log == [(2.0, 0, 1), (4.0, 1, 5), (15.0, 0, 1), (16.0, 0, 1)]
+    assert [process["finish_time"] for process in report["processes"]] == [17.0, 25.0]
+    assert (report["elapsed"], report["faults"], report["context_switches"]) == (25.0, 2, 4)
+    assert report["cpu_utilization"] == 2 / 25
+    assert report["disk_utilization"] == 20 / 25
+
+
+def test_round_robin_preempts_at_the_end_of_the_quantum():
+    simulator = LoggingSimulator([[1] * 4, [2] * 4], 2, quantum=2, tier_costs={"memory": 1.0, "disk": 1.0},
+                                 switch_time=2.0)
+    report = simulator.run()
+    # At time 4 P1's switch was scheduled before P0's page-in completed, so P1
+    # runs first. From 6 on both are ready and alternate every two hits.
+    assert [(time, pid) for time, pid, _ in simulator.log] == [
+        (2.0, 0), (4.0, 1), (6.0, 0), (7.0, 0), (10.0, 1), (11.0, 1), (14.0, 0), (17.0, 1)]
+    assert [process["finish_time"] for process in report["processes"]] == [15.0, 18.0]
+    assert report["context_switches"] == 6
+
+
+def test_global_replacement_shares_frames():
+    local = EventSimulator([[1, 2, 3] * 5, [9] * 15], 4, scope='local', tier_costs=COSTS).run()
+    shared = EventSimulator([[1, 2, 3] * 5, [9] * 15], 4, scope='global', tier_costs=COSTS).run()
+    assert [process["faults"] for process in local["processes"]] == [15, 1] # Three pages in two frames
+    assert [process["faults"] for process in shared["processes"]] == [3, 1]
+
+
+@pytest.mark.parametrize("options", [
+    {"scope": "global", "policy": "optimal"},
+    {"scope": "shared"},
+    {"total_frames": 1},
+])
+def test_invalid_configurations(options):
+    arguments = {"traces": [[1], [2]], "total_frames": 4, **options}
+    with pytest.raises(ValueError):
+        EventSimulator(**arguments)
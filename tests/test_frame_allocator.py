@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+from frame_allocator import BuddyAllocator, FrameAllocator
+from latency_recorder import LatencyRecorder
+
+
+def test_frame_allocator_hands_out_every_frame_once():
+    allocator = FrameAllocator(8, recorder=LatencyRecorder(keep_samples=False))
+    frames = [allocator.allocate() for _ in range(8)]
+    assert frames == list(range(8)) # Low frames first
+    assert allocator.allocate() is None
+    allocator.free(5)
+    assert allocator.allocate() == 5
+    assert allocator.stats()["failures"] == 1
+    assert allocator.recorder.count == 9
+
+
+@pytest.mark.parametrize("frame", [-1, 8, 100])
+def test_frame_allocator_rejects_frames_out_of_range(frame):
+    allocator = FrameAllocator(8)
+    allocator.allocate()
+    with pytest.raises(ValueError):
+        allocator.free(frame)
+    assert allocator.in_use[-1] == 0 # The last frame was not touched
+
+
+def test_frame_allocator_rejects_double_free_and_runs():
+    allocator = FrameAllocator(4)
+    frame = allocator.allocate()
+    allocator.free(frame)
+    with pytest.raises(ValueError):
+        allocator.free(frame)
+    with pytest.raises(ValueError):
+        allocator.allocate(2)
+
+
+def test_buddy_splits_and_merges():
+    allocator = BuddyAllocator(16)
+    a = allocator.allocate(3) # Splits 16 -> 8 -> 4
+    assert a == 0
+    assert allocator.stats()["internal_fragmentation"] == 1
+    assert sorted(len(blocks) for blocks in allocator.free_lists) == [0, 0, 0, 1, 1]
+    b = allocator.allocate(4)
+    assert b == 4
+    allocator.free(a)
+    allocator.free(b) # Merges back into one 16-frame block
+    assert allocator.free_lists[4] == {0}
+    assert allocator.largest_free_block() == 16
+    assert allocator.stats()["external_fragmentation"] == 0.0
+
+
+def test_buddy_exhaustion_and_odd_sizes():
+    allocator = BuddyAllocator(12) # An 8-frame and a 4-frame block
+    assert allocator.largest_free_block() == 8
+    assert allocator.allocate(9) is None
+    assert allocator.allocate(8) == 0
+    assert allocator.allocate(4) == 8
+    assert allocator.allocate(1) is None
+    assert allocator.stats()["failures"] == 2
+    assert allocator.free_frames() == 0
+
+
+def test_buddy_random_workload_never_overlaps():
+    allocator = BuddyAllocator(256)
+    rng = random.Random(13)
+    live = {}
+    for _ in range(3000):
+        if live and rng.random() < 0.5:
+            base = rng.choice(list(live))
+            allocator.free(base)
+            del live[base]
+        else:
+            count = rng.randint(1, 20)
+            base = allocator.allocate(count)
+            if base is not None:
+                size = 1 << (count - 1).bit_length()
+                assert base % size == 0 # Blocks are aligned to their size
+                live[base] = size
+        used = [frame for base, size in live.items() for frame in range(base, base + size)]
+        assert len(used) == len(set(used))
+        assert allocator.free_frames() == 256 - len(used)
+    for base in list(live):
+        allocator.free(base)
+    assert allocator.free_lists[8] == {0}
+
+
+@pytest.mark.parametrize("count", [0, -3])
+def test_buddy_rejects_empty_requests(count):
+    with pytest.raises(ValueError):
+        BuddyAllocator(16).allocate(count)
+
+
+@pytest.mark.parametrize("base", [-1, 16])
+def test_buddy_rejects_frames_out_of_range(base):
+    with pytest.raises(ValueError):
+        BuddyAllocator(16).free(base)
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from page_tables import FlatPageTable, InvertedPageTable, PageTable, RadixPageTable
+
+
+def make_tables():
+    return [FlatPageTable(1 << 12), RadixPageTable(levels=2, address_bits=24), RadixPageTable(levels=4, address_bits=24),
+            InvertedPageTable(64)]
+
+
+@pytest.mark.parametrize("table", make_tables(), ids=lambda table: type(table).__name__)
+def test_tables_agree_with_a_dict(table):
+    rng = random.Random(1)
+    expected = {}
+    frames = list(range(64))
+    for _ in range(2000):
+        page = rng.randrange(1 << 12)
+        if rng.random() < 0.3 and expected:
+            victim = rng.choice(list(expected))
+            table.unmap(victim)
+            frames.append(expected.pop(victim))
+        elif page not in expected and frames:
+            frame = frames.pop(rng.randrange(len(frames)))
+            table.map(page, frame)
+            expected[page] = frame
+        assert table.lookup(page) == expected.get(page)
+    assert table.mapped == len(expected)
+
+
+@pytest.mark.parametrize("levels", [0, 1])
+def test_radix_needs_two_levels(levels):
+    with pytest.raises(ValueError):
+        RadixPageTable(levels=levels)
+
+
+@pytest.mark.parametrize("table", make_tables(), ids=lambda table: type(table).__name__)
+def test_negative_frame_is_rejected(table):
+    with pytest.raises(ValueError):
+        table.map(5, -1)
+    assert table.lookup(5) is None
+
+
+def test_incomplete_table_cannot_be_built():
+    class NoLookup(PageTable):
+        def map(self, page, frame):
+            pass
+
+    with pytest.raises(TypeError):
+        NoLookup()
@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from prefetch import PREFETCHERS, PrefetchingPolicy, Prefetcher, SequentialPrefetcher, make_prefetcher, \
+    restore_prefetching_policy
+from replacement_policies import POLICIES, make_policy, restore_policy, run_policy
+
+WRAPPABLE = sorted(POLICIES) # OPT is not in POLICIES, and cannot be wrapped
+
+
+@pytest.mark.parametrize("num_frames", [4, 8, 16])
+@pytest.mark.parametrize("policy", WRAPPABLE)
+def test_sequential_scan_keeps_its_read_ahead(policy, num_frames):
+    wrapped = PrefetchingPolicy(make_policy(policy, num_frames), SequentialPrefetcher(), num_pages=5000)
+    run_policy(wrapped, range(5000))
+    stats = wrapped.stats()
+    assert stats["unused_evictions"] == 0
+    assert stats["accuracy"] == 1.0
+    assert stats["faults"] == 1
+    assert stats["evictions"] == 0 # The one demand fault found a free frame
+    assert stats["prefetch_evictions"] == 5000 - num_frames # Every load once the frames are full was a prefetch
+
+
+@pytest.mark.parametrize("name", sorted(PREFETCHERS))
+def test_evictions_count_demand_faults_only(name):
+    rng = random.Random(12)
+    refs = [rng.randrange(200) if rng.random() < 0.3 else i % 500 for i in range(5000)]
+    wrapped = PrefetchingPolicy(make_policy('lru', 16), make_prefetcher(name))
+    demand_evictions = 0
+    for page in refs:
+        if wrapped.access(page) and wrapped.last_victim is not None:
+            demand_evictions += 1
+    assert wrapped.evictions == demand_evictions
+    assert wrapped.evictions + wrapped.prefetch_evictions == wrapped.policy.evictions
+
+
+@pytest.mark.parametrize("name", sorted(PREFETCHERS))
+def test_predictions_respect_the_limit(name):
+    prefetcher = make_prefetcher(name)
+    rng = random.Random(2)
+    for step in range(2000):
+        page = step if step % 3 else rng.randrange(100)
+        limit = rng.randrange(4)
+        assert len(list(prefetcher.predict(page, limit))) <= limit
+
+
+@pytest.mark.parametrize("policy", WRAPPABLE)
+def test_prefetches_never_evict_the_page_just_referenced(policy):
+    wrapped = PrefetchingPolicy(make_policy(policy, 8), make_prefetcher('markov'))
+    rng = random.Random(3)
+    for _ in range(3000):
+        page = rng.randrange(40)
+        wrapped.access(page)
+        assert page in wrapped
+
+
+@pytest.mark.parametrize("policy", WRAPPABLE)
+def test_snapshot_round_trip(tmp_path, policy):
+    rng = random.Random(4)
+    refs = [rng.randrange(60) if rng.random() < 0.5 else i % 200 for i in range(4000)]
+    path = tmp_path / "prefetching.snap"
+    original = PrefetchingPolicy(make_policy(policy, 16), SequentialPrefetcher())
+    run_policy(original, refs[:2000])
+    original.snapshot(path)
+
+    restored = restore_prefetching_policy(path, make_policy(policy, 16), SequentialPrefetcher())
+    assert restored.stats() == original.stats()
+    assert sorted(restored.resident()) == sorted(original.resident())
+    assert restored.prefetched == original.prefetched
+    assert restored.evicted_by_prefetch == original.evicted_by_prefetch
+    # Both continue with a fresh prefetcher, so they stay in step from here on.
+    original.prefetcher = SequentialPrefetcher()
+    run_policy(original, refs[2000:])
+    run_policy(restored, refs[2000:])
+    assert restored.stats() == original.stats()
+
+
+def test_restore_checks_the_wrapped_policy(tmp_path):
+    path = tmp_path / "prefetching.snap"
+    wrapped = PrefetchingPolicy(make_policy('lru', 8), SequentialPrefetcher())
+    run_policy(wrapped, range(100))
+    wrapped.snapshot(path)
+    with pytest.raises(ValueError):
+        restore_prefetching_policy(path, make_policy('fifo', 8), SequentialPrefetcher())
+    with pytest.raises(ValueError):
+        restore_prefetching_policy(path, make_policy('lru', 4), SequentialPrefetcher())
+    with pytest.raises(ValueError):
+        restore_policy(path)
+
+
+def test_prefetcher_needs_predict():
+    class Incomplete(Prefetcher):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
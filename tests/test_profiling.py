@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+from profiling import Profiler, phases_for
+from replacement_policies import CompactLRUPolicy, LRUPolicy, run_policy
+from tlb import TLB
+
+REFS = [1, 2, 3, 1, 4, 5, 2, 1] * 10
+
+
+def test_detach_restores_the_original_methods():
+    policy = LRUPolicy(3)
+    tlb = TLB(entries=4)
+    custom_lookup = tlb.lookup
+    tlb.lookup = custom_lookup # An instance attribute that was there before attaching
+    profiler = Profiler()
+    profiler.attach(policy)
+    profiler.attach(profiler.attach(tlb)) # Attached twice: both layers come off
+    assert "access" in vars(policy) and tlb.lookup is not custom_lookup
+    profiler.detach()
+    assert "access" not in vars(policy) and "evict" not in vars(policy)
+    assert policy.access.__func__ is LRUPolicy.access
+    assert tlb.lookup is custom_lookup
+    assert "insert" not in vars(tlb)
+    assert profiler.attached == []
+
+
+def test_disabled_profiler_patches_nothing():
+    policy = LRUPolicy(3)
+    profiler = Profiler(enabled=False)
+    assert profiler.attach(policy) is policy
+    assert vars(policy).keys().isdisjoint(phases_for(policy))
+    assert profiler.wrap(len, "len") is len
+    run_policy(policy, REFS)
+    assert profiler.report() == {"stacks": [], "frames": {}}
+
+
+def test_nested_phases_are_recorded_per_stack():
+    policy = LRUPolicy(3)
+    profiler = Profiler()
+    result = run_policy(profiler.attach(policy), REFS)
+    profiler.detach()
+    report = profiler.report()
+    frames = report["frames"]
+    assert frames["lru.access"]["calls"] == len(REFS)
+    assert frames["lru.victim_selection"]["calls"] == result.evictions
+    stacks = {tuple(entry["stack"]): entry for entry in report["stacks"]}
+    assert set(stacks) == {("lru.access",), ("lru.access", "lru.victim_selection")}
+    outer = stacks[("lru.access",)]
+    assert outer["self_ns"] == outer["total_ns"] - stacks[("lru.access", "lru.victim_selection")]["total_ns"]
+    assert profiler.folded() == [f"{';'.join(path)} {entry['self_ns']}" for path, entry in stacks.items()]
+
+
+def test_phases_follow_the_class_hierarchy():
+    phases = phases_for(CompactLRUPolicy(2))
+    assert phases["access"] == "access" and phases["_find"] == "lookup"
+    profiler = Profiler()
+    run_policy(profiler.attach(CompactLRUPolicy(2)), REFS)
+    assert "compact_lru.lookup" in profiler.report()["frames"]
+
+
+def test_recursive_and_async_phases():
+    profiler = Profiler()
+
+    def countdown(n):
+        return n if n == 0 else wrapped(n - 1)
+
+    wrapped = profiler.wrap(countdown, "countdown")
+    wrapped(3)
+    frame = profiler.report()["frames"]["countdown"]
+    outermost = next(entry for entry in profiler.report()["stacks"] if entry["stack"] == ["countdown"])
+    assert frame["calls"] == 4
+    assert frame["total_ns"] == outermost["total_ns"] # Nested calls are not counted twice
+
+    async def sleep():
+        await asyncio.sleep(0.01)
+
+    asyncio.run(profiler.wrap(sleep, "sleep")())
+    assert profiler.report()["frames"]["sleep"]["total_ns"] >= 10 ** 7 # Includes the wait
+    profiler.reset()
+    assert profiler.report()["frames"] == {}
+
+
+def test_exports(tmp_path):
+    profiler = Profiler()
+    run_policy(profiler.attach(LRUPolicy(2)), REFS)
+    profiler.write_json(tmp_path / "profile.json")
+    profiler.write_folded(tmp_path / "profile.folded")
+    assert json.loads((tmp_path / "profile.json").read_text()) == profiler.report()
+    assert (tmp_path / "profile.folded").read_text().splitlines() == profiler.folded()
@@ -0,0 +1,111 @@
+import random
+
+import pytest
+
+from prefetch import PrefetchingPolicy, SequentialPrefetcher
+from replacement_policies import POLICIES, CompactLRUPolicy, ReplacementPolicy, make_policy, restore_policy, \
+    run_policy
+
+REFS = [random.Random(5).randrange(30) for _ in range(3000)]
+
+
+def make_policies(num_frames, page_reference_string=REFS):
+    policies = {name: make_policy(name, num_frames) for name in sorted(POLICIES)}
+    policies[CompactLRUPolicy.name] = CompactLRUPolicy(num_frames)
+    policies['optimal'] = make_policy('optimal', num_frames, page_reference_string)
+    policies['lru+sequential'] = PrefetchingPolicy(make_policy('lru', num_frames), SequentialPrefetcher())
+    return policies
+
+
+@pytest.mark.parametrize("name", sorted(make_policies(1)))
+def test_evict_on_an_empty_policy_raises_key_error(name):
+    policy = make_policies(4)[name]
+    with pytest.raises(KeyError):
+        policy.evict()
+    assert policy.next_victim() is None
+
+
+@pytest.mark.parametrize("name", sorted(make_policies(1)))
+def test_evict_drains_every_resident_page(name):
+    policy = make_policies(4)[name]
+    for page in REFS[:50]:
+        policy.access(page)
+    resident = set(policy.resident())
+    drained = set()
+    while len(policy):
+        predicted = policy.next_victim()
+        victim = policy.evict()
+        assert victim == predicted
+        drained.add(victim)
+    assert drained == resident
+    with pytest.raises(KeyError):
+        policy.evict()
+
+
+@pytest.mark.parametrize("name", sorted(make_policies(1)))
+def test_next_victim_predicts_the_victim_of_a_fault(name):
+    policy = make_policies(5)[name]
+    for page in REFS:
+        predicted = policy.next_victim(page) if page not in policy and len(policy) == policy.num_frames else None
+        if policy.access(page) and not isinstance(policy, PrefetchingPolicy):
+            assert policy.last_victim == predicted
+
+
+@pytest.mark.parametrize("name", sorted(make_policies(1)))
+def test_reset_returns_to_a_cold_start(name):
+    policy, fresh = make_policies(6)[name], make_policies(6)[name]
+    run_policy(policy, REFS[:1500])
+    policy.reset()
+    assert len(policy) == 0 and policy.last_victim is None
+    assert policy.stats() == fresh.stats()
+    if not isinstance(policy, PrefetchingPolicy): # The prefetcher keeps its history
+        assert run_policy(policy, REFS) == run_policy(fresh, REFS)
+        assert policy.resident() == fresh.resident()
+
+
+@pytest.mark.parametrize("name", sorted(set(make_policies(1)) - {'lru+sequential'}))
+def test_snapshot_round_trip(tmp_path, name):
+    path = tmp_path / "policy.snap"
+    original = make_policies(6)[name]
+    run_policy(original, REFS[:1500])
+    original.snapshot(path)
+    restored = restore_policy(path, REFS)
+    assert type(restored) is type(original)
+    assert restored.stats() == original.stats()
+    assert restored.resident() == original.resident()
+    for page in REFS[1500:]:
+        fault = original.access(page)
+        assert restored.access(page) == fault
+        if fault:
+            assert restored.last_victim == original.last_victim
+    assert restored.stats() == original.stats()
+
+
+@pytest.mark.parametrize("name", sorted(set(make_policies(1)) - {'lru+sequential'}))
+def test_loading_a_state_replaces_the_old_one(name):
+    used, empty, fresh = make_policies(6)[name], make_policies(6)[name], make_policies(6)[name]
+    run_policy(used, REFS)
+    used._load_state(*empty._state())
+    used.page_faults = used.hits = used.evictions = 0
+    assert len(used) == 0
+    assert run_policy(used, REFS) == run_policy(fresh, REFS)
+
+
+def test_snapshot_rejects_bad_input(tmp_path):
+    policy = make_policy('lru', 4)
+    policy.access('a')
+    with pytest.raises(ValueError):
+        policy.snapshot(tmp_path / "strings.snap")
+    path = tmp_path / "garbage.snap"
+    path.write_bytes(b"not a snapshot")
+    with pytest.raises(ValueError):
+        restore_policy(path)
+
+
+def test_policy_must_implement_the_interface():
+    class Incomplete(ReplacementPolicy):
+        def access(self, page):
+            return True
+
+    with pytest.raises(TypeError):
+        Incomplete(4)
@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from segment_allocator import STRATEGIES, SegmentAllocator, Treap
+
+
+def expected_hole(holes, size, strategy, rover):
+    """
+    The hole a strategy should pick, by scanning every hole.
+    """
+    fits = sorted(start for start, hole in holes.items() if hole >= size)
+    if not fits:
+        return None
+    if strategy == 'first':
+        return fits[0]
+    if strategy == 'best':
+        return min(fits, key=lambda start: (holes[start], start))
+    if strategy == 'worst':
+        largest = max(holes.values())
+        return max(start for start, hole in holes.items() if hole == largest) if largest >= size else None
+    holding = [start for start in sorted(holes) if start <= rover]
+    low = holding[-1] if holding else 0
+    after = [start for start in fits if start >= low]
+    return after[0] if after else fits[0]
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_placement_matches_a_scan_of_every_hole(strategy):
+    allocator = SegmentAllocator(1 << 16, strategy)
+    rng = random.Random(10)
+    live = []
+    for _ in range(3000):
+        if live and rng.random() < 0.45:
+            allocator.free(live.pop(rng.randrange(len(live))))
+        else:
+            size = rng.randint(1, 2048)
+            expected = expected_hole(dict(allocator.hole_sizes), size, strategy, allocator.rover)
+            base = allocator.allocate(size)
+            assert base == expected
+            if base is not None:
+                live.append(base)
+        assert len(allocator.hole_starts) == len(allocator.holes_by_size) == len(allocator.hole_sizes)
+        assert sum(allocator.hole_sizes.values()) == allocator.free_bytes()
+        assert allocator.largest_hole() == max(allocator.hole_sizes.values(), default=0)
+
+
+def test_free_merges_neighbouring_holes():
+    allocator = SegmentAllocator(300)
+    bases = [allocator.allocate(100) for _ in range(3)]
+    allocator.free(bases[0])
+    allocator.free(bases[2])
+    assert allocator.stats()["holes"] == 2
+    allocator.free(bases[1])
+    assert allocator.hole_sizes == {0: 300}
+    with pytest.raises(ValueError):
+        allocator.free(bases[1])
+
+
+def test_compaction_relocates_owners():
+    class Owner:
+        base = None
+
+    allocator = SegmentAllocator(400, compact_on_failure=True)
+    owners = [Owner() for _ in range(4)]
+    for owner in owners:
+        owner.base = allocator.allocate(100, owner=owner)
+    allocator.free(owners[0].base)
+    allocator.free(owners[2].base)
+    assert allocator.allocate(200) is not None # Only fits once the two holes are joined
+    assert allocator.compactions == 1
+    assert (owners[1].base, owners[3].base) == (0, 100)
+    assert allocator.fragmentation_failures == 0
+
+
+def test_treap_queries():
+    treap = Treap()
+    rng = random.Random(11)
+    reference = {}
+    for _ in range(2000):
+        key = rng.randrange(500)
+        if key in reference:
+            treap.delete(key)
+            del reference[key]
+        else:
+            reference[key] = rng.randrange(100)
+            treap.insert(key, reference[key])
+        probe, need = rng.randrange(500), rng.randrange(100)
+        keys = sorted(reference)
+        assert len(treap) == len(keys)
+        assert treap.ceiling(probe) == next((k for k in keys if k >= probe), None)
+        assert treap.floor(probe) == next((k for k in reversed(keys) if k <= probe), None)
+        assert treap.last() == (keys[-1] if keys else None)
+        assert treap.first_fit(need, probe) == next((k for k in keys if k >= probe and reference[k] >= need), None)
@@ -0,0 +1,68 @@
+import pytest
+
+from OS_Seg import Process
+from segmentation import SegmentMMU, read_access_trace, run_trace
+
+
+def make_process():
+    process = Process("test")
+    process.add_segment("Code", 400, "r-xp") # Base 0
+    process.add_segment("Data", 300, "rw-p") # Base 400
+    process.add_segment("ROData", 100, "r--p") # Base 700
+    return process
+
+
+@pytest.mark.parametrize("segment, offset, access, expected", [
+    ("Code", 0, 'x', 0),
+    ("Code", 399, 'r', 399),
+    ("Data", 299, 'w', 699),
+    (2, 50, 'r', 750),
+])
+def test_translation_adds_the_base(segment, offset, access, expected):
+    mmu = SegmentMMU(make_process())
+    assert mmu.translate(segment, offset, access) == expected
+    assert mmu.last_fault is None
+
+
+@pytest.mark.parametrize("segment, offset, access, kind", [
+    ("Data", 300, 'r', 'limit'), # One past the end
+    ("Code", -1, 'x', 'limit'),
+    ("ROData", 100, 'r', 'limit'), # Limit is checked before permissions
+    ("ROData", 10, 'w', 'permission'),
+    ("Code", 10, 'w', 'permission'),
+    ("Heap", 0, 'r', 'segment'),
+    (3, 0, 'r', 'segment'),
+])
+def test_faults_are_counted_by_kind(segment, offset, access, kind):
+    mmu = SegmentMMU(make_process())
+    assert mmu.translate(segment, offset, access) is None
+    assert mmu.last_fault == (kind, segment, offset, access)
+    stats = mmu.stats()
+    assert stats[f"{kind}_faults"] == stats["protection_faults"] == 1
+
+
+def test_descriptor_cache_and_reload():
+    process = make_process()
+    mmu = SegmentMMU(process, cache_entries=2)
+    for segment in ("Code", "Data", "Code", "ROData", "Data"): # ROData pushes Data out
+        mmu.translate(segment, 0, 'r')
+    assert (mmu.cache_hits, mmu.cache_misses, mmu.memory_accesses) == (1, 4, 4)
+
+    process.remove_segment("Data")
+    process.add_segment("Data", 50, "rw-p") # Smaller, and now segment 2
+    mmu.reload()
+    assert mmu.translate("Data", 60, 'r') is None
+    assert mmu.last_fault == ('limit', "Data", 60, 'r')
+    assert mmu.translate("Data", 49, 'w') == 849
+    with pytest.raises(ValueError):
+        SegmentMMU(process, cache_entries=0)
+
+
+def test_run_trace_from_a_file(tmp_path):
+    path = tmp_path / "accesses.txt"
+    path.write_text("# segment offset access\nCode 12 x\n\n1 100 w\n2 5 w\nData 300 r\n")
+    accesses = list(read_access_trace(path))
+    assert accesses[:2] == [("Code", 12, 'x'), (1, 100, 'w')]
+    report = run_trace(SegmentMMU(make_process()), accesses)
+    assert report["translations"] == 4
+    assert (report["limit_faults"], report["permission_faults"], report["segment_faults"]) == (1, 1, 0)
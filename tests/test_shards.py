@@ -0,0 +1,49 @@
+import pytest
+
+from OS_Segmentation import run_lru
+from benchmark import make_workload
+from shards import ShardsSampler, compare_with_exact, page_hash
+from stack_distance import lru_fault_curve
+
+ZIPF = list(make_workload('zipf', 100000, 20000, seed=1))
+FRAME_COUNTS = [100, 500, 1000, 2000, 5000]
+
+
+def test_full_rate_reproduces_the_exact_curve():
+    refs = ZIPF[:20000]
+    sampler = ShardsSampler(rate=1.0)
+    sampler.feed(refs)
+    estimate = [round(faults) for faults in sampler.fault_curve(3000, adjust=False)]
+    assert estimate == lru_fault_curve(refs, 3000)
+    for frames in (1, 10, 300, 3000):
+        assert estimate[frames - 1] == run_lru(refs, frames).faults
+
+
+@pytest.mark.parametrize("rate, max_pages, bound", [
+    (0.1, None, 0.03), # Measured 0.012
+    (0.5, None, 0.01), # Measured 0.004
+    (1.0, 2000, 0.01), # Fixed size, settles near rate 0.1; measured 0.004
+])
+def test_estimates_stay_within_the_error_bound(rate, max_pages, bound):
+    comparison = compare_with_exact(ZIPF, FRAME_COUNTS, rate, max_pages)
+    assert comparison["mean_absolute_error"] < bound
+
+
+def test_lowering_the_threshold_keeps_the_counts_consistent():
+    sampler = ShardsSampler(rate=1.0, max_pages=500)
+    rates = []
+    for start in range(0, 30000, 1000):
+        sampler.feed(ZIPF[start:start + 1000])
+        stats = sampler.stats()
+        rates.append(stats["rate"])
+        histogram_total = (sampler.cold + sum(sampler.histogram)) * sampler.scale
+        assert stats["sampled_references"] == pytest.approx(histogram_total)
+        assert stats["tracked_pages"] <= 500
+        assert len(sampler.tracked) == stats["tracked_pages"]
+        assert all(page_hash(page) < sampler.threshold for page in sampler.tracker.last_access)
+    assert rates == sorted(rates, reverse=True)
+    assert rates[-1] < 1.0
+    # The rescaled count matches what the final rate samples from the whole trace, up to sampling noise.
+    expected = ShardsSampler(rate=rates[-1])
+    expected.feed(ZIPF[:30000])
+    assert stats["sampled_references"] == pytest.approx(expected.stats()["sampled_references"], rel=0.3)
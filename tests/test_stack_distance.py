@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from OS_Segmentation import run_lru
+from stack_distance import StackDistanceTracker, lru_fault_curve, lru_miss_ratio_curve, stack_distance_histogram
+
+TEXTBOOK = [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2, 1, 2, 0, 1, 7, 0, 1]
+
+
+def reference_distances(refs):
+    stack, distances = [], [] # MRU first
+    for page in refs:
+        if page in stack:
+            distances.append(stack.index(page) + 1)
+            stack.remove(page)
+        else:
+            distances.append(0)
+        stack.insert(0, page)
+    return distances
+
+
+@pytest.mark.parametrize("initial_capacity", [1, 4, 1024])
+def test_tracker_matches_an_explicit_stack(initial_capacity):
+    rng = random.Random(3)
+    refs = [rng.randrange(rng.choice([5, 40])) for _ in range(3000)]
+    tracker = StackDistanceTracker(initial_capacity)
+    assert [tracker.access(page) for page in refs] == reference_distances(refs)
+
+
+def test_compaction_keeps_the_tree_small():
+    rng = random.Random(4)
+    refs = [rng.randrange(30) for _ in range(20000)]
+    tracker = StackDistanceTracker(initial_capacity=8)
+    expected = reference_distances(refs)
+    for i, page in enumerate(refs):
+        assert tracker.access(page) == expected[i]
+        assert tracker.fenwick.size <= 2 * 30 # Follows the distinct pages, not the trace length
+    assert tracker.clock <= tracker.fenwick.size
+
+
+def test_removed_pages_miss_again():
+    tracker = StackDistanceTracker(initial_capacity=2)
+    for page in (1, 2, 3):
+        tracker.access(page)
+    tracker.remove(2)
+    tracker.remove(9) # Never referenced: nothing to forget
+    assert tracker.access(1) == 2 # Only 3 was touched since, 2 no longer counts
+    assert tracker.access(2) == 0
+
+
+def test_textbook_curve():
+    assert lru_fault_curve(TEXTBOOK, 4)[2:] == [12, 8]
+    histogram, cold_misses, total = stack_distance_histogram(TEXTBOOK)
+    assert (cold_misses, total) == (6, 20) # Pages 0-4 and 7
+    assert cold_misses + sum(histogram) == total
+    assert lru_miss_ratio_curve(TEXTBOOK, 4)[2:] == [12 / 20, 8 / 20]
+
+
+def test_fault_curve_matches_run_lru_for_every_frame_count():
+    rng = random.Random(8)
+    for _ in range(30):
+        refs = [rng.randrange(rng.choice([4, 20, 200])) for _ in range(rng.randint(0, 400))]
+        curve = lru_fault_curve(refs, 25)
+        assert curve == [run_lru(refs, frames).faults for frames in range(1, 26)]
+    assert lru_fault_curve([]) == [0]
+    assert lru_fault_curve(iter(TEXTBOOK)) == lru_fault_curve(TEXTBOOK) # Streams work too
@@ -0,0 +1,39 @@
+import array
+
+from replacement_policies import make_policy, run_policy
+from sweep import _run_cell, run_sweep, share_trace
+
+
+def test_share_trace_copies_the_trace(tmp_path):
+    path = tmp_path / "trace.txt"
+    path.write_text("1 2 3 4 1 2 5 1 2 3 4 5\n")
+    shm, length = share_trace(str(path))
+    try:
+        assert length == 12
+        assert list(shm.buf[:8 * length].cast('Q')) == [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]
+        # A cell attaches and closes the block itself, so running one twice must work.
+        for _ in range(2):
+            result, _ = _run_cell('fifo', 3, shm.name, length)
+            assert result.faults == 9
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_empty_trace(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_text("")
+    shm, length = share_trace(str(path))
+    shm.close()
+    shm.unlink()
+    assert length == 0
+
+
+def test_sweep_matches_run_policy(tmp_path):
+    refs = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5] * 3
+    path = tmp_path / "trace.u64"
+    path.write_bytes(array.array('Q', refs).tobytes())
+    rows = run_sweep(['fifo', 'lru', 'optimal'], [3, 4], [str(path)], max_workers=1)
+    for row in rows:
+        expected = run_policy(make_policy(row["algorithm"], row["frames"], refs), refs)
+        assert row["faults"] == expected.faults
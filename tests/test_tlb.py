@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from OS_Segmentation import run_fifo, run_lru
+from tlb import TLB, effective_access_time
+
+
+def translate(tlb, page):
+    if tlb.lookup(page) is None:
+        tlb.insert(page, page + 100)
+
+
+def test_hits_misses_and_invalidate():
+    tlb = TLB(entries=2)
+    for page in (1, 2, 1, 3, 2, 1):
+        translate(tlb, page) # LRU: 3 evicts 2, then 2 evicts 1 and 1 evicts 3
+    assert (tlb.hits, tlb.misses, tlb.evictions) == (1, 5, 3)
+    assert tlb.lookup(2) == 102
+    tlb.invalidate(2)
+    tlb.invalidate(7) # Not cached: nothing happens
+    assert tlb.lookup(2) is None
+    assert tlb.lookup(1) == 101
+    assert (tlb.hits, tlb.misses, tlb.evictions) == (3, 6, 3) # Invalidation is not an eviction
+    tlb.flush()
+    assert tlb.lookup(1) is None
+    assert tlb.hit_ratio() == 3 / 10
+
+
+@pytest.mark.parametrize("policy, run", [("lru", run_lru), ("fifo", run_fifo)])
+def test_fully_associative_tlb_behaves_like_the_page_policy(policy, run):
+    rng = random.Random(5)
+    refs = [rng.randrange(12) for _ in range(2000)]
+    tlb = TLB(entries=8, policy=policy)
+    for page in refs:
+        translate(tlb, page)
+    result = run(refs, 8)
+    assert (tlb.misses, tlb.hits, tlb.evictions) == (result.faults, result.hits, result.evictions)
+
+
+def test_set_associative_placement():
+    tlb = TLB(entries=8, ways=2, policy='fifo') # Four sets of two
+    for page in (0, 4, 8): # All in set 0, so 8 evicts 0
+        translate(tlb, page)
+    translate(tlb, 1) # Set 1 still has room
+    assert tlb.evictions == 1
+    assert tlb.lookup(0) is None and tlb.lookup(4) == 104 and tlb.lookup(1) == 101
+    assert [len(entries) for entries in tlb.sets] == [2, 1, 0, 0]
+
+
+def test_random_replacement_is_seeded():
+    def victims(seed):
+        tlb = TLB(entries=4, policy='random', seed=seed)
+        for page in range(50):
+            translate(tlb, page)
+        assert tlb.evictions == 46
+        return sorted(tlb.sets[0])
+
+    assert victims(1) == victims(1)
+
+
+@pytest.mark.parametrize("entries, ways, policy", [(0, None, 'lru'), (8, 3, 'lru'), (8, 2, 'mru')])
+def test_invalid_configurations(entries, ways, policy):
+    with pytest.raises(ValueError):
+        TLB(entries, ways, policy)
+
+
+def test_effective_access_time():
+    assert effective_access_time(1.0, 1, 100) == 101
+    assert effective_access_time(0.0, 1, 100, page_table_levels=4) == 501
+    assert effective_access_time(0.8, 20, 100) == pytest.approx(0.8 * 120 + 0.2 * 220)
+    assert TLB(entries=64).reach(4096) == 64 * 4096
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from trace_reader import iter_references, load_trace, open_trace, read_binary_trace, read_csv_trace, read_text_trace, \
+    write_binary_trace
+
+_rng = random.Random(2)
+PAGES = [_rng.randrange(10 ** _rng.randint(1, 9)) for _ in range(5000)] # Mixed widths, so tokens straddle block edges
+
+
+def check_chunks(chunks, chunk_size, expected):
+    assert all(len(chunk) == chunk_size for chunk in chunks[:-1])
+    assert 0 < len(chunks[-1]) <= chunk_size
+    assert [page for chunk in chunks for page in chunk] == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 512, 1000, 5000, 65536])
+@pytest.mark.parametrize("trailing", ["", "\n", "  \r\n"])
+def test_text_trace_across_block_and_chunk_boundaries(tmp_path, chunk_size, trailing):
+    separators = [" ", "\n", "\t", "  ", "\r\n"]
+    text = "".join(f"{page}{separators[i % len(separators)]}" for i, page in enumerate(PAGES[:-1]))
+    path = tmp_path / "trace.txt"
+    path.write_text(text + f"{PAGES[-1]}{trailing}", newline="")
+    assert len(text) > 3 * 4096 # Several reads, so some tokens are split between them
+    check_chunks(list(read_text_trace(path, chunk_size)), chunk_size, PAGES)
+
+
+@pytest.mark.parametrize("dtype, top", [("uint32", 2 ** 32), ("uint64", 2 ** 64)])
+@pytest.mark.parametrize("chunk_size", [1, 999, 1000, 4096])
+def test_binary_trace_round_trip(tmp_path, dtype, top, chunk_size):
+    rng = random.Random(chunk_size)
+    pages = [rng.randrange(top) for _ in range(3000)] + [0, top - 1]
+    path = tmp_path / "trace.bin"
+    assert write_binary_trace(path, iter(pages), dtype) == len(pages)
+    assert path.stat().st_size == len(pages) * (4 if dtype == "uint32" else 8)
+    check_chunks(list(read_binary_trace(path, dtype, chunk_size)), chunk_size, pages)
+
+
+def test_binary_trace_errors(tmp_path):
+    path = tmp_path / "trace.bin"
+    path.write_bytes(b"")
+    assert list(read_binary_trace(path)) == []
+    path.write_bytes(bytes(6))
+    with pytest.raises(ValueError):
+        list(read_binary_trace(path))
+    with pytest.raises(ValueError):
+        list(read_binary_trace(path, "int8"))
+
+
+def test_csv_trace(tmp_path):
+    path = tmp_path / "trace.csv"
+    path.write_text("time,page\n" + "".join(f"{i},{page}\n\n" for i, page in enumerate(PAGES[:100])))
+    check_chunks(list(read_csv_trace(path, column=1, skip_header=True, chunk_size=30)), 30, PAGES[:100])
+
+
+def test_open_trace_picks_the_reader_from_the_extension(tmp_path):
+    text, csv_path, u64 = tmp_path / "a.trace", tmp_path / "a.csv", tmp_path / "a.u64"
+    text.write_text("1 2\n3")
+    csv_path.write_text("1\n2\n3\n")
+    write_binary_trace(u64, [1, 2, 3], "uint64")
+    for path in (text, csv_path, u64):
+        assert list(iter_references(open_trace(str(path), chunk_size=2))) == [1, 2, 3]
+        assert list(load_trace(str(path))) == [1, 2, 3]
+    with pytest.raises(ValueError):
+        open_trace(str(text), "json")
@@ -0,0 +1,55 @@
+import pytest
+
+from working_set import MultiProcessSimulator, WorkingSetTracker
+
+# A two-page loop and a four-page loop sharing six frames, three each to start.
+LOOP_2 = [0, 1] * 10
+LOOP_4 = [10, 11, 12, 13] * 5
+
+
+def run(allocator):
+    simulator = MultiProcessSimulator([LOOP_2, LOOP_4], 6, allocator=allocator, window=4, interval=4, quantum=2,
+                                      pff_lower=0.1, pff_upper=0.3)
+    report = simulator.run()
+    return [process["faults"] for process in report["processes"]], simulator.events
+
+
+def test_working_set_tracker_slides_its_window():
+    tracker = WorkingSetTracker(3)
+    sizes = []
+    for page in (1, 2, 1, 3, 4, 4):
+        tracker.add(page)
+        sizes.append(tracker.size())
+    assert sizes == [1, 2, 2, 3, 3, 2]
+    assert 4 in tracker and 3 in tracker and 1 not in tracker
+    with pytest.raises(ValueError):
+        WorkingSetTracker(0)
+
+
+def test_equal_split_thrashes_the_larger_loop():
+    # Three LRU frames over a four-page loop fault on every reference.
+    assert run('equal') == ([2, 20], [])
+
+
+def test_working_set_allocation_follows_the_loops():
+    # After 8 references the working sets are {0, 1} and {10..13}, so the split
+    # becomes 2 + 4: the second loop faults once more (page 10) and then fits.
+    assert run('working_set') == ([2, 5], [])
+
+
+def test_pff_swaps_out_when_no_frames_are_free():
+    # Both fault on every reference of the first interval and the pool is
+    # empty, so process 0 is swapped out and its frames go to process 1.
+    # It comes back once process 1 finishes and reloads its two pages.
+    assert run('pff') == ([4, 4], [(4, "suspend process 0"), (22, "resume process 0")])
+
+
+@pytest.mark.parametrize("options", [
+    {"allocator": "lottery"},
+    {"policy": "clock"},
+    {"total_frames": 1},
+])
+def test_invalid_configurations(options):
+    arguments = {"traces": [LOOP_2, LOOP_4], "total_frames": 6, **options}
+    with pytest.raises(ValueError):
+        MultiProcessSimulator(**arguments)
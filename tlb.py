@@ -0,0 +1,120 @@
+"""
+Translation lookaside buffer (TLB) simulation.
+
+The TLB caches page number -> frame number translations in front of the
+page table. It can be fully associative or set-associative: with ways=w the
+entries are split into entries // w sets, a page may only live in set
+(page % sets), and replacement happens within that set using LRU, FIFO or
+random replacement.
+"""
+
+import collections
+import random
+
+POLICIES = ('lru', 'fifo', 'random')
+
+
+class TLB:
+    """
+    A TLB with configurable size, associativity and replacement policy.
+
+    Args:
+        entries (int): Total number of translations the TLB holds.
+        ways (int): Entries per set. None (the default) or ways == entries
+            makes the TLB fully associative.
+        policy (str): 'lru', 'fifo' or 'random' replacement within a set.
+        seed (int): Seed for the random policy.
+    """
+
+    def __init__(self, entries=64, ways=None, policy='lru', seed=None):
+        if ways is None:
+            ways = entries
+        if entries < 1 or ways < 1 or entries % ways:
+            raise ValueError("entries must be a positive multiple of ways")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown TLB replacement policy: {policy}")
+        self.entries = entries
+        self.ways = ways
+        self.num_sets = entries // ways
+        self.policy = policy
+        self.rng = random.Random(seed)
+        # Each set maps page -> frame; insertion order is FIFO order, and for
+        # LRU hits are moved to the end so the first key is the LRU entry.
+        self.sets = [collections.OrderedDict() for _ in range(self.num_sets)]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, page):
+        """
+        Looks up a translation.
+
+        Returns:
+            The cached frame number, or None on a TLB miss.
+        """
+        entries = self.sets[page % self.num_sets]
+        frame = entries.get(page)
+        if frame is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.policy == 'lru':
+            entries.move_to_end(page)
+        return frame
+
+    def insert(self, page, frame):
+        """
+        Caches a translation, evicting one from the page's set if it is full.
+        """
+        entries = self.sets[page % self.num_sets]
+        if page not in entries and len(entries) >= self.ways:
+            if self.policy == 'random':
+                del entries[self.rng.choice(list(entries))]
+            else:
+                entries.popitem(last=False)
+            self.evictions += 1
+        entries[page] = frame
+
+    def invalidate(self, page):
+        """
+        Drops the translation for one page, e.g. after it is swapped out.
+        """
+        self.sets[page % self.num_sets].pop(page, None)
+
+    def flush(self):
+        """
+        Drops every translation, e.g. on a context switch.
+        """
+        for entries in self.sets:
+            entries.clear()
+
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def reach(self, page_size):
+        """
+        Returns the amount of memory the TLB can map at once, in bytes.
+        """
+        return self.entries * page_size
+
+
+def effective_access_time(hit_ratio, tlb_time, memory_time, page_table_levels=1):
+    """
+    Computes the effective memory access time for a given TLB hit ratio.
+
+    A hit costs the TLB lookup plus the data access; a miss additionally walks
+    the page table, one memory access per level.
+
+    Args:
+        hit_ratio (float): Fraction of lookups that hit in the TLB.
+        tlb_time (float): Cost of a TLB lookup.
+        memory_time (float): Cost of one main memory access.
+        page_table_levels (int): Memory accesses needed to walk the page table.
+
+    Returns:
+        float: Average cost per memory reference.
+    """
+    hit_cost = tlb_time + memory_time
+    miss_cost = tlb_time + (page_table_levels + 1) * memory_time
+    return hit_ratio * hit_cost + (1.0 - hit_ratio) * miss_cost
@@ -0,0 +1,205 @@
+"""
+Streaming readers for page reference traces stored in files.
+
+Traces can be far larger than memory, so every reader yields the trace as a
+sequence of chunks (lists of page numbers) and never holds more than one
+chunk at a time. Three formats are supported:
+
+- Text: page numbers separated by any whitespace, across any number of lines.
+- CSV: one reference per row, the page number taken from a given column.
+- Binary: a flat array of little-endian uint32 or uint64 page numbers, read
+  through a memory map.
+
+iter_references flattens the chunks into a plain generator of page numbers,
+which run_fifo, run_lru, fifoPageReplacement and LRUCache can consume
+directly. The Optimal algorithm needs the whole future of the trace and
+still takes a materialized list.
+"""
+
+import array
+import csv
+import itertools
+import mmap
+import os
+import sys
+
+DEFAULT_CHUNK_SIZE = 65536 # References per chunk
+
+# Binary dtype name -> (array typecode, item size in bytes)
+BINARY_DTYPES = {
+    'uint32': ('I', 4),
+    'uint64': ('Q', 8),
+}
+
+
+def read_text_trace(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Streams a whitespace-separated text trace in chunks.
+
+    Args:
+        path (str): Path of the trace file.
+        chunk_size (int): Maximum number of references per chunk.
+
+    Yields:
+        list: Page numbers, at most chunk_size per chunk.
+    """
+    block_size = max(chunk_size * 8, 4096) # Bytes read per system call
+    chunk = []
+    leftover = b""
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            block = leftover + block
+            tokens = block.split()
+            # A token touching the end of the block may continue in the next one.
+            if tokens and not block[-1:].isspace():
+                leftover = tokens.pop()
+            else:
+                leftover = b""
+            chunk.extend(map(int, tokens))
+            while len(chunk) >= chunk_size:
+                yield chunk[:chunk_size]
+                del chunk[:chunk_size]
+    if leftover:
+        chunk.append(int(leftover))
+    if chunk:
+        yield chunk
+
+
+def read_csv_trace(path, column=0, skip_header=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Streams the page numbers of one column of a CSV trace in chunks.
+
+    Args:
+        path (str): Path of the trace file.
+        column (int): Index of the column holding the page number.
+        skip_header (bool): Whether the first row is a header.
+        chunk_size (int): Maximum number of references per chunk.
+
+    Yields:
+        list: Page numbers, at most chunk_size per chunk.
+    """
+    chunk = []
+    with open(path, newline='') as f:
+        rows = csv.reader(f)
+        if skip_header:
+            next(rows, None)
+        for row in rows:
+            if not row:
+                continue
+            chunk.append(int(row[column]))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def read_binary_trace(path, dtype='uint32', chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Streams a binary trace of little-endian unsigned integers through a memory map.
+
+    Args:
+        path (str): Path of the trace file.
+        dtype (str): 'uint32' or 'uint64'.
+        chunk_size (int): Maximum number of references per chunk.
+
+    Yields:
+        list: Page numbers, at most chunk_size per chunk.
+    """
+    if dtype not in BINARY_DTYPES:
+        raise ValueError(f"Unsupported binary trace dtype: {dtype}")
+    typecode, itemsize = BINARY_DTYPES[dtype]
+
+    if os.path.getsize(path) == 0:
+        return # mmap cannot map an empty file
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if len(mm) % itemsize:
+            raise ValueError(f"{path} is not a whole number of {dtype} values")
+        step = chunk_size * itemsize
+        for start in range(0, len(mm), step):
+            chunk = array.array(typecode, mm[start:start + step])
+            if sys.byteorder == 'big':
+                chunk.byteswap()
+            yield chunk.tolist()
+
+
+def write_binary_trace(path, pages, dtype='uint32'):
+    """
+    Writes page numbers as a little-endian binary trace, one chunk at a time.
+
+    Args:
+        path (str): Path of the trace file to create.
+        pages (iterable): Page numbers to write.
+        dtype (str): 'uint32' or 'uint64'.
+
+    Returns:
+        int: Number of references written.
+    """
+    if dtype not in BINARY_DTYPES:
+        raise ValueError(f"Unsupported binary trace dtype: {dtype}")
+    typecode, _ = BINARY_DTYPES[dtype]
+
+    written = 0
+    pages = iter(pages)
+    with open(path, 'wb') as f:
+        while True:
+            chunk = array.array(typecode, itertools.islice(pages, DEFAULT_CHUNK_SIZE))
+            if not chunk:
+                break
+            if sys.byteorder == 'big':
+                chunk.byteswap()
+            chunk.tofile(f)
+            written += len(chunk)
+    return written
+
+
+def open_trace(path, fmt=None, chunk_size=DEFAULT_CHUNK_SIZE, **options):
+    """
+    Streams a trace in chunks, picking the reader from fmt or the file extension.
+
+    Args:
+        path (str): Path of the trace file.
+        fmt (str): 'text', 'csv', 'uint32' or 'uint64'. When omitted, '.csv'
+            files are read as CSV, '.u64' as uint64, '.bin' and '.u32' as
+            uint32 and everything else as text.
+        chunk_size (int): Maximum number of references per chunk.
+        **options: Extra keyword arguments for the CSV reader (column, skip_header).
+
+    Returns:
+        generator: Chunks of page numbers.
+    """
+    if fmt is None:
+        ext = os.path.splitext(path)[1].lower()
+        fmt = {'.csv': 'csv', '.bin': 'uint32', '.u32': 'uint32', '.u64': 'uint64'}.get(ext, 'text')
+
+    if fmt == 'text':
+        return read_text_trace(path, chunk_size)
+    if fmt == 'csv':
+        return read_csv_trace(path, chunk_size=chunk_size, **options)
+    if fmt in BINARY_DTYPES:
+        return read_binary_trace(path, fmt, chunk_size)
+    raise ValueError(f"Unknown trace format: {fmt}")
+
+
+def iter_references(chunks):
+    """
+    Flattens a stream of chunks into a generator of single page numbers.
+    """
+    return itertools.chain.from_iterable(chunks)
+
+
+def load_trace(path, fmt=None, **options):
+    """
+    Reads a whole trace into an array, for algorithms that need random access
+    (such as Optimal).
+
+    Returns:
+        array.array: The page numbers as 64-bit unsigned integers.
+    """
+    trace = array.array('Q')
+    for chunk in open_trace(path, fmt, **options):
+        trace.extend(chunk)
+    return trace
@@ -0,0 +1,366 @@
+"""
+Dividing physical frames among several processes.
+
+MultiProcessSimulator interleaves the reference strings of several
+processes, round robin with a fixed quantum. Each process has its own
+replacement policy (FIFO or LRU from replacement_policies) over its own
+frames, and every `interval` references the frames are redistributed by one
+of three allocators:
+
+- 'equal': every process keeps total_frames // processes. The baseline.
+- 'working_set': Denning's working-set model. A process's working set is
+  the set of distinct pages in its last `window` references, tracked with
+  O(1) work per reference by WorkingSetTracker. Each process gets as many
+  frames as its working set is large; spare frames are shared out evenly.
+- 'pff': page-fault frequency. A process whose fault rate in the last
+  interval is above pff_upper gets more frames from the free pool, and one
+  below pff_lower gives back the frames its working set no longer needs.
+
+When the processes together need more frames than exist (working sets that
+do not fit, or PFF with an empty pool), memory is over-committed and the
+system would thrash. The simulator records a thrashing event and suspends
+(swaps out) a process, which resumes once its frames are free again. An
+interval whose global fault rate reaches thrashing_fault_rate is also
+counted as thrashing, so the equal split can be compared on the same terms.
+
+Frames are taken away from a process by calling its policy's evict(), so
+the policy decides which pages go.
+"""
+
+import collections
+
+from replacement_policies import make_policy
+
+ALLOCATORS = ('equal', 'working_set', 'pff')
+RESIZABLE_POLICIES = ('fifo', 'lru') # Policies whose frame count can change between references
+
+
+class WorkingSetTracker:
+    """
+    The working set W(t, window) of one process: the distinct pages among
+    its last `window` references. Each add() is O(1).
+
+    Args:
+        window (int): The working-set window size, Delta, in references.
+    """
+
+    def __init__(self, window):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.recent = collections.deque() # The last `window` references, oldest on the left
+        self.counts = {} # page -> occurrences in recent
+
+    def add(self, page):
+        """
+        Records one reference, dropping the one that leaves the window.
+        """
+        self.recent.append(page)
+        self.counts[page] = self.counts.get(page, 0) + 1
+        if len(self.recent) > self.window:
+            old = self.recent.popleft()
+            remaining = self.counts[old] - 1
+            if remaining:
+                self.counts[old] = remaining
+            else:
+                del self.counts[old]
+
+    def size(self):
+        """
+        Returns the working-set size, the number of distinct pages in the window.
+        """
+        return len(self.counts)
+
+    def __contains__(self, page):
+        return page in self.counts
+
+#-------------------------------------------------
+
+class Process:
+    """
+    One simulated process: its reference stream, replacement policy,
+    working set and counters.
+    """
+
+    def __init__(self, pid, trace, policy, window):
+        self.pid = pid
+        self.trace = iter(trace)
+        self.policy = make_policy(policy, 1)
+        self.working_set = WorkingSetTracker(window)
+        self.frames = 0 # Frames currently allocated
+        self.references = 0
+        self.faults = 0
+        self.interval_references = 0 # Counters since the last rebalance, for PFF
+        self.interval_faults = 0
+        self.suspended = False
+        self.suspensions = 0
+        self.resume_frames = 0 # Frames a suspended process needs to be resumed
+        self.finished = False
+
+    def resize(self, frames):
+        """
+        Sets the number of frames, evicting pages while there are too many.
+        """
+        self.frames = frames
+        while len(self.policy) > frames:
+            self.policy.evict()
+        if frames:
+            self.policy.num_frames = frames
+
+    def run(self, quantum):
+        """
+        Runs up to quantum references.
+
+        Returns:
+            tuple: (references run, faults).
+        """
+        access = self.policy.access
+        add = self.working_set.add
+        faults = 0
+        count = 0
+        for page in self.trace:
+            add(page)
+            if access(page):
+                faults += 1
+            count += 1
+            if count == quantum:
+                break
+        else:
+            self.finished = True
+
+        self.references += count
+        self.faults += faults
+        self.interval_references += count
+        self.interval_faults += faults
+        return count, faults
+
+    def interval_fault_rate(self):
+        return self.interval_faults / self.interval_references if self.interval_references else 0.0
+
+    def stats(self):
+        return {
+            "pid": self.pid,
+            "references": self.references,
+            "faults": self.faults,
+            "fault_rate": self.faults / self.references if self.references else 0.0,
+            "frames": self.frames,
+            "working_set": self.working_set.size(),
+            "suspensions": self.suspensions,
+        }
+
+#-------------------------------------------------
+
+class MultiProcessSimulator:
+    """
+    Runs several processes over a shared pool of frames.
+
+    Args:
+        traces (list): One reference string (any iterable of pages) per process.
+        total_frames (int): Physical frames shared by all processes.
+        allocator (str): 'equal', 'working_set' or 'pff'.
+        policy (str): Per-process replacement policy, 'lru' or 'fifo'.
+        window (int): Working-set window, in references of that process.
+        interval (int): Global references between rebalances.
+        quantum (int): References a process runs before the next one's turn.
+        pff_lower (float): PFF fault rate below which frames are taken away.
+        pff_upper (float): PFF fault rate above which frames are added.
+        thrashing_fault_rate (float): Global interval fault rate counted as thrashing.
+    """
+
+    def __init__(self, traces, total_frames, allocator='working_set', policy='lru', window=1000,
+                 interval=1000, quantum=100, pff_lower=0.02, pff_upper=0.1, thrashing_fault_rate=0.5):
+        if allocator not in ALLOCATORS:
+            raise ValueError(f"Unknown allocator: {allocator}")
+        if policy not in RESIZABLE_POLICIES:
+            raise ValueError(f"Frames can only be redistributed under {', '.join(RESIZABLE_POLICIES)}")
+        if not traces:
+            raise ValueError("at least one trace is needed")
+        if total_frames < len(traces):
+            raise ValueError("every process needs at least one frame")
+        self.total_frames = total_frames
+        self.allocator = allocator
+        self.interval = interval
+        self.quantum = quantum
+        self.pff_lower = pff_lower
+        self.pff_upper = pff_upper
+        self.thrashing_fault_rate = thrashing_fault_rate
+        self.processes = [Process(pid, trace, policy, window) for pid, trace in enumerate(traces)]
+        self.free_frames = total_frames
+        self.references = 0
+        self.faults = 0
+        self.intervals = 0
+        self.thrashing_intervals = 0
+        self.events = [] # (global reference count, message) for suspensions and resumptions
+
+        share = total_frames // len(self.processes)
+        for process in self.processes:
+            self._give(process, share)
+
+    def _give(self, process, frames):
+        """
+        Changes a process's allocation, moving frames to or from the free pool.
+        """
+        self.free_frames -= frames - process.frames
+        process.resize(frames)
+
+    def _suspend(self, process, need):
+        process.suspended = True
+        process.suspensions += 1
+        process.resume_frames = need
+        self._give(process, 0) # Swapped out: every page is evicted
+        self.events.append((self.references, f"suspend process {process.pid}"))
+
+    def _resume(self, process):
+        process.suspended = False
+        self.events.append((self.references, f"resume process {process.pid}"))
+
+    def run(self):
+        """
+        Runs every process to the end of its trace.
+
+        Returns:
+            dict: The report, see report().
+        """
+        next_rebalance = self.interval
+        interval_references = 0
+        interval_faults = 0
+        while True:
+            runnable = [p for p in self.processes if not p.finished and not p.suspended]
+            if not runnable:
+                waiting = [p for p in self.processes if p.suspended and not p.finished]
+                if not waiting:
+                    break
+                # Everyone left is swapped out, so memory is free for the first of them.
+                self._give(waiting[0], min(self.free_frames, max(1, waiting[0].resume_frames)))
+                self._resume(waiting[0])
+                continue
+
+            for process in runnable:
+                count, faults = process.run(self.quantum)
+                self.references += count
+                self.faults += faults
+                interval_references += count
+                interval_faults += faults
+                if process.finished:
+                    self._give(process, 0)
+
+            if self.references >= next_rebalance:
+                next_rebalance = self.references + self.interval
+                over_committed = self._rebalance()
+                self.intervals += 1
+                fault_rate = interval_faults / interval_references if interval_references else 0.0
+                if over_committed or fault_rate >= self.thrashing_fault_rate:
+                    self.thrashing_intervals += 1
+                interval_references = 0
+                interval_faults = 0
+                for process in self.processes:
+                    process.interval_references = 0
+                    process.interval_faults = 0
+        return self.report()
+
+    def _rebalance(self):
+        """
+        Redistributes frames with the configured allocator.
+
+        Returns:
+            bool: True if the processes needed more frames than exist.
+        """
+        if self.allocator == 'working_set':
+            return self._rebalance_working_set()
+        if self.allocator == 'pff':
+            return self._rebalance_pff()
+        return False
+
+    def _rebalance_working_set(self):
+        active = [p for p in self.processes if not p.finished and not p.suspended]
+        demand = {p.pid: max(1, p.working_set.size()) for p in self.processes}
+        over_committed = False
+
+        # Swap out the largest working sets until the rest fit.
+        while len(active) > 1 and sum(demand[p.pid] for p in active) > self.total_frames:
+            over_committed = True
+            victim = max(active, key=lambda p: demand[p.pid])
+            active.remove(victim)
+            self._suspend(victim, demand[victim.pid])
+
+        # Bring suspended processes back, in order, while their working sets fit.
+        needed = sum(demand[p.pid] for p in active)
+        for process in self.processes:
+            if process.suspended and not process.finished and needed + process.resume_frames <= self.total_frames:
+                self._resume(process)
+                active.append(process)
+                needed += process.resume_frames
+                demand[process.pid] = process.resume_frames
+
+        if not active:
+            return over_committed
+        spare = self.total_frames - needed
+        # Shrink first so the frames are in the pool before anyone grows.
+        targets = {p.pid: demand[p.pid] + spare // len(active) + (i < spare % len(active)) for i, p in enumerate(active)}
+        for process in sorted(active, key=lambda p: targets[p.pid] - p.frames):
+            self._give(process, targets[process.pid])
+        return over_committed
+
+    def _rebalance_pff(self):
+        active = [p for p in self.processes if not p.finished and not p.suspended]
+        over_committed = False
+
+        # Processes faulting rarely give back the frames of pages they no
+        # longer use (those outside their working set) first, so the pool can
+        # feed the others.
+        for process in active:
+            if process.interval_fault_rate() < self.pff_lower:
+                self._give(process, min(process.frames, max(1, process.working_set.size())))
+
+        for process in sorted(active, key=lambda p: p.interval_fault_rate(), reverse=True):
+            if process.interval_fault_rate() <= self.pff_upper:
+                continue
+            step = max(1, process.frames // 4)
+            if self.free_frames >= step:
+                self._give(process, process.frames + step)
+            elif len([p for p in active if not p.suspended]) > 1:
+                # No free frames for a process that needs them: swap it out.
+                over_committed = True
+                self._suspend(process, process.frames + step)
+
+        for process in self.processes:
+            if process.suspended and not process.finished and self.free_frames >= process.resume_frames:
+                self._resume(process)
+                self._give(process, process.resume_frames)
+        return over_committed
+
+    def report(self):
+        """
+        Returns global and per-process results as a dict.
+        """
+        return {
+            "allocator": self.allocator,
+            "frames": self.total_frames,
+            "references": self.references,
+            "faults": self.faults,
+            "fault_rate": self.faults / self.references if self.references else 0.0,
+            "intervals": self.intervals,
+            "thrashing_intervals": self.thrashing_intervals,
+            "suspensions": sum(p.suspensions for p in self.processes),
+            "processes": [p.stats() for p in self.processes],
+        }
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    import random
+
+    # Three processes: a small tight loop, a program that moves between
+    # working sets of different sizes, and a large uniform one.
+    rng = random.Random(0)
+    loop = list(range(20)) * 1000
+    phases = [page for size in (10, 60, 10, 60) for page in rng.choices(range(size * 10, size * 11), k=5000)]
+    uniform = rng.choices(range(300), k=20000)
+
+    print("Allocator    | Faults | Fault Rate | Thrashing Intervals | Suspensions")
+    print("-------------+--------+------------+---------------------+------------")
+    for allocator in ALLOCATORS:
+        simulator = MultiProcessSimulator([loop, phases, uniform], total_frames=120, allocator=allocator,
+                                          window=500, interval=1500)
+        report = simulator.run()
+        print(f"{allocator:<12} | {report['faults']:<6} | {report['fault_rate']:<10.3f} | "
+              f"{report['thrashing_intervals']:<19} | {report['suspensions']}")